@@ -1,5 +1,6 @@
 import os
 import sys
+import multiprocessing
 import logging
 import asyncio
 from typing import Optional, Any
@@ -237,6 +238,7 @@ def main():
     app.run()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Process pools in frozen builds
     container = setup_container()
     app = Application(container)
     app.run()
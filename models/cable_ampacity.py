@@ -1,5 +1,153 @@
 from PySide6.QtCore import QObject, Property, Signal, Slot
-import math
+from bisect import bisect_left
+from collections import namedtuple
+from functools import lru_cache
+import csv
+import numpy as np
+
+from .cable_thermal import short_circuit_check
+from .config import DATA_DIR
+from .data_tables import read_columns
+
+INSULATIONS = ["PVC", "XLPE"]
+MATERIALS = ["Copper", "Aluminum"]
+
+# Economic current density - A/mm² (for economic sizing)
+ECONOMIC_DENSITY = {
+    "Copper": 4.5,
+    "Aluminum": 3.0
+}
+
+RouteAmpacity = namedtuple("RouteAmpacity", ["ampacity", "factor", "limiting_segment"])
+
+AmpacityTables = namedtuple(
+    "AmpacityTables",
+    ["sizes", "base", "temperatures", "temperature_factors", "groupings", "grouping_factors", "install_factors"]
+)
+
+
+@lru_cache(maxsize=4)
+def load_tables(data_dir=DATA_DIR):
+    """Ampacity and derating tables from the CSV files in ``data_dir``, compiled to arrays.
+
+    ``base`` is a (insulation, material, size) array of ampacities in
+    conduit at 30 °C, indexed in INSULATIONS and MATERIALS order.
+    """
+    ampacity = read_columns(data_dir / 'cable_ampacity.csv')
+    temperature = read_columns(data_dir / 'cable_temperature_factors.csv')
+    grouping = read_columns(data_dir / 'cable_grouping_factors.csv')
+    with open(data_dir / 'cable_install_factors.csv', 'r') as f:
+        install = {row["method"]: float(row["factor"]) for row in csv.DictReader(f)}
+
+    order = np.argsort(ampacity["size"])
+    base = np.array([[ampacity[f"{i.lower()}_{m.lower()}"][order] for m in MATERIALS] for i in INSULATIONS])
+    tables = AmpacityTables(
+        ampacity["size"][order], base,
+        temperature["ambient"], np.array([temperature[i.lower()] for i in INSULATIONS]),
+        grouping["circuits"], grouping["factor"], install
+    )
+    for array in tables[:-1]:
+        array.setflags(write=False)
+    return tables
+
+
+def _index(names, value, kind="insulation"):
+    if value not in names:
+        raise ValueError(f"Unknown {kind} {value}; expected one of {', '.join(names)}")
+    return names.index(value)
+
+
+def derating_factor(insulation, ambient, grouping, install_method="Conduit", tables=None):
+    """Combined temperature × grouping × installation factor.
+
+    ``ambient`` and ``grouping`` broadcast against each other. Factors are
+    interpolated linearly between table rows and held at the end values
+    outside the table.
+    """
+    tables = tables or load_tables()
+    temperature = np.interp(ambient, tables.temperatures, tables.temperature_factors[_index(INSULATIONS, insulation)])
+    group = np.interp(grouping, tables.groupings, tables.grouping_factors)
+    return temperature * group * tables.install_factors.get(install_method, 1.0)
+
+
+def nearest_size(size, tables=None):
+    """Index of the catalog size closest to ``size``"""
+    sizes = (tables or load_tables()).sizes
+    i = bisect_left(sizes, size)
+    if i == len(sizes) or (i > 0 and size - sizes[i - 1] <= sizes[i] - size):
+        return i - 1
+    return i
+
+
+def derating_table(insulation, material, ambient, grouping, install_method="Conduit", tables=None):
+    """Derated ampacity of every catalog size at every ambient × grouping combination.
+
+    Returns (sizes, ampacity) with ampacity shaped (sizes, len(ambient), len(grouping)).
+    """
+    tables = tables or load_tables()
+    factor = derating_factor(insulation, np.asarray(ambient, dtype=float)[:, None],
+                             np.asarray(grouping, dtype=float)[None, :], install_method, tables)
+    base = tables.base[_index(INSULATIONS, insulation), _index(MATERIALS, material, "material")]
+    return tables.sizes, base[:, None, None] * factor[None, :, :]
+
+
+def minimum_size(current, insulation, material, factor=1.0, tables=None):
+    """Smallest catalog size carrying ``current`` after derating by ``factor``; nan when none does.
+
+    ``current`` and ``factor`` may be arrays of circuits.
+    """
+    tables = tables or load_tables()
+    base = tables.base[_index(INSULATIONS, insulation), _index(MATERIALS, material, "material")]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        required = np.asarray(current, dtype=float) / np.asarray(factor, dtype=float)
+    index = np.searchsorted(base, required, side='left')
+    sizes = np.append(tables.sizes, np.nan)
+    return sizes[np.where(np.isnan(required), len(base), index)]
+
+
+def install_factors(methods, tables=None):
+    """Installation factors for an array of method names (1.0 for unknown methods)"""
+    tables = tables or load_tables()
+    names, inverse = np.unique(np.asarray(methods, dtype=str), return_inverse=True)
+    factors = np.array([tables.install_factors.get(name, 1.0) for name in names])
+    return factors[inverse].reshape(np.shape(methods))
+
+
+def route_ampacity(ambient, grouping, install_method, insulation="PVC", tables=None):
+    """Governing ampacity of cable routes made of segments in different conditions.
+
+    ``ambient``, ``grouping`` and ``install_method`` are (circuits,
+    segments) arrays; routes with fewer segments pad ``ambient`` with nan.
+    ``insulation`` is one name or one per circuit; names outside
+    INSULATIONS raise ValueError. A route is limited by
+    its segment with the lowest combined derating factor, the same segment
+    for every size and material, so the result is the base table scaled by
+    that factor: ampacity is (circuits, materials, sizes), with factor and
+    limiting_segment per circuit. Pass ``factor`` to minimum_size to size
+    every circuit.
+    """
+    tables = tables or load_tables()
+    ambient = np.atleast_2d(np.asarray(ambient, dtype=float))
+    grouping = np.broadcast_to(np.asarray(grouping, dtype=float), ambient.shape)
+    insulation = np.broadcast_to(np.asarray(insulation, dtype=str), ambient.shape[:1])
+
+    unknown = sorted(set(insulation.tolist()) - set(INSULATIONS))
+    if unknown:
+        raise ValueError(f"Unknown insulation {', '.join(unknown)}; expected one of {', '.join(INSULATIONS)}")
+    kinds = np.array([INSULATIONS.index(name) for name in insulation], dtype=int)
+
+    temperature = np.empty(ambient.shape)
+    for i in range(len(INSULATIONS)):
+        rows = kinds == i
+        temperature[rows] = np.interp(ambient[rows], tables.temperatures, tables.temperature_factors[i])
+    factor = (temperature * np.interp(grouping, tables.groupings, tables.grouping_factors)
+              * install_factors(np.broadcast_to(install_method, ambient.shape), tables))
+    factor = np.where(np.isnan(ambient), np.inf, factor)
+
+    limiting = factor.argmin(axis=1)
+    governing = factor[np.arange(len(factor)), limiting]
+    base = tables.base[kinds]  # (circuits, materials, sizes)
+    return RouteAmpacity(base * governing[:, None, None], governing, limiting)
 
 class CableAmpacityCalculator(QObject):
     """Calculator for cable current carrying capacity with derating factors"""
@@ -21,161 +169,38 @@ class CableAmpacityCalculator(QObject):
         self._grouping_number = 1  # Number of cables in group
         self._conductor_material = "Copper"  # Copper or Aluminum
         
-        # Base ampacity values for various cable sizes (mm²) with PVC insulation in conduit
-        # Format: {size: [copper_amps, aluminum_amps]}
-        self._base_ampacity_pvc_conduit = {
-            1.5: [17.5, 13.5],
-            2.5: [24, 18.5],
-            4: [32, 25],
-            6: [41, 32],
-            10: [57, 44],
-            16: [76, 59],
-            25: [101, 78],
-            35: [125, 97],
-            50: [151, 118],
-            70: [192, 149],
-            95: [232, 179],
-            120: [269, 206],
-            150: [309, 236],
-            185: [353, 268],
-            240: [415, 315]
-        }
-        
-        # Base ampacity values for XLPE insulation in conduit
-        self._base_ampacity_xlpe_conduit = {
-            1.5: [19.5, 15],
-            2.5: [27, 21],
-            4: [36, 28],
-            6: [46, 36],
-            10: [63, 49],
-            16: [85, 66],
-            25: [112, 87],
-            35: [138, 107],
-            50: [168, 130],
-            70: [213, 165],
-            95: [258, 199],
-            120: [299, 230],
-            150: [344, 263],
-            185: [392, 300],
-            240: [461, 351]
-        }
-        
-        # Ambient temperature correction factors
-        self._ambient_temp_factors_pvc = {
-            25: 1.03,
-            30: 1.0,
-            35: 0.94,
-            40: 0.87,
-            45: 0.79,
-            50: 0.71,
-            55: 0.61
-        }
-        
-        self._ambient_temp_factors_xlpe = {
-            25: 1.02,
-            30: 1.0,
-            35: 0.96,
-            40: 0.91,
-            45: 0.87,
-            50: 0.82,
-            55: 0.76
-        }
-        
-        # Grouping correction factors
-        self._grouping_factors = {
-            1: 1.0,
-            2: 0.8,
-            3: 0.7,
-            4: 0.65,
-            5: 0.6,
-            6: 0.57,
-            7: 0.54,
-            8: 0.52,
-            9: 0.5,
-            12: 0.45,
-            16: 0.41,
-            20: 0.38
-        }
-        
-        # Installation method correction factors (simplified)
-        self._install_method_factors = {
-            "Conduit": 1.0,
-            "Tray": 1.0,
-            "Direct Buried": 0.95,
-            "Free Air": 1.15,
-            "Wall Surface": 0.95
-        }
-        
-        # Economic current density - A/mm² (for economic sizing)
-        self._economic_density = {
-            "Copper": 4.5,
-            "Aluminum": 3.0
-        }
-        
+        self._tables = load_tables()
+
         # Perform initial calculation
         self._calculate()
-        
+
     def _calculate(self):
         """Calculate cable ampacity with all derating factors applied"""
-        # Get the base ampacity for the selected cable size and material
-        material_index = 0 if self._conductor_material == "Copper" else 1
-        
-        # Find the closest cable size in our tables
-        sizes = list(self._base_ampacity_pvc_conduit.keys())
-        closest_size = min(sizes, key=lambda x: abs(x - self._cable_size))
-        
-        # Get base ampacity based on insulation type
-        if self._insulation_type == "PVC":
-            self._base_ampacity = self._base_ampacity_pvc_conduit.get(closest_size, [0, 0])[material_index]
-            
-            # Get ambient temperature correction factor
-            temps = list(self._ambient_temp_factors_pvc.keys())
-            closest_temp = min(temps, key=lambda x: abs(x - self._ambient_temp))
-            temp_factor = self._ambient_temp_factors_pvc.get(closest_temp, 1.0)
-        else:  # XLPE
-            self._base_ampacity = self._base_ampacity_xlpe_conduit.get(closest_size, [0, 0])[material_index]
-            
-            # Get ambient temperature correction factor
-            temps = list(self._ambient_temp_factors_xlpe.keys())
-            closest_temp = min(temps, key=lambda x: abs(x - self._ambient_temp))
-            temp_factor = self._ambient_temp_factors_xlpe.get(closest_temp, 1.0)
-        
-        # Get grouping factor
-        groups = list(self._grouping_factors.keys())
-        closest_group = min(groups, key=lambda x: abs(x - self._grouping_number))
-        grouping_factor = self._grouping_factors.get(closest_group, 0.38)  # Default to worst case
-        
-        # Get installation method factor
-        install_factor = self._install_method_factors.get(self._install_method, 1.0)
-        
+        tables = self._tables
+        base = tables.base[_index(INSULATIONS, self._insulation_type),
+                           _index(MATERIALS, self._conductor_material, "material")]
+
+        # Closest catalog size, interpolated temperature and grouping factors
+        self._base_ampacity = float(base[nearest_size(self._cable_size, tables)])
+        factor = float(derating_factor(self._insulation_type, self._ambient_temp, self._grouping_number,
+                                       self._install_method, tables))
+
         # Calculate total derated ampacity
-        self._derated_ampacity = self._base_ampacity * temp_factor * grouping_factor * install_factor
-        
+        self._derated_ampacity = self._base_ampacity * factor
+
         # Calculate voltage drop (estimated per 100m at full load)
         # This is a simplification - in reality depends on power factor, etc.
         r_per_km = 18.0 / self._cable_size if self._conductor_material == "Copper" else 30.0 / self._cable_size
         self._voltage_drop_per_100m = self._derated_ampacity * r_per_km * 0.1  # V per 100m
-        
+
         # Calculate economic sizing recommendation
-        econ_current = self._cable_size * self._economic_density.get(self._conductor_material, 4.0)
+        econ_current = self._cable_size * ECONOMIC_DENSITY.get(self._conductor_material, 4.0)
         self._economic_recommendation = econ_current
-        
-        # Calculate recommended size for given current
-        min_size = 1.5
-        for size in sorted(sizes):
-            if self._insulation_type == "PVC":
-                amp_capacity = self._base_ampacity_pvc_conduit.get(size, [0, 0])[material_index]
-            else:
-                amp_capacity = self._base_ampacity_xlpe_conduit.get(size, [0, 0])[material_index]
-            
-            amp_capacity *= temp_factor * grouping_factor * install_factor
-            
-            if amp_capacity >= self._derated_ampacity:
-                min_size = size
-                break
-                
-        self._recommended_size = min_size
-        
+
+        # Smallest size carrying the derated ampacity; ampacity rises with size so bisect the column
+        i = bisect_left(base, self._base_ampacity)
+        self._recommended_size = float(tables.sizes[i]) if i < len(base) else float(tables.sizes[0])
+
         # Notify QML of changes
         self.calculationsComplete.emit()
 
@@ -198,6 +223,11 @@ class CableAmpacityCalculator(QObject):
     @insulationType.setter
     def insulationType(self, insulation):
         if self._insulation_type != insulation:
+            try:
+                _index(INSULATIONS, insulation)
+            except ValueError as e:
+                print(f"Error setting insulation type: {e}")
+                return
             self._insulation_type = insulation
             self.insulationTypeChanged.emit()
             self._calculate()
@@ -242,6 +272,11 @@ class CableAmpacityCalculator(QObject):
     @conductorMaterial.setter
     def conductorMaterial(self, material):
         if self._conductor_material != material:
+            try:
+                _index(MATERIALS, material, "material")
+            except ValueError as e:
+                print(f"Error setting conductor material: {e}")
+                return
             self._conductor_material = material
             self.conductorMaterialChanged.emit()
             self._calculate()
@@ -266,6 +301,69 @@ class CableAmpacityCalculator(QObject):
     def recommendedSize(self):
         return self._recommended_size
 
+    @Property('QVariantList', constant=True)
+    def cableSizes(self):
+        return self._tables.sizes.tolist()
+
+    @Property('QVariantList', constant=True)
+    def installMethods(self):
+        return list(self._tables.install_factors)
+
+    @Slot('QVariantList', result='QVariantMap')
+    def calculateRoute(self, segments):
+        """Governing ampacity of a route of {installMethod, ambientTemp, groupingNumber} segments.
+
+        Uses the current size, insulation and material; limitingSegment is
+        the index of the segment that sets the rating.
+        """
+        if not segments:
+            return {}
+        try:
+            ambient = [[float(s.get("ambientTemp", self._ambient_temp)) for s in segments]]
+            grouping = [[float(s.get("groupingNumber", self._grouping_number)) for s in segments]]
+            methods = [[s.get("installMethod", self._install_method) for s in segments]]
+            route = route_ampacity(ambient, grouping, methods, self._insulation_type, self._tables)
+            by_size = route.ampacity[0, _index(MATERIALS, self._conductor_material, "material")]
+            return {
+                "limitingSegment": int(route.limiting_segment[0]),
+                "factor": float(route.factor[0]),
+                "ampacity": float(by_size[nearest_size(self._cable_size, self._tables)]),
+                "ampacityBySize": by_size.tolist()
+            }
+        except Exception as e:
+            print(f"Error calculating route ampacity: {e}")
+            return {}
+
+    @Slot(float, float, result='QVariantMap')
+    def checkShortCircuit(self, fault_ka, duration):
+        """Adiabatic short-circuit check of the current size for ``fault_ka`` kA over ``duration`` s"""
+        if fault_ka <= 0 or duration <= 0:
+            return {}
+        try:
+            check = short_circuit_check(fault_ka * 1000.0, duration, self._cable_size, self._conductor_material,
+                                        self._insulation_type, self._tables.sizes)
+            required = float(check.required_size)
+            return {
+                "k": float(check.k),
+                "withstandKA": float(check.withstand) / 1000.0,
+                "requiredSize": required if np.isfinite(required) else -1.0,
+                "ok": bool(check.ok)
+            }
+        except Exception as e:
+            print(f"Error checking short circuit withstand: {e}")
+            return {}
+
+    @Slot(float, float, result='QVariantList')
+    def ampacityBySize(self, ambient_temp, grouping_number):
+        """Derated ampacity of every catalog size for the current insulation, material and method"""
+        try:
+            _, table = derating_table(self._insulation_type, self._conductor_material, [ambient_temp],
+                                      [grouping_number], self._install_method, self._tables)
+        except Exception as e:
+            print(f"Error calculating ampacity by size: {e}")
+            return []
+        return table[:, 0, 0].tolist()
+
     # Slots for QML access
     @Slot(float)
     def setCableSize(self, size):
@@ -0,0 +1,187 @@
+"""Short-circuit withstand and transient conductor temperature of cables.
+
+Short circuits are checked with the adiabatic equation I²t = k²S²
+(IEC 60364-5-54 / IEC 60949). Transient temperatures under a load profile
+come from a two-node thermal ladder per cable (IEC 60853 style): the
+conductor plus the inner part of the insulation, coupled through the
+insulation resistance to an outer node that loses heat to ambient. Every
+catalog size is stepped at once, so one pass through a daily load cycle
+gives the temperature of all sizes.
+
+Catalogs are the ``data/cable_data_<cu|al>_<1|3>c.csv`` files used by the
+voltage drop calculator. Their ratings are taken as the currents that
+hold the conductor at its maximum operating temperature in a 30 °C
+ambient, which sets each cable's external thermal resistance.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .config import DATA_DIR
+from .data_tables import read_columns
+
+# Adiabatic k (A·s½/mm²) from the maximum operating to the maximum short-circuit temperature
+K_FACTORS = {
+    ("Copper", "PVC"): 115.0,
+    ("Copper", "XLPE"): 143.0,
+    ("Aluminum", "PVC"): 76.0,
+    ("Aluminum", "XLPE"): 94.0,
+}
+
+# (maximum operating, maximum short-circuit) conductor temperature °C
+TEMPERATURE_LIMITS = {
+    "PVC": (70.0, 160.0),
+    "XLPE": (90.0, 250.0),
+}
+
+# Resistivity at 20 °C (Ω·mm²/m), temperature coefficient (1/K), volumetric heat
+# capacity (J/m³K), and the IEC 60949 constants K (A·s½/mm²) and β (K)
+MATERIAL_PROPERTIES = {
+    "Copper": {"rho20": 0.017241, "alpha": 0.00393, "heat_capacity": 3.45e6, "K": 226.0, "beta": 234.5},
+    "Aluminum": {"rho20": 0.028264, "alpha": 0.00403, "heat_capacity": 2.5e6, "K": 148.0, "beta": 228.0},
+}
+
+# Thermal resistivity (K·m/W) and volumetric heat capacity (J/m³K) of the insulation
+INSULATION_PROPERTIES = {
+    "PVC": {"resistivity": 5.0, "heat_capacity": 1.7e6},
+    "XLPE": {"resistivity": 3.5, "heat_capacity": 2.4e6},
+}
+
+# Nominal 0.6/1 kV insulation thickness (mm) by conductor size (mm²), after IEC 60502-1
+INSULATION_THICKNESS = (
+    (1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240, 300, 400),
+    (0.8, 0.8, 1.0, 1.0, 1.0, 1.0, 1.2, 1.2, 1.4, 1.4, 1.6, 1.6, 1.8, 2.0, 2.2, 2.4, 2.6),
+)
+
+REFERENCE_AMBIENT = 30.0
+
+Catalog = namedtuple("Catalog", ["sizes", "rating", "mv_per_am", "cores"])
+ShortCircuitCheck = namedtuple("ShortCircuitCheck", ["k", "withstand", "required_size", "ok"])
+ThermalNetwork = namedtuple(
+    "ThermalNetwork",
+    ["r_insulation", "r_external", "c_conductor", "c_outer", "resistance20", "alpha", "conductors"]
+)
+TransientTemperature = namedtuple("TransientTemperature", ["time", "conductor", "outer"])
+
+
+@lru_cache(maxsize=8)
+def load_catalog(material="Copper", cores=3, data_dir=DATA_DIR):
+    """Cable catalog from ``cable_data_<cu|al>_<cores>c.csv`` sorted by size"""
+    prefix = "cu" if material == "Copper" else "al"
+    columns = read_columns(data_dir / f'cable_data_{prefix}_{int(cores)}c.csv')
+    order = np.argsort(columns["size"])
+    catalog = Catalog(columns["size"][order], columns["max_current"][order], columns["mv_per_am"][order], int(cores))
+    for array in catalog[:-1]:
+        array.setflags(write=False)
+    return catalog
+
+
+def k_factor(material="Copper", insulation="PVC", initial=None, final=None):
+    """Adiabatic k for a conductor heated from ``initial`` to ``final`` °C.
+
+    Defaults to the insulation's temperature limits, which gives the
+    K_FACTORS values. A conductor running below its maximum temperature
+    before the fault (e.g. from simulate) has a larger k.
+    """
+    if initial is None and final is None:
+        return np.float64(K_FACTORS[(material, insulation)])
+    limits = TEMPERATURE_LIMITS[insulation]
+    initial = limits[0] if initial is None else initial
+    final = limits[1] if final is None else final
+    props = MATERIAL_PROPERTIES[material]
+    beta = props["beta"]
+    return props["K"] * np.sqrt(np.log((np.asarray(final) + beta) / (np.asarray(initial) + beta)))
+
+
+def withstand_current(sizes, duration, k):
+    """Maximum fault current (A) for ``duration`` seconds, I = kS/√t"""
+    return k * np.asarray(sizes, dtype=float) / np.sqrt(np.asarray(duration, dtype=float))
+
+
+def short_circuit_check(fault_current, duration, sizes, material="Copper", insulation="PVC",
+                        catalog_sizes=None, initial=None):
+    """Adiabatic check of a cable schedule.
+
+    ``fault_current`` (A), ``duration`` (s), ``sizes`` (mm²) and ``initial``
+    (°C before the fault) broadcast together. required_size is the
+    smallest of ``catalog_sizes`` meeting the fault (nan when none does).
+    """
+    k = k_factor(material, insulation, initial)
+    fault_current = np.asarray(fault_current, dtype=float)
+    duration = np.asarray(duration, dtype=float)
+    withstand = withstand_current(sizes, duration, k)
+    minimum = fault_current * np.sqrt(duration) / k
+    if catalog_sizes is None:
+        catalog_sizes = load_catalog(material).sizes
+    catalog_sizes = np.asarray(catalog_sizes, dtype=float)
+    index = np.searchsorted(catalog_sizes, minimum, side='left')
+    required = np.append(catalog_sizes, np.nan)[index]
+    return ShortCircuitCheck(k, withstand, required, withstand >= fault_current)
+
+
+def thermal_network(catalog, material="Copper", insulation="PVC"):
+    """Two-node thermal ladder of every catalog size.
+
+    The insulation resistance follows IEC 60287 T1 for each core, the
+    insulation capacity is split between the nodes with the van Wormer
+    factor, and the external resistance is whatever makes the catalog
+    rating reach the maximum operating temperature at 30 °C.
+    """
+    mat = MATERIAL_PROPERTIES[material]
+    ins = INSULATION_PROPERTIES[insulation]
+    sizes = np.asarray(catalog.sizes, dtype=float)
+    cores = catalog.cores
+
+    diameter = np.sqrt(4.0 * sizes / np.pi)  # mm, solid round equivalent
+    thickness = np.interp(sizes, *INSULATION_THICKNESS)
+    ratio = (diameter + 2.0 * thickness) / diameter
+    r_insulation = ins["resistivity"] / (2.0 * np.pi) * np.log(ratio) / cores  # Cores in parallel
+
+    c_conductor = mat["heat_capacity"] * sizes * 1e-6 * cores  # J/(K·m)
+    c_insulation = ins["heat_capacity"] * np.pi / 4.0 * ((diameter * ratio) ** 2 - diameter ** 2) * 1e-6 * cores
+    van_wormer = 1.0 / (2.0 * np.log(ratio)) - 1.0 / (ratio ** 2 - 1.0)
+
+    resistance20 = mat["rho20"] / sizes  # Ω/m
+    max_temp = TEMPERATURE_LIMITS[insulation][0]
+    losses = cores * np.square(catalog.rating) * resistance20 * (1.0 + mat["alpha"] * (max_temp - 20.0))
+    r_total = (max_temp - REFERENCE_AMBIENT) / losses
+    r_external = np.maximum(r_total - r_insulation, 1e-3)
+
+    return ThermalNetwork(r_insulation, r_external, c_conductor + van_wormer * c_insulation,
+                          (1.0 - van_wormer) * c_insulation, resistance20, mat["alpha"], cores)
+
+
+def simulate(network, currents, dt, ambient=REFERENCE_AMBIENT, cycles=1, initial=None):
+    """Conductor and outer temperatures (°C) under a load profile.
+
+    ``currents`` is a (steps,) profile shared by every size or a
+    (steps, sizes) array, held for ``dt`` seconds per step and repeated
+    ``cycles`` times. Each step is backward Euler on the two-node ladder
+    with the conductor resistance taken at the start of the step, which
+    stays stable for any ``dt``. Returns arrays of shape (steps·cycles + 1, sizes).
+    """
+    currents = np.asarray(currents, dtype=float)
+    sizes = len(network.r_insulation)
+    profile = np.broadcast_to(currents.reshape(len(currents), -1), (len(currents), sizes))
+    steps = len(profile) * int(cycles)
+
+    r1, r2 = network.r_insulation, network.r_external
+    a11 = network.c_conductor / dt + 1.0 / r1
+    a22 = network.c_outer / dt + 1.0 / r1 + 1.0 / r2
+    det = a11 * a22 - 1.0 / (r1 * r1)
+    heat = network.conductors * np.square(profile) * network.resistance20
+
+    conductor = np.empty((steps + 1, sizes))
+    outer = np.empty((steps + 1, sizes))
+    conductor[0] = ambient if initial is None else initial
+    outer[0] = ambient if initial is None else initial
+    for n in range(steps):
+        theta_a, theta_b = conductor[n], outer[n]
+        losses = heat[n % len(profile)] * (1.0 + network.alpha * (theta_a - 20.0))
+        b1 = network.c_conductor / dt * theta_a + losses
+        b2 = network.c_outer / dt * theta_b + ambient / r2
+        conductor[n + 1] = (b1 * a22 + b2 / r1) / det
+        outer[n + 1] = (a11 * b2 + b1 / r1) / det
+    return TransientTemperature(np.arange(steps + 1) * dt, conductor, outer)
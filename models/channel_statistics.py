@@ -0,0 +1,198 @@
+import numpy as np
+
+
+class RunningStatistics:
+    """Windowed statistics for the real-time channels, maintained incrementally.
+
+    Samples are kept in a window ring. Sums, sums of squares, zero crossing
+    and peak counts are updated by adding each new block and subtracting the
+    rows it overwrites, so a block of n samples costs O(n) whatever the
+    window length. Min/max are kept per segment of the ring and only the
+    segments a block touched are rescanned.
+    """
+
+    def __init__(self, window=1024, channels=3, segments=32):
+        self._channels = channels
+        self._segments = max(1, min(segments, window))
+        self._segment_len = -(-window // self._segments)
+        self._window = self._segment_len * self._segments
+        self.reset()
+
+    @property
+    def window(self):
+        return self._window
+
+    def reset(self):
+        shape = (self._window, self._channels)
+        self._times = np.zeros(self._window)
+        self._values = np.zeros(shape)
+        self._crossings = np.zeros(shape, dtype=bool)
+        self._crossing_times = np.full(shape, np.nan)  # Interpolated time of each flagged crossing
+        self._peaks = np.zeros(shape, dtype=bool)
+        self._sum = np.zeros(self._channels)
+        self._sum_sq = np.zeros(self._channels)
+        self._crossing_count = np.zeros(self._channels, dtype=np.int64)
+        self._peak_count = np.zeros(self._channels, dtype=np.int64)
+        self._segment_min = np.full((self._segments, self._channels), np.inf)
+        self._segment_max = np.full((self._segments, self._channels), -np.inf)
+        self._position = 0  # Next ring row to write
+        self._count = 0  # Valid rows in the ring
+        self._since_resync = 0
+        self._prev = None  # Last two samples of the previous block, for edge and peak detection
+        self._prev_above = None
+        self._last_peak = np.zeros(self._channels)
+        self._last_peak_time = np.zeros(self._channels)
+
+    def push(self, block):
+        """Add an (n, 1 + channels) block of (time, values...) rows"""
+        block = np.asarray(block, dtype=np.float64)
+        if len(block) > self._window:
+            block = block[-self._window:]
+        n = len(block)
+        if n == 0:
+            return
+
+        times = block[:, 0]
+        values = block[:, 1:1 + self._channels]
+        mean = self._sum / self._count if self._count else values.mean(axis=0)
+        crossings, crossing_times, peaks = self._detect(times, values, mean)
+
+        idx = (self._position + np.arange(n)) % self._window
+        evicted = max(0, self._count + n - self._window)
+        if evicted:
+            # The oldest rows are the ones about to be overwritten
+            old = idx[:evicted] if self._count == self._window else \
+                (self._position + np.arange(self._window - self._count, n)) % self._window
+            self._sum -= self._values[old].sum(axis=0)
+            self._sum_sq -= np.square(self._values[old]).sum(axis=0)
+            self._crossing_count -= self._crossings[old].sum(axis=0)
+            self._peak_count -= self._peaks[old].sum(axis=0)
+
+        self._times[idx] = times
+        self._values[idx] = values
+        self._crossings[idx] = crossings
+        self._crossing_times[idx] = crossing_times
+        self._peaks[idx] = peaks
+        self._sum += values.sum(axis=0)
+        self._sum_sq += np.square(values).sum(axis=0)
+        self._crossing_count += crossings.sum(axis=0)
+        self._peak_count += peaks.sum(axis=0)
+
+        self._count = min(self._window, self._count + n)
+        self._position = (self._position + n) % self._window
+        self._update_segments(idx)
+
+        # Periodically rebuild the sums so floating point error cannot accumulate
+        self._since_resync += n
+        if self._since_resync >= self._window:
+            self._resync()
+
+    def _detect(self, times, values, mean):
+        """Flag rising zero crossings (about the mean) and local maxima above mean + std"""
+        if self._prev is not None:
+            prev_t, prev_v = self._prev
+            t = np.concatenate((prev_t, times))
+            v = np.concatenate((prev_v, values))
+        else:
+            t, v = times, values
+        lead = len(t) - len(times)
+        self._prev = (t[-2:], v[-2:])
+
+        crossings = np.zeros(values.shape, dtype=bool)
+        crossing_times = np.full(values.shape, np.nan)
+        peaks = np.zeros(values.shape, dtype=bool)
+        if len(v) < 2:
+            self._prev_above = v[-1] >= mean
+            return crossings, crossing_times, peaks
+
+        above = v >= mean
+        if lead:
+            # Keep the side the previous block saw, the mean may have moved since
+            above[lead - 1] = self._prev_above
+        self._prev_above = above[-1]
+        rising = ~above[:-1] & above[1:]  # Crossing between samples i and i + 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = (mean - v[:-1]) / (v[1:] - v[:-1])
+        at = np.where(rising, t[:-1, None] + frac * (t[1:] - t[:-1])[:, None], np.nan)
+        if lead:
+            crossings[:] = rising[lead - 1:]
+            crossing_times[:] = at[lead - 1:]
+        else:
+            crossings[1:] = rising
+            crossing_times[1:] = at
+
+        if len(v) >= 3:
+            var = self._sum_sq / self._count - np.square(mean) if self._count else v.var(axis=0)
+            threshold = mean + np.sqrt(np.maximum(var, 0.0))
+            local_max = (v[1:-1] > v[:-2]) & (v[1:-1] >= v[2:]) & (v[1:-1] > threshold)
+            # local_max[i] marks sample i + 1 of v; it is known once sample i + 2 arrives
+            flags = np.zeros(v.shape, dtype=bool)
+            flags[1:-1] = local_max
+            peaks[:] = flags[lead:]
+            if lead == 2:
+                # The previous block's last sample is confirmed by this block's first
+                peaks[0] |= flags[1]
+            rows, cols = np.nonzero(local_max)
+            if len(rows):
+                last = np.full(v.shape[1], -1)
+                last[cols] = rows  # nonzero is row-major, so later rows win
+                hit = last >= 0
+                self._last_peak[hit] = v[last[hit] + 1, hit]
+                self._last_peak_time[hit] = t[last[hit] + 1]
+        return crossings, crossing_times, peaks
+
+    def _update_segments(self, idx):
+        segments = np.unique(idx // self._segment_len)
+        view = self._values.reshape(self._segments, self._segment_len, self._channels)
+        if self._count < self._window:
+            # Ignore unfilled rows of the ring while it is still filling up
+            valid = (np.arange(self._window) < self._count).reshape(self._segments, self._segment_len)
+            mask = valid[segments][:, :, None]
+            self._segment_min[segments] = np.where(mask, view[segments], np.inf).min(axis=1)
+            self._segment_max[segments] = np.where(mask, view[segments], -np.inf).max(axis=1)
+        else:
+            self._segment_min[segments] = view[segments].min(axis=1)
+            self._segment_max[segments] = view[segments].max(axis=1)
+
+    def _resync(self):
+        valid = self._values if self._count == self._window else self._values[:self._count]
+        self._sum = valid.sum(axis=0)
+        self._sum_sq = np.square(valid).sum(axis=0)
+        self._since_resync = 0
+
+    def snapshot(self):
+        """Return one dict of statistics per channel"""
+        if not self._count:
+            return [{"rms": 0.0, "mean": 0.0, "min": 0.0, "max": 0.0, "frequency": 0.0,
+                     "peak": 0.0, "peakTime": 0.0, "peakCount": 0}
+                    for _ in range(self._channels)]
+
+        mean = self._sum / self._count
+        rms = np.sqrt(np.maximum(self._sum_sq / self._count, 0.0))
+        minimum = self._segment_min.min(axis=0)
+        maximum = self._segment_max.max(axis=0)
+
+        # Average period between the first and last rising crossing in the window
+        frequency = np.zeros(self._channels)
+        counted = self._crossing_count >= 2
+        if counted.any():
+            flagged = ~np.isnan(self._crossing_times)
+            first = np.where(flagged, self._crossing_times, np.inf).min(axis=0)
+            last = np.where(flagged, self._crossing_times, -np.inf).max(axis=0)
+            span = np.where(counted, last - first, 0.0)
+            ok = counted & (span > 0)
+            frequency[ok] = (self._crossing_count[ok] - 1) / span[ok]
+
+        return [
+            {
+                "rms": float(rms[i]),
+                "mean": float(mean[i]),
+                "min": float(minimum[i]),
+                "max": float(maximum[i]),
+                "frequency": float(frequency[i]),
+                "peak": float(self._last_peak[i]),
+                "peakTime": float(self._last_peak_time[i]),
+                "peakCount": int(self._peak_count[i])
+            }
+            for i in range(self._channels)
+        ]
@@ -0,0 +1,134 @@
+"""Monte Carlo coordination study of a radial protection chain.
+
+Each trial draws a CT ratio error, pickup tolerance and operating time
+tolerance for every device and an uncertainty for every fault level, then
+evaluates the (trials, relays, fault levels) operating time tensor and the
+margins of adjacent (primary, backup) pairs in one pass. Every block of
+TRIALS_PER_SEED trials draws from its own seed, so results do not depend
+on how the blocks are grouped into chunks or how many workers run them.
+Chunks are sized to keep a few per worker and their tensors within
+CHUNK_BYTES, and can be spread over a process pool.
+"""
+
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .protection_curves import TabulatedCurve
+
+CoordinationStudy = namedtuple(
+    "CoordinationStudy",
+    ["trials", "probability", "fault_probability", "margin_percentile"]
+)
+
+# Uniform ± fractions. The time tolerance follows the 5 % accuracy class of
+# IEC 60255-151 and the CT error a 5P protection class CT.
+DEFAULT_TOLERANCES = {
+    "ct_error": 0.05,
+    "pickup": 0.05,
+    "time": 0.05,
+    "fault": 0.10,
+}
+
+TRIALS_PER_SEED = 250
+CHUNKS_PER_WORKER = 4  # Keeps workers busy when chunks take uneven time
+CHUNK_BYTES = 64 * 1024 * 1024  # Budget for the float64 tensors of one chunk
+TENSORS_PER_CHUNK = 4  # Operating times, margins and their masks per (trial, relay, fault)
+POOL_THRESHOLD = 20_000_000  # Trial × relay × fault evaluations below which a pool is not worth starting
+
+
+def _simulate_chunk(job):
+    """Worker entry point: miscoordination counts and worst margins of one chunk of trials"""
+    curves, pickup, tds, faults, tolerances, margin, sizes, seeds = job
+    rngs = [np.random.default_rng(s) for s in seeds]
+    trials = sum(sizes)
+    count = len(curves)
+
+    def spread(key, shape):
+        # Each seed block draws its own rows, independent of the chunk it is in
+        draws = [rng.uniform(-1.0, 1.0, (size,) + shape[1:]) for rng, size in zip(rngs, sizes)]
+        return 1.0 + tolerances.get(key, 0.0) * np.concatenate(draws)
+
+    # Fuses and direct-acting breakers have no CT
+    has_ct = np.array([not isinstance(c, TabulatedCurve) for c in curves])
+    ct = np.where(has_ct, spread("ct_error", (trials, count)), 1.0)
+    seen_pickup = pickup * spread("pickup", (trials, count)) / ct
+    currents = faults * spread("fault", (trials, len(faults)))
+
+    times = np.empty((trials, count, len(faults)))
+    groups = {}
+    for i, c in enumerate(curves):
+        groups.setdefault(id(c), (c, []))[1].append(i)
+    for c, rows in groups.values():
+        times[:, rows] = c.times(currents[:, None, :], seen_pickup[:, rows, None], tds[rows, None])
+    times *= spread("time", (trials, count))[:, :, None]
+
+    with np.errstate(invalid='ignore'):
+        margins = times[:, 1:] - times[:, :-1]
+    valid = np.isfinite(margins)
+    short = valid & (margins < margin)
+    worst = np.where(valid, margins, np.inf).min(axis=2)
+    return short.any(axis=2).sum(axis=0), short.sum(axis=0), worst.astype(np.float32)
+
+
+def _blocks_per_chunk(blocks, evaluations, workers):
+    """Seed blocks per chunk: a few chunks per worker, each within CHUNK_BYTES.
+
+    ``evaluations`` is relays × fault levels, the size of one trial's slice
+    of the operating time tensor.
+    """
+    per_chunk = max(1, CHUNK_BYTES // (TENSORS_PER_CHUNK * 8 * max(1, evaluations) * TRIALS_PER_SEED))
+    if workers:
+        per_chunk = min(per_chunk, -(-blocks // (workers * CHUNKS_PER_WORKER)))
+    return per_chunk
+
+
+def miscoordination_probability(curves, pickup, tds, faults, margin=0.3, trials=10000,
+                                tolerances=None, seed=None, workers=0, percentile=5.0):
+    """Probability that each adjacent (primary, backup) pair loses ``margin``.
+
+    ``curves`` holds one protection_curves curve per device, ordered from
+    downstream to upstream. A pair is miscoordinated in a trial when any
+    fault level where both devices operate has less than ``margin``
+    between them. ``fault_probability`` gives the same per fault level and
+    ``margin_percentile`` the given percentile of each pair's worst margin.
+    ``workers`` > 0 runs chunks in a process pool; None uses one worker
+    per CPU for studies above POOL_THRESHOLD evaluations.
+    """
+    pickup = np.asarray(pickup, dtype=float)
+    tds = np.asarray(tds, dtype=float)
+    faults = np.asarray(faults, dtype=float)
+    faults = faults[faults > 0]
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    pairs = max(0, len(curves) - 1)
+    trials = int(trials)
+    if trials <= 0 or pairs == 0 or len(faults) == 0:
+        return CoordinationStudy(0, np.zeros(pairs), np.zeros((pairs, len(faults))), np.full(pairs, np.nan))
+
+    if workers is None:
+        workers = os.cpu_count() if trials * len(curves) * len(faults) > POOL_THRESHOLD else 0
+
+    sizes = [min(TRIALS_PER_SEED, trials - start) for start in range(0, trials, TRIALS_PER_SEED)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    per_chunk = _blocks_per_chunk(len(sizes), len(curves) * len(faults), workers)
+    jobs = [(list(curves), pickup, tds, faults, tolerances, margin,
+             sizes[start:start + per_chunk], seeds[start:start + per_chunk])
+            for start in range(0, len(sizes), per_chunk)]
+
+    if workers and len(jobs) > 1:
+        # Spawned workers are safe to start from a threaded Qt application
+        context = multiprocessing.get_context("spawn")
+        chunksize = max(1, len(jobs) // (workers * CHUNKS_PER_WORKER))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_simulate_chunk, jobs, chunksize=chunksize))
+    else:
+        results = list(map(_simulate_chunk, jobs))
+
+    failures = sum(r[0] for r in results)
+    fault_failures = sum(r[1] for r in results)
+    worst = np.concatenate([r[2] for r in results])
+    return CoordinationStudy(trials, failures / trials, fault_failures / trials,
+                             np.percentile(worst, percentile, axis=0))
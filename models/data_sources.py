@@ -0,0 +1,364 @@
+import io
+import os
+import select
+import socket
+import sys
+import threading
+
+import numpy as np
+
+from .stream_recorder import MAGIC, HEADER_SIZE, COLUMNS, DTYPE, ROW_BYTES, read_count
+
+
+class RingBuffer:
+    """Fixed capacity buffer of (time, A, B, C) rows shared between a reader thread and the UI.
+
+    Writers copy whole blocks in at most two slices; readers keep a cursor
+    (the total number of rows seen) and collect everything written since.
+    """
+
+    def __init__(self, capacity=65536, columns=COLUMNS):
+        self._data = np.zeros((capacity, columns), dtype=np.float64)
+        self._capacity = capacity
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def total(self):
+        """Number of rows written since the buffer was created or cleared"""
+        return self._total
+
+    def clear(self):
+        with self._lock:
+            self._total = 0
+
+    def write(self, block):
+        """Append an (n, columns) block, overwriting the oldest rows when full"""
+        n = len(block)
+        if n == 0:
+            return
+        if n > self._capacity:
+            block = block[-self._capacity:]
+            skipped = n - self._capacity
+            n = self._capacity
+        else:
+            skipped = 0
+
+        with self._lock:
+            start = (self._total + skipped) % self._capacity
+            first = min(n, self._capacity - start)
+            self._data[start:start + first] = block[:first]
+            if first < n:
+                self._data[:n - first] = block[first:]
+            self._total += skipped + n
+
+    def _ordered(self, start, stop):
+        """Copy rows with absolute indices start:stop out of the ring; caller holds the lock"""
+        i0 = start % self._capacity
+        i1 = i0 + (stop - start)
+        if i1 <= self._capacity:
+            return self._data[i0:i1].copy()
+        return np.concatenate((self._data[i0:], self._data[:i1 - self._capacity]))
+
+    def read_since(self, cursor):
+        """Return the rows written after ``cursor`` and the new cursor.
+
+        If the reader fell more than a full buffer behind, only the most
+        recent ``capacity`` rows are returned.
+        """
+        with self._lock:
+            total = self._total
+            start = max(cursor, total - self._capacity)
+            if start >= total:
+                return self._data[:0].copy(), total
+            return self._ordered(start, total), total
+
+    def latest(self, count):
+        """Return up to ``count`` of the most recent rows, oldest first"""
+        with self._lock:
+            total = self._total
+            start = max(0, total - min(count, self._capacity))
+            return self._ordered(start, total)
+
+
+class DataSource:
+    """Base class for sources that stream (time, A, B, C) rows into a RingBuffer.
+
+    Subclasses implement ``_open``, ``_read_into`` and ``_close``; the reader
+    thread fills a preallocated float32 block through ``_read_into`` and
+    pushes each batch of complete rows into the buffer. ``stop`` waits up
+    to ``join_timeout`` seconds for the reader thread, which is a daemon
+    and is left to finish on its own if a read is still blocked.
+    """
+
+    join_timeout = 1.0
+
+    def __init__(self, buffer, block_rows=4096):
+        self._buffer = buffer
+        self._block = np.zeros((block_rows, COLUMNS), dtype=DTYPE)
+        self._raw = memoryview(self._block).cast('B')
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._open()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self._close()
+        except OSError:
+            pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.join_timeout)
+        self._thread = None
+
+    def _run(self):
+        pending = 0  # Bytes of a partial row carried over from the last read
+        try:
+            while not self._stop.is_set():
+                n = self._read_into(self._raw[pending:])
+                if n is None:
+                    continue  # Timed out or no data yet, check the stop flag again
+                if n == 0:
+                    break  # End of stream
+                pending += n
+                rows = pending // ROW_BYTES
+                if rows:
+                    self._buffer.write(self._block[:rows])
+                    used = rows * ROW_BYTES
+                    pending -= used
+                    if pending:
+                        self._raw[:pending] = bytes(self._raw[used:used + pending])
+        except (OSError, ValueError) as e:
+            if not self._stop.is_set():
+                self.error = str(e)
+                print(f"Data source error: {e}")
+
+    def _open(self):
+        pass
+
+    def _read_into(self, view):
+        """Fill ``view`` with raw bytes; return the count, None to retry or 0 at end of stream"""
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class BinaryFileSource(DataSource):
+    """Tail a file of float32 (time, A, B, C) rows appended by another process.
+
+    Files written by StreamRecorder are preallocated with zero rows, so
+    they are only read up to the sample count in their header, which the
+    recorder updates as it writes.
+    """
+
+    def __init__(self, buffer, path, from_start=False, poll_interval=0.05, **kwargs):
+        super().__init__(buffer, **kwargs)
+        self._path = path
+        self._from_start = from_start
+        self._poll_interval = poll_interval
+        self._file = None
+        self._recording = False
+
+    def _open(self):
+        self._file = open(self._path, 'rb', buffering=0)
+        # Rows of files written by StreamRecorder start after its header
+        self._recording = self._file.read(len(MAGIC)) == MAGIC
+        base = HEADER_SIZE if self._recording else 0
+        if self._from_start:
+            self._file.seek(base)
+        elif self._recording:
+            self._file.seek(HEADER_SIZE + read_count(self._file) * ROW_BYTES)
+        else:
+            size = self._file.seek(0, io.SEEK_END)
+            self._file.seek(max(base, size - (size - base) % ROW_BYTES))
+
+    def _read_into(self, view):
+        if self._recording:
+            available = HEADER_SIZE + read_count(self._file) * ROW_BYTES - self._file.tell()
+            view = view[:max(0, available)]
+        n = self._file.readinto(view) if len(view) else 0
+        if not n:
+            self._stop.wait(self._poll_interval)
+            return None
+        return n
+
+    def _close(self):
+        if self._file:
+            self._file.close()
+
+
+class CsvFileSource(DataSource):
+    """Tail a text file of ``time,a,b,c`` lines; lines that do not parse are skipped"""
+
+    def __init__(self, buffer, path, from_start=False, poll_interval=0.05, chunk_bytes=1 << 16, **kwargs):
+        super().__init__(buffer, **kwargs)
+        self._path = path
+        self._from_start = from_start
+        self._poll_interval = poll_interval
+        self._chunk = bytearray(chunk_bytes)
+        self._file = None
+
+    def _open(self):
+        self._file = open(self._path, 'rb', buffering=0)
+        if not self._from_start:
+            self._file.seek(0, io.SEEK_END)
+
+    def _run(self):
+        chunk = memoryview(self._chunk)
+        pending = 0
+        try:
+            while not self._stop.is_set():
+                n = self._file.readinto(chunk[pending:])
+                if not n:
+                    self._stop.wait(self._poll_interval)
+                    continue
+                pending += n
+                end = self._chunk.rfind(b'\n', 0, pending) + 1
+                if not end:
+                    if pending == len(chunk):
+                        pending = 0  # Line longer than the chunk, drop it
+                    continue
+                self._parse(chunk[:end])
+                pending -= end
+                chunk[:pending] = bytes(chunk[end:end + pending])
+        except (OSError, ValueError) as e:
+            if not self._stop.is_set():
+                self.error = str(e)
+                print(f"Data source error: {e}")
+
+    def _parse(self, lines):
+        rows = 0
+        block = self._block
+        for line in bytes(lines).splitlines():
+            fields = line.split(b',')
+            if len(fields) < COLUMNS:
+                continue
+            try:
+                block[rows] = [float(v) for v in fields[:COLUMNS]]
+            except ValueError:
+                continue  # Header or malformed line
+            rows += 1
+            if rows == len(block):
+                self._buffer.write(block)
+                rows = 0
+        if rows:
+            self._buffer.write(block[:rows])
+
+    def _close(self):
+        if self._file:
+            self._file.close()
+
+
+class SocketSource(DataSource):
+    """Receive float32 (time, A, B, C) rows over a local UDP or TCP socket.
+
+    UDP listens on ``host:port`` and treats each datagram as whole rows; TCP
+    connects to a simulator serving a continuous row stream on ``host:port``.
+    """
+
+    def __init__(self, buffer, host='127.0.0.1', port=5005, protocol='udp', timeout=0.2, **kwargs):
+        super().__init__(buffer, **kwargs)
+        self._address = (host, int(port))
+        self._protocol = protocol.lower()
+        self._timeout = timeout
+        self._socket = None
+
+    def _open(self):
+        if self._protocol == 'udp':
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._socket.bind(self._address)
+        else:
+            self._socket = socket.create_connection(self._address, timeout=self._timeout * 10)
+        self._socket.settimeout(self._timeout)
+
+    def _read_into(self, view):
+        try:
+            n = self._socket.recv_into(view)
+        except socket.timeout:
+            return None
+        if n == 0 and self._protocol == 'udp':
+            return None  # Empty datagram
+        if self._protocol == 'udp' and n % ROW_BYTES:
+            return n - n % ROW_BYTES  # Drop the partial row of a malformed datagram
+        return n
+
+    def _close(self):
+        if self._socket:
+            self._socket.close()
+
+
+class StdinSource(DataSource):
+    """Read float32 (time, A, B, C) rows piped into the application's stdin.
+
+    Where the stream has a selectable descriptor (pipes and terminals on
+    POSIX) it is polled every ``poll_interval`` seconds, so ``stop`` returns
+    promptly. Elsewhere reads block, and ``stop`` gives up on the reader
+    thread after ``join_timeout`` seconds.
+    """
+
+    join_timeout = 0.1
+
+    def __init__(self, buffer, stream=None, poll_interval=0.05, **kwargs):
+        super().__init__(buffer, **kwargs)
+        if stream is None:
+            # Windowed and frozen builds run without a console, so sys.stdin is None
+            stream = getattr(sys.stdin, "buffer", None)
+            if stream is None:
+                raise OSError("No standard input is attached to this process")
+        self._stream = stream
+        self._poll_interval = poll_interval
+        self._fd = self._selectable(self._stream)
+
+    @staticmethod
+    def _selectable(stream):
+        if os.name == 'nt':
+            return None  # select only accepts sockets on Windows
+        try:
+            return stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def _read_into(self, view):
+        if self._fd is None:
+            return self._stream.readinto(view) or 0
+        ready, _, _ = select.select([self._fd], [], [], self._poll_interval)
+        if not ready:
+            return None
+        # One read of whatever is available, bypassing the stream's buffer
+        return os.readv(self._fd, [view]) or 0
+
+
+def create_source(kind, address, buffer):
+    """Create a data source from a kind ('file', 'csv', 'udp', 'tcp', 'stdin') and address.
+
+    Files take a path and sockets take ``host:port`` (or just a port).
+    """
+    kind = kind.lower()
+    if kind == 'file':
+        return BinaryFileSource(buffer, address)
+    if kind == 'csv':
+        return CsvFileSource(buffer, address)
+    if kind in ('udp', 'tcp'):
+        host, _, port = address.rpartition(':')
+        return SocketSource(buffer, host or '127.0.0.1', int(port), protocol=kind)
+    if kind == 'stdin':
+        return StdinSource(buffer)
+    raise ValueError(f"Unknown data source: {kind}")
@@ -0,0 +1,9 @@
+"""Readers for the numeric CSV tables in ``data/``."""
+
+import numpy as np
+
+
+def read_columns(path):
+    """Numeric CSV columns by header name"""
+    data = np.genfromtxt(path, delimiter=',', names=True)
+    return {name: np.atleast_1d(data[name]).astype(float) for name in data.dtype.names}
@@ -1,7 +1,57 @@
 from PySide6.QtCore import QObject, Property, Signal, Slot, QAbstractListModel, Qt, QModelIndex
-import math
+from PySide6.QtCharts import QXYSeries
+import threading
+import numpy as np
+
+from .coordination_study import miscoordination_probability
+from .logger import setup_logger
+from .protection_curves import IdmtCurve, curve, curve_constants, curve_names, operating_times
+
+logger = setup_logger("DiscriminationAnalyzer")
+
+def grade_time_dials(unit, margin, tds_min=0.025, tds_max=10.0, step=0.01, adjustable=None):
+    """Minimum time dial settings for a radial chain ordered from downstream to upstream.
+
+    ``unit`` is the (relays, fault levels) operating time matrix at TDS 1.
+    The first relay is set to ``tds_min``. Operating time is linear in TDS,
+    so each backup's smallest dial keeping ``margin`` over its primary at
+    every fault level where both operate is max((t_primary + margin) / t_unit),
+    rounded up to ``step``. Relays that are not ``adjustable`` (fuses and
+    fixed breaker curves) keep their times as given in ``unit`` and are
+    only checked. Returns (tds, feasible); infeasible relays are left at
+    ``tds_max``.
+    """
+    unit = np.asarray(unit, dtype=float)
+    count = len(unit)
+    if adjustable is None:
+        adjustable = np.ones(count, dtype=bool)
+    tds = np.where(adjustable, float(tds_min), 1.0)
+    feasible = np.ones(count, dtype=bool)
+    for i in range(1, count):
+        primary_time = tds[i - 1] * unit[i - 1]
+        constrained = np.isfinite(primary_time) & np.isfinite(unit[i])
+        if not constrained.any():
+            continue
+        if not adjustable[i]:
+            feasible[i] = bool(np.all(unit[i, constrained] - primary_time[constrained] >= margin - 1e-9))
+            continue
+        required = np.max((primary_time[constrained] + margin) / unit[i, constrained])
+        required = round(np.ceil(required / step - 1e-9) * step, 10) if step > 0 else required
+        tds[i] = max(tds_min, required)
+        if tds[i] > tds_max:
+            tds[i] = tds_max
+            feasible[i] = False
+    return tds, feasible
+
 
 class ResultsModel(QAbstractListModel):
+    """Discrimination results, one row per (primary, backup) pair.
+
+    setResults diffs the new rows against the current ones by pair, so
+    views get row insertions, removals and dataChanged for the rows that
+    actually changed instead of a full reset.
+    """
+
     DataRole = Qt.UserRole + 1
 
     def __init__(self, parent=None):
@@ -18,36 +68,98 @@ class ResultsModel(QAbstractListModel):
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid() or index.row() >= len(self._results):
-            print(f"Invalid data access: index={index.row()}, role={role}")
             return None
         if role == self.DataRole or role == Qt.DisplayRole:
-            result = self._results[index.row()]
-            print(f"Returning data for index {index.row()}: {result}")
-            return result
+            return self._results[index.row()]
         return None
 
+    @staticmethod
+    def _key(result):
+        return (result.get("primary"), result.get("backup"))
+
     def setResults(self, results):
-        print(f"Setting new results: {results}")
+        old_keys = [self._key(r) for r in self._results]
+        new_keys = [self._key(r) for r in results]
+        new_set = set(new_keys)
+        if len(set(old_keys)) != len(old_keys) or len(new_set) != len(new_keys):
+            self._reset(results)
+            return
+
+        # Remove rows whose pair is gone, one contiguous block at a time from the bottom
+        removed = [i for i, key in enumerate(old_keys) if key not in new_set]
+        for first, last in reversed(_ranges(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._results[first:last + 1]
+            self.endRemoveRows()
+
+        kept = [self._key(r) for r in self._results]
+        old_set = set(kept)
+        if kept != [key for key in new_keys if key in old_set]:
+            # Pairs were reordered; a diff would be no cheaper than a reset
+            self._reset(results)
+            return
+
+        changed = []
+        row = 0
+        while row < len(results):
+            if row < len(self._results) and self._key(self._results[row]) == new_keys[row]:
+                if self._results[row] != results[row]:
+                    self._results[row] = results[row]
+                    changed.append(row)
+                row += 1
+                continue
+            end = row
+            while end < len(results) and new_keys[end] not in old_set:
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._results[row:row] = results[row:end]
+            self.endInsertRows()
+            row = end
+
+        for first, last in _ranges(changed):
+            self.dataChanged.emit(self.index(first), self.index(last), [self.DataRole, Qt.DisplayRole])
+        logger.debug(f"Results updated: {len(removed)} removed, {len(changed)} changed, "
+                     f"{len(results) - len(kept)} inserted")
+
+    def appendResult(self, result):
+        """Add one row at the end"""
+        row = len(self._results)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._results.append(result)
+        self.endInsertRows()
+
+    def _reset(self, results):
         self.beginResetModel()
-        self._results = results
+        self._results = list(results)
         self.endResetModel()
+        logger.debug(f"Results reset: {len(results)} rows")
+
+
+def _ranges(rows):
+    """Contiguous (first, last) runs of a sorted list of row numbers"""
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return [tuple(r) for r in runs]
 
 class DiscriminationAnalyzer(QObject):
-    """Analyzer for relay discrimination studies"""
-    
-    # Add curve definitions
-    CURVE_TYPES = {
-        "IEC Standard Inverse": {"a": 0.14, "b": 0.02},
-        "IEC Very Inverse": {"a": 13.5, "b": 1.0},
-        "IEC Extremely Inverse": {"a": 80.0, "b": 2.0},
-        "IEEE Moderately Inverse": {"a": 0.0515, "b": 0.02},
-        "IEEE Very Inverse": {"a": 19.61, "b": 2.0},
-        "IEEE Extremely Inverse": {"a": 28.2, "b": 2.0}
-    }
+    """Analyzer for relay discrimination studies.
 
+    Operating times are kept as a relays × fault levels matrix. Adding a
+    relay computes one new row and adding a fault level one new column;
+    the margin of each adjacent (primary, backup) pair is the difference of
+    consecutive rows. Pair results are updated the same way: a new relay
+    appends one result row and a new fault level one margin per pair.
+    """
+    
     analysisComplete = Signal()
     relayCountChanged = Signal()
     marginChanged = Signal()
+    gradingComplete = Signal(bool)
+    monteCarloChanged = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -55,6 +167,17 @@ class DiscriminationAnalyzer(QObject):
         self._fault_levels = []  # Fault current levels at different points
         self._results_model = ResultsModel(self)
         self._min_margin = 0.3  # Minimum discrimination time (seconds)
+        self._monte_carlo = []
+        self._monte_carlo_running = False
+        self._clear_matrix()
+
+    def _clear_matrix(self):
+        self._pickup = np.empty(0)
+        self._tds = np.empty(0)
+        self._curves = []  # Curve object of each relay
+        self._faults = np.empty(0)
+        self._times = np.empty((0, 0))  # Operating time of each relay at each fault level
+        self._pairs = []  # Result of each adjacent pair, None when it has no valid margin
 
     @Property(int, notify=relayCountChanged)
     def relayCount(self):
@@ -64,98 +187,200 @@ class DiscriminationAnalyzer(QObject):
     def relayList(self):
         return self._relays
 
+    @property
+    def operating_times(self):
+        """(relays, fault levels) operating time matrix, inf where a relay does not operate"""
+        return self._times
+
+    @property
+    def margin_matrix(self):
+        """(relays - 1, fault levels) backup minus primary time for each adjacent pair"""
+        with np.errstate(invalid='ignore'):
+            return self._times[1:] - self._times[:-1]
+
     @Slot(dict)
     def addRelay(self, relay_data):
         """Add a relay to the discrimination study"""
         if not all(key in relay_data for key in ['name', 'pickup', 'tds', 'curve_constants']):
-            print("Invalid relay data")
+            logger.warning("Invalid relay data")
             return
-        print(f"Adding relay: {relay_data}")
         self._relays.append(relay_data)
-        print(f"Total relays: {len(self._relays)}")
+        self._curves.append(self._relay_curve(relay_data["curve_constants"]))
+        self._pickup = np.append(self._pickup, float(relay_data["pickup"]))
+        self._tds = np.append(self._tds, float(relay_data["tds"]))
+        row = self._operating_times(slice(-1, None), self._faults[None, :])
+        self._times = np.vstack((self._times.reshape(len(self._relays) - 1, len(self._faults)), row))
         self.relayCountChanged.emit()
-        self._analyze_discrimination()
+        self._append_pair()
 
     @Slot(float)
     def addFaultLevel(self, current):
         """Add a fault current level to analyze"""
-        print(f"Adding fault level: {current}")
         self._fault_levels.append(current)
-        self._analyze_discrimination()
+        self._faults = np.append(self._faults, float(current))
+        column = self._operating_times(slice(None), np.array([[float(current)]]))
+        self._times = np.hstack((self._times.reshape(len(self._relays), len(self._faults) - 1), column))
+        self._append_fault_column()
 
     @Slot()
     def reset(self):
         """Reset all data"""
-        print("Resetting analyzer")
         self._relays.clear()
         self._fault_levels.clear()
+        self._clear_matrix()
         self._results_model.setResults([])
+        self._monte_carlo = []
         self.relayCountChanged.emit()
         self.analysisComplete.emit()
+        self.monteCarloChanged.emit()
 
-    def _analyze_discrimination(self):
-        print(f"Starting discrimination analysis...")
-        results = []
-        
+    @Slot(float, float, result='QVariantList')
+    def gradeTimeDials(self, tds_min=0.025, step=0.01):
+        """Set the minimum TDS of every relay that keeps minimumMargin at all fault levels.
+
+        Relays are graded in the order they were added (downstream first).
+        Returns the new TDS values; gradingComplete reports whether every
+        relay could be graded within the maximum dial.
+        """
         if len(self._relays) < 2 or not self._fault_levels:
-            print(f"Not enough data: relays={len(self._relays)}, fault_levels={len(self._fault_levels)}")
-            self._results_model.setResults([])
-            self.analysisComplete.emit()
+            return [relay["tds"] for relay in self._relays]
+        unit = operating_times(self._curves, self._pickup, 1.0, self._faults)
+        adjustable = np.array([c.adjustable for c in self._curves])
+        tds, feasible = grade_time_dials(unit, self._min_margin, tds_min, step=step, adjustable=adjustable)
+        self._tds = np.where(adjustable, tds, self._tds)
+        for relay, value, fixed in zip(self._relays, self._tds, ~adjustable):
+            if not fixed:
+                relay["tds"] = float(value)
+        self._times = self._operating_times(slice(None), self._faults[None, :])
+        self.relayCountChanged.emit()
+        self._analyze_discrimination()
+        self.gradingComplete.emit(bool(feasible.all()))
+        return self._tds.tolist()
+
+    @Slot(int, float, float, float)
+    def runMonteCarlo(self, trials, ct_error=0.05, relay_tolerance=0.05, fault_uncertainty=0.1):
+        """Estimate the miscoordination probability of each pair in the background.
+
+        ``relay_tolerance`` applies to both pickup and operating time. The
+        study uses every CPU once it is large enough to outweigh starting
+        the worker processes.
+        """
+        if self._monte_carlo_running or len(self._relays) < 2 or not self._fault_levels:
             return
-            
-        # Analyze each pair of relays
-        for i in range(len(self._relays) - 1):
-            primary = self._relays[i]
-            backup = self._relays[i + 1]
-            
-            if not primary.get('name') or not backup.get('name'):
-                continue
-            
-            result = {
-                "primary": primary["name"],
-                "backup": backup["name"],
-                "margins": [],
-                "coordinated": True
-            }
-            
-            # Check margin at each fault level
-            for fault_current in self._fault_levels:
-                print(f"Analyzing fault current: {fault_current}")
-                if not fault_current or fault_current <= 0:
-                    continue
-
-                primary_time = self._calculate_operating_time(primary, fault_current)
-                backup_time = self._calculate_operating_time(backup, fault_current)
-                
-                if primary_time is None or backup_time is None or math.isinf(primary_time) or math.isinf(backup_time):
-                    continue
-
-                margin = backup_time - primary_time
-                
-                result["margins"].append({
-                    "fault_current": fault_current,
-                    "margin": margin,
-                    "coordinated": margin >= self._min_margin
-                })
-                
-                if margin < self._min_margin:
-                    result["coordinated"] = False
-            
-            if result["margins"]:  # Only add results if there are valid margins
-                results.append(result)
-        
-        self._results_model.setResults(results)
-        print(f"Analysis complete with {len(results)} results")
+        names = [(self._relays[i].get("name", ""), self._relays[i + 1].get("name", ""))
+                 for i in range(len(self._relays) - 1)]
+        tolerances = {"ct_error": ct_error, "pickup": relay_tolerance, "time": relay_tolerance,
+                      "fault": fault_uncertainty}
+        args = (list(self._curves), self._pickup.copy(), self._tds.copy(), self._faults.copy(), self._min_margin)
+
+        def run():
+            try:
+                curves, pickup, tds, faults, margin = args
+                study = miscoordination_probability(curves, pickup, tds, faults, margin, trials,
+                                                    tolerances, workers=None)
+                self._monte_carlo = [
+                    {"primary": primary, "backup": backup, "probability": float(p),
+                     "marginPercentile": float(m), "trials": study.trials}
+                    for (primary, backup), p, m in zip(names, study.probability, study.margin_percentile)
+                ]
+            except Exception as e:
+                logger.error(f"Error running Monte Carlo study: {e}")
+            self._monte_carlo_running = False
+            self.monteCarloChanged.emit()
+
+        self._monte_carlo_running = True
+        threading.Thread(target=run, name="CoordinationMonteCarlo", daemon=True).start()
+        self.monteCarloChanged.emit()
+
+    @Property(bool, notify=monteCarloChanged)
+    def monteCarloRunning(self):
+        return self._monte_carlo_running
+
+    @Property('QVariantList', notify=monteCarloChanged)
+    def monteCarloResults(self):
+        """Miscoordination probability and 5th percentile worst margin of each pair"""
+        return self._monte_carlo
+
+    @staticmethod
+    def _relay_curve(constants):
+        """Library curve named in the constants, or a custom IDMT curve from a, b and c"""
+        if constants.get("curve"):
+            return curve(constants["curve"])
+        return IdmtCurve("Custom", constants["a"], constants["b"], constants.get("c", 0.0))
+
+    def _operating_times(self, relays, faults):
+        """Operating times of the selected relays (rows) at ``faults`` (a row vector)"""
+        return operating_times(self._curves[relays], self._pickup[relays], self._tds[relays], faults.ravel())
+
+    def _pair_result(self, i, entries):
+        """Result dict of pair (i, i + 1) from its margin entries, None when it has none"""
+        primary = self._relays[i]
+        backup = self._relays[i + 1]
+        if not primary.get('name') or not backup.get('name') or not entries:
+            return None
+        return {
+            "primary": primary["name"],
+            "backup": backup["name"],
+            "margins": entries,
+            "coordinated": all(entry["coordinated"] for entry in entries)
+        }
+
+    def _margin_entry(self, column, margin):
+        return {"fault_current": self._fault_levels[column], "margin": float(margin),
+                "coordinated": bool(margin >= self._min_margin)}
+
+    def _margin_entries(self, margins, valid):
+        return [self._margin_entry(j, margins[j]) for j in np.flatnonzero(valid)]
+
+    def _valid_margins(self, margins, faults):
+        # Pairs where either relay does not operate, or fault levels that are not positive, are skipped
+        return np.isfinite(margins) & (faults > 0)
+
+    def _publish(self):
+        self._results_model.setResults([result for result in self._pairs if result is not None])
+        self.analysisComplete.emit()
+
+    def _analyze_discrimination(self):
+        """Rebuild the result of every pair, for changes that affect all of them"""
+        margins = self.margin_matrix
+        valid = self._valid_margins(margins, self._faults)
+        self._pairs = [self._pair_result(i, self._margin_entries(margins[i], valid[i]))
+                       for i in range(len(margins))]
+        self._publish()
+
+    def _append_pair(self):
+        """Add the result of the pair formed by the newest relay; only that row is computed"""
+        if len(self._relays) < 2:
+            return
+        i = len(self._relays) - 2
+        with np.errstate(invalid='ignore'):
+            margins = self._times[i + 1] - self._times[i]
+        result = self._pair_result(i, self._margin_entries(margins, self._valid_margins(margins, self._faults)))
+        self._pairs.append(result)
+        if result is not None:
+            self._results_model.appendResult(result)
         self.analysisComplete.emit()
 
-    def _calculate_operating_time(self, relay, fault_current):
-        """Calculate relay operating time for given fault current"""
-        multiple = fault_current / relay["pickup"]
-        if multiple <= 1:
-            return float('inf')
-            
-        constants = relay["curve_constants"]
-        return (constants["a"] * relay["tds"]) / ((multiple ** constants["b"]) - 1)
+    def _append_fault_column(self):
+        """Extend every pair with the margin at the newest fault level only"""
+        if len(self._pairs) == 0:
+            self.analysisComplete.emit()
+            return
+        column = len(self._faults) - 1
+        with np.errstate(invalid='ignore'):
+            margins = self._times[1:, column] - self._times[:-1, column]
+        valid = self._valid_margins(margins, self._faults[column])
+        for i in np.flatnonzero(valid):
+            entry = self._margin_entry(column, margins[i])
+            result = self._pairs[i]
+            if result is None:
+                result = self._pair_result(i, [entry])
+            else:
+                # New dict so the results model sees the row as changed
+                result = {**result, "margins": result["margins"] + [entry],
+                          "coordinated": result["coordinated"] and entry["coordinated"]}
+            self._pairs[i] = result
+        self._publish()
 
     @Property(QObject, notify=analysisComplete)
     def results(self):
@@ -178,9 +403,24 @@ class DiscriminationAnalyzer(QObject):
 
     @Property('QVariantList', constant=True)
     def curveTypes(self):
-        return list(self.CURVE_TYPES.keys())
+        return curve_names()
+
+    @Slot(QXYSeries, int, float, float, float)
+    def fill_relay_curve(self, series, index, min_current=100.0, max_current=20000.0, max_time=10.0):
+        """Fill a series with the trip curve of relay ``index`` between the given currents.
+
+        Points at or above ``max_time`` are dropped to fit the chart.
+        """
+        if not 0 <= index < len(self._curves):
+            return
+        device = self._curves[index]
+        start = max(min_current, device.start_current(self._pickup[index]))
+        currents = np.geomspace(start, max_current, 101) if start < max_current else np.empty(0)
+        times = operating_times([device], self._pickup[index], self._tds[index], currents)[0]
+        keep = np.isfinite(times) & (times > 0) & (times < max_time)
+        series.replaceNp(currents[keep], times[keep])
 
     @Slot(str, result='QVariant')
     def getCurveConstants(self, curve_name):
         """Get curve constants for the given curve type"""
-        return self.CURVE_TYPES.get(curve_name, self.CURVE_TYPES["IEC Standard Inverse"])
+        return curve_constants(curve_name)
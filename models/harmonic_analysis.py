@@ -1,6 +1,37 @@
-from PySide6.QtCore import QObject, Property, Signal, Slot
+from PySide6.QtCore import QObject, Property, Signal, Slot, QUrl, QTimer
+from PySide6.QtCharts import QXYSeries
+from functools import lru_cache
+import threading
 import numpy as np
-import math
+
+from .waveform_import import analyze_file
+from .harmonic_tracker import SlidingHarmonicTracker
+from .data_sources import RingBuffer, create_source
+from . import harmonic_compliance
+
+MAX_ORDER = 50  # Default highest harmonic order
+DISPLAY_ORDERS = [1, 3, 5, 7, 11, 13]  # Orders shown in the individual distortion chart
+WAVEFORM_CYCLES = 2
+
+@lru_cache(maxsize=16)
+def _synthesis_basis(samples, orders, cycles=WAVEFORM_CYCLES):
+    """Stacked (2 * orders, samples) basis of sin(nθ) rows followed by cos(nθ) rows.
+
+    A harmonic M sin(nθ + φ) is M cos φ · sin(nθ) + M sin φ · cos(nθ), so the
+    whole waveform is one product of a coefficient vector with this matrix.
+    """
+    theta = np.linspace(0, 2 * np.pi * cycles, samples)
+    phase = np.outer(np.arange(1, orders + 1), theta)
+    basis = np.vstack((np.sin(phase), np.cos(phase)))
+    basis.setflags(write=False)
+    return basis
+
+def synthesize(magnitudes, angles, samples, cycles=WAVEFORM_CYCLES):
+    """Waveform from per-order magnitudes and angles (degrees), order 1 first"""
+    magnitudes = np.asarray(magnitudes, dtype=float)
+    radians = np.radians(np.asarray(angles, dtype=float))
+    coefficients = np.concatenate((magnitudes * np.cos(radians), magnitudes * np.sin(radians)))
+    return coefficients @ _synthesis_basis(samples, len(magnitudes), cycles)
 
 class HarmonicAnalysisCalculator(QObject):
     """Calculator for harmonic analysis and THD calculation"""
@@ -11,65 +42,87 @@ class HarmonicAnalysisCalculator(QObject):
     thdChanged = Signal()
     crestFactorChanged = Signal()  # Add new signal
     waveformChanged = Signal()
+    fileAnalysisChanged = Signal()
+    trackingChanged = Signal()
+    complianceChanged = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._fundamental = 100.0  # Fundamental amplitude
         self._fundamentalMagnitude = 100.0
         self._fundamentalAngle = 0.0
-        self._harmonics = [0.0] * 15  # Up to 15th harmonic
+        self._max_order = MAX_ORDER
+        self._harmonics = [0.0] * self._max_order  # Magnitude per order, fundamental first
+        self._angles = [0.0] * self._max_order
         self._harmonics_dict = {}  # Dict to store harmonic orders and their values
         self._thd = 0.0
         self._cf = 0.0
-        self._individual_distortion = [0.0] * 15
+        self._individual_distortion = [0.0] * len(DISPLAY_ORDERS)
         self._waveform_points = []
+        self._wave = np.empty(0)
         self._waveform = []
         self._spectrum_points = []
         self._spectrum = []
+        self._file_analysis = None
+        self._file_running = False
+        self._file_error = ""
+        self._compliance = {}
+        self._tracker = None
+        self._track_source = None
+        self._track_buffer = RingBuffer()
+        self._track_cursor = 0
+        self._track_channel = 0
+        self._track_timer = QTimer(self)
+        self._track_timer.setInterval(100)
+        self._track_timer.timeout.connect(self._update_tracking)
         
         self._calculate()
 
+    def _waveform_samples(self):
+        # Enough samples for about ten points per period of the highest order
+        return max(500, 10 * self._max_order * WAVEFORM_CYCLES)
+
     def _calculate(self):
         try:
-            # Update harmonics array from dictionary input
-            harmonics = [0.0] * 15  # Reset array
-            harmonics[0] = self._fundamental  # Set fundamental
-            
-            # Map harmonic orders to correct indices
-            for order, (magnitude, _) in self._harmonics_dict.items():
-                if 1 <= order < len(harmonics):
-                    harmonics[order-1] = magnitude
-            
-            self._harmonics = harmonics
-            
+            # Update magnitude and angle arrays from dictionary input
+            magnitudes = np.zeros(self._max_order)
+            angles = np.zeros(self._max_order)
+            magnitudes[0] = self._fundamental
+            angles[0] = self._fundamentalAngle
+            # The fundamental lives in _fundamental; the dict only holds orders 2 and up
+            for order, (magnitude, angle) in self._harmonics_dict.items():
+                if 2 <= order <= self._max_order:
+                    magnitudes[order - 1] = magnitude
+                    angles[order - 1] = angle
+
+            self._harmonics = magnitudes.tolist()
+            self._angles = angles.tolist()
+            fundamental = magnitudes[0]
+
             # Calculate THD using only actual harmonics (excluding fundamental)
-            if self._fundamental > 0:
-                harmonics_sum = sum(h * h for h in harmonics[1:])
-                self._thd = math.sqrt(harmonics_sum) / self._fundamental * 100.0
-            
-            # Calculate individual distortion for display harmonics [1,3,5,7,11,13]
-            display_orders = [1, 3, 5, 7, 11, 13]
-            self._individual_distortion = [
-                (harmonics[order-1] / self._fundamental * 100.0)
-                for order in display_orders
+            if fundamental > 0:
+                percent = magnitudes / fundamental * 100.0
+                self._thd = float(np.sqrt(np.sum(np.square(magnitudes[1:]))) / fundamental * 100.0)
+            else:
+                percent = np.zeros(self._max_order)
+                self._thd = 0.0
+
+            self._individual_distortion = [float(percent[order - 1]) for order in DISPLAY_ORDERS]
+            self._spectrum = [
+                {"order": int(order), "magnitude": float(magnitudes[order - 1]),
+                 "percent": float(percent[order - 1]), "angle": float(angles[order - 1])}
+                for order in np.flatnonzero(magnitudes) + 1
             ]
-            
-            # Generate waveform
-            t = np.linspace(0, 4*np.pi, 500)
-            wave = self._fundamental * np.sin(t)
-            
-            for n, amplitude in enumerate(harmonics[1:], 2):
-                if amplitude > 0:
-                    wave += amplitude * np.sin(n * t)
-            
+
+            # Generate waveform with one matrix-vector product
+            wave = synthesize(magnitudes, angles, self._waveform_samples())
+            self._wave = wave
             self._waveform = wave.tolist()
-            
+
             # Calculate crest factor
-            if wave.size:
-                rms = np.sqrt(np.mean(wave**2))
-                if rms > 0:
-                    self._cf = np.max(np.abs(wave)) / rms
-            
+            rms = np.sqrt(np.mean(wave ** 2)) if wave.size else 0.0
+            self._cf = float(np.max(np.abs(wave)) / rms) if rms > 0 else 0.0
+
             self.batchUpdate()
             
         except Exception as e:
@@ -79,6 +132,7 @@ class HarmonicAnalysisCalculator(QObject):
         """Emit all signals at once to reduce update frequency"""
         self.harmonicsChanged.emit()
         self.waveformChanged.emit()
+        self.crestFactorChanged.emit()
         self.calculationsComplete.emit()
 
     # Properties and setters...
@@ -114,16 +168,34 @@ class HarmonicAnalysisCalculator(QObject):
     def waveformPoints(self):
         return self._waveform_points
 
-    @Property(list)
+    @Property(list, notify=calculationsComplete)
+    def angles(self):
+        """Harmonic angles in degrees, fundamental first"""
+        return self._angles
+
+    @Property(int, notify=calculationsComplete)
+    def maxOrder(self):
+        return self._max_order
+
+    @Property(list, notify=waveformChanged)
     def waveform(self):
         """Get time-domain waveform points."""
         return self._waveform
-        
-    @Property(list)
+
+    @Property(float, notify=waveformChanged)
+    def waveformPeak(self):
+        return float(np.max(np.abs(self._wave))) if self._wave.size else 0.0
+
+    @Property(list, notify=calculationsComplete)
     def spectrum(self):
-        """Get frequency spectrum points."""
+        """Non-zero harmonic orders as {order, magnitude, percent, angle} maps."""
         return self._spectrum
 
+    @Slot(QXYSeries)
+    def fill_waveform(self, series):
+        """Replace the series points with the waveform, x in degrees over 0-360"""
+        series.replaceNp(np.linspace(0, 360, len(self._wave), endpoint=False), self._wave)
+
     @Slot(float)
     def setFundamental(self, value):
         self.fundamental = value
@@ -138,16 +210,190 @@ class HarmonicAnalysisCalculator(QObject):
 
     @Slot(int, float, float)
     def setHarmonic(self, order, magnitude, angle=0):
-        """Set magnitude and angle for a harmonic order."""
-        if order > 0 and order <= len(self._harmonics):
+        """Set magnitude and angle for a harmonic order; order 1 sets the fundamental."""
+        if order == 1 and magnitude >= 0:
+            self._fundamental = magnitude
+            self._fundamentalAngle = angle
+            self.fundamentalChanged.emit()
+            self._calculate()
+        elif 1 < order <= self._max_order:
             self._harmonics_dict[order] = (magnitude, angle)
-            print(f"Setting harmonic {order} to magnitude {magnitude}")  # Debug print
+            self._calculate()
+
+    @Slot(int)
+    def setMaxOrder(self, order):
+        """Set the highest harmonic order synthesized (at least 50 is typical)"""
+        if order >= max(DISPLAY_ORDERS) and order != self._max_order:
+            self._max_order = int(order)
             self._calculate()
 
     @Slot(list)
     def setAllHarmonics(self, harmonics):
-        """Set all harmonic amplitudes at once"""
-        if len(harmonics) <= len(self._harmonics):
-            self._harmonics = harmonics + [0.0] * (len(self._harmonics) - len(harmonics))
-            self.harmonicsChanged.emit()
+        """Set all harmonic amplitudes at once, fundamental first"""
+        if 0 < len(harmonics) <= self._max_order:
+            if harmonics[0] >= 0 and harmonics[0] != self._fundamental:
+                self._fundamental = float(harmonics[0])
+                self.fundamentalChanged.emit()
+            for order, magnitude in enumerate(harmonics[1:], 2):
+                angle = self._harmonics_dict.get(order, (0.0, 0.0))[1]
+                self._harmonics_dict[order] = (magnitude, angle)
             self._calculate()
+
+    @Slot(str, float, float)
+    def analyzeFile(self, path, sample_rate, fundamental_frequency=50.0):
+        """Analyze a recorded waveform file (CSV or raw float32) in the background"""
+        if self.fileAnalysisRunning or sample_rate <= 0 or fundamental_frequency <= 0:
+            return
+        if path.startswith("file:"):
+            path = QUrl(path).toLocalFile()
+
+        def run():
+            try:
+                self._file_analysis = analyze_file(path, sample_rate, fundamental_frequency,
+                                                   orders=self._max_order, workers=None)
+                self._file_error = ""
+            except Exception as e:
+                self._file_error = str(e)
+                print(f"Error analyzing waveform file: {e}")
+            self._file_running = False
+            self.fileAnalysisChanged.emit()
+
+        self._file_running = True
+        threading.Thread(target=run, name="WaveformFileAnalysis", daemon=True).start()
+        self.fileAnalysisChanged.emit()
+
+    @Property(bool, notify=fileAnalysisChanged)
+    def fileAnalysisRunning(self):
+        return self._file_running
+
+    @Property('QVariantMap', notify=fileAnalysisChanged)
+    def fileSummary(self):
+        """Window count, duration and worst-case THD, TDD and crest factor of the analyzed file"""
+        result = self._file_analysis
+        if result is None or not len(result.times):
+            return {"windows": 0, "duration": 0.0, "maxThd": 0.0, "maxTdd": 0.0,
+                    "maxCrestFactor": 0.0, "error": self._file_error}
+        return {
+            "windows": len(result.times),
+            "duration": float(result.times[-1] + (result.times[1] if len(result.times) > 1 else 0.0)),
+            "maxThd": float(result.thd.max()),
+            "maxTdd": float(result.tdd.max()),
+            "maxCrestFactor": float(result.crest_factor.max()),
+            "error": self._file_error
+        }
+
+    @Slot(QXYSeries, int)
+    def fill_file_trend(self, series, order):
+        """Replace the series with the THD trend (order 0) or a harmonic's percentage of the fundamental"""
+        result = self._file_analysis
+        if result is None:
+            return
+        if order <= 0:
+            values = result.thd
+        elif order <= result.harmonics.shape[1]:
+            fundamental = result.harmonics[:, 0].astype(float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = np.where(fundamental > 0, result.harmonics[:, order - 1] / fundamental * 100.0, 0.0)
+        else:
+            return
+        series.replaceNp(result.times, np.ascontiguousarray(values, dtype=float))
+
+    @Slot(str, str, int, float, float)
+    def startTracking(self, kind, address, channel, sample_rate, fundamental_frequency=50.0):
+        """Track harmonics live from a data source ('file', 'csv', 'udp', 'tcp', 'stdin').
+
+        ``channel`` selects A, B or C of the (time, A, B, C) rows.
+        """
+        self.stopTracking()
+        try:
+            self._tracker = SlidingHarmonicTracker(sample_rate, fundamental_frequency,
+                                                   range(1, self._max_order + 1))
+            self._track_buffer.clear()
+            self._track_cursor = 0
+            self._track_channel = min(max(int(channel), 0), 2)
+            self._track_source = create_source(kind, address, self._track_buffer)
+            self._track_source.start()
+            self._track_timer.start()
+        except Exception as e:
+            print(f"Error starting harmonic tracking: {e}")
+            self._tracker = None
+            self._track_source = None
+        self.trackingChanged.emit()
+
+    @Slot()
+    def stopTracking(self):
+        self._track_timer.stop()
+        if self._track_source is not None:
+            self._track_source.stop()
+            self._track_source = None
+            self.trackingChanged.emit()
+
+    @Property(bool, notify=trackingChanged)
+    def tracking(self):
+        return self._track_source is not None
+
+    def _update_tracking(self):
+        rows, self._track_cursor = self._track_buffer.read_since(self._track_cursor)
+        if len(rows):
+            self.push_samples(rows[:, 1 + self._track_channel])
+
+    def push_samples(self, samples):
+        """Feed live samples to the tracker and refresh the harmonic properties"""
+        if self._tracker is None:
+            return
+        self._tracker.push(samples)
+        orders = self._tracker.orders
+        # No orders fit the window when the sample rate is too low for the fundamental
+        if not self._tracker.ready or len(orders) == 0:
+            return
+        magnitudes = self._tracker.magnitudes()
+        angles = self._tracker.angles()
+        harmonics = orders >= 2
+        if orders[0] == 1:
+            fundamental = float(magnitudes[0])
+            if fundamental != self._fundamental or self._fundamentalAngle != 0.0:
+                self._fundamental = fundamental
+                self._fundamentalAngle = 0.0
+                self.fundamentalChanged.emit()
+        self._harmonics_dict = {
+            int(order): (float(magnitude), float(angle))
+            for order, magnitude, angle in zip(orders[harmonics], magnitudes[harmonics], angles[harmonics])
+        }
+        self._calculate()
+
+    @Property(list, constant=True)
+    def complianceStandards(self):
+        return harmonic_compliance.STANDARDS
+
+    @Property('QVariantMap', notify=complianceChanged)
+    def complianceReport(self):
+        return self._compliance
+
+    @Slot(str, float, float)
+    def checkCompliance(self, standard, isc_il=20.0, bus_kv=0.4):
+        """Check the current spectrum, and any analyzed file windows, against ``standard``.
+
+        Current checks take the fundamental as the demand current IL for the
+        spectrum and the file's demand current for its windows.
+        """
+        try:
+            result = harmonic_compliance.check([self._harmonics], standard, isc_il, bus_kv)
+            report = {
+                "standard": standard,
+                "compliant": bool(result.compliant[0]),
+                "distortion": float(result.distortion[0]),
+                "distortionLimit": float(result.distortion_limit[0]),
+                "worstOrder": int(result.worst_order[0]),
+                "worstRatio": float(result.worst_ratio[0]),
+                "violations": [int(h) for h in np.flatnonzero(result.violations[0]) + 1]
+            }
+            analysis = self._file_analysis
+            if analysis is not None and len(analysis.times):
+                windows = harmonic_compliance.check(analysis.harmonics, standard, isc_il, bus_kv,
+                                                    demand_current=analysis.demand_current)
+                report["file"] = harmonic_compliance.summarize(windows, np.round(analysis.times, 1))
+                report["file"]["percentileCompliant"] = harmonic_compliance.percentile_compliance(windows)
+            self._compliance = report
+            self.complianceChanged.emit()
+        except Exception as e:
+            print(f"Error checking harmonic compliance: {e}")
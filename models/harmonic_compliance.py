@@ -0,0 +1,175 @@
+"""Harmonic compliance checks against IEEE 519 and IEC 61000-2-2 limit tables.
+
+Limit tables are loaded from ``data/harmonic_limits.json`` and expanded to
+per-order arrays once, so checking many spectra is a handful of array
+operations. Spectra are (sites, orders) arrays with the fundamental in the
+first column: rows may be measurement sites, or the windows of a
+waveform_import analysis.
+"""
+
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .config import DATA_DIR
+
+LIMITS_FILE = DATA_DIR / 'harmonic_limits.json'
+
+IEEE519_CURRENT = "ieee519-current"
+IEEE519_VOLTAGE = "ieee519-voltage"
+IEC61000_2_2 = "iec61000-2-2"
+STANDARDS = [IEEE519_CURRENT, IEEE519_VOLTAGE, IEC61000_2_2]
+
+# worst_ratio is the largest of the individual limit ratios and the THD/TDD
+# ratio; worst_order is the harmonic order it belongs to, or 0 for THD/TDD.
+ComplianceResult = namedtuple(
+    "ComplianceResult",
+    ["percent", "limits", "violations", "distortion", "distortion_limit", "compliant",
+     "worst_order", "worst_ratio"]
+)
+
+
+@lru_cache(maxsize=4)
+def load_limits(path=LIMITS_FILE):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _orders(count):
+    return np.arange(1, count + 1)
+
+
+def current_limits(isc_il, orders, tables=None):
+    """IEEE 519 individual (sites, orders) and TDD (sites,) limits in percent of IL.
+
+    ``isc_il`` is the short-circuit ratio of each site; the fundamental
+    column has no limit (inf).
+    """
+    table = (tables or load_limits())["ieee519_current"]
+    isc_il = np.atleast_1d(np.asarray(isc_il, dtype=float))
+    orders = np.asarray(orders)
+    # Classes are < 20, 20 to < 50, ... so a ratio on a bound belongs to the class above it
+    site_class = np.searchsorted(table["isc_il_bounds"], isc_il, side='right')
+    band = np.searchsorted(table["order_bands"], orders, side='right') - 1
+    individual = np.asarray(table["individual"])[site_class][:, np.clip(band, 0, None)]
+    individual = np.where(orders % 2 == 0, individual * table["even_factor"], individual)
+    individual = np.where((orders < 2) | (orders > table["max_order"]), np.inf, individual)
+    return individual, np.asarray(table["tdd"])[site_class]
+
+
+def voltage_limits(bus_kv, orders, tables=None):
+    """IEEE 519 individual (sites, orders) and THD (sites,) voltage limits by bus voltage"""
+    table = (tables or load_limits())["ieee519_voltage"]
+    bus_kv = np.atleast_1d(np.asarray(bus_kv, dtype=float))
+    orders = np.asarray(orders)
+    site_class = np.searchsorted(table["bus_kv_bounds"], bus_kv, side='left')
+    individual = np.repeat(np.asarray(table["individual"])[site_class][:, None], len(orders), axis=1)
+    individual[:, (orders < 2) | (orders > table["max_order"])] = np.inf
+    return individual, np.asarray(table["thd"])[site_class]
+
+
+def iec_voltage_limits(orders, tables=None):
+    """IEC 61000-2-2 compatibility levels (1, orders) and THD (1,)"""
+    table = (tables or load_limits())["iec61000_2_2"]
+    levels = dict(zip(table["orders"], table["individual"]))
+    individual = np.array([[levels.get(int(h), np.inf) for h in orders]])
+    return individual, np.array([table["thd"]])
+
+
+def _evaluate(percent, limits, distortion_limit):
+    distortion = np.sqrt(np.sum(np.square(percent[:, 1:]), axis=1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(np.isfinite(limits), percent / limits, 0.0)
+    violations = ratio > 1.0
+    worst = ratio.argmax(axis=1)
+    worst_ratio = ratio[np.arange(len(ratio)), worst]
+    distortion_ratio = distortion / distortion_limit
+    compliant = ~violations.any(axis=1) & (distortion_ratio <= 1.0)
+    worst_order = np.where(distortion_ratio > worst_ratio, 0, worst + 1)
+    return ComplianceResult(percent, limits, violations, distortion, distortion_limit, compliant,
+                            worst_order, np.maximum(worst_ratio, distortion_ratio))
+
+
+def check_current(harmonics, demand_current, isc_il, tables=None):
+    """Check harmonic currents (sites, orders) in amps against IEEE 519.
+
+    ``demand_current`` (IL) and ``isc_il`` are scalars or one value per
+    site. The distortion figure is TDD.
+    """
+    harmonics = np.atleast_2d(np.asarray(harmonics, dtype=float))
+    demand_current = np.broadcast_to(np.asarray(demand_current, dtype=float), (len(harmonics),))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = harmonics / demand_current[:, None] * 100.0
+    limits, tdd = current_limits(np.broadcast_to(isc_il, (len(harmonics),)),
+                                 _orders(harmonics.shape[1]), tables)
+    return _evaluate(percent, limits, tdd)
+
+
+def check_voltage(harmonics, standard=IEEE519_VOLTAGE, bus_kv=0.4, tables=None):
+    """Check harmonic voltages (sites, orders) against IEEE 519 or IEC 61000-2-2.
+
+    Percentages are of each row's fundamental. The distortion figure is THD.
+    """
+    harmonics = np.atleast_2d(np.asarray(harmonics, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = harmonics / harmonics[:, :1] * 100.0
+    orders = _orders(harmonics.shape[1])
+    if standard == IEC61000_2_2:
+        limits, thd = iec_voltage_limits(orders, tables)
+        limits = np.broadcast_to(limits, percent.shape)
+        thd = np.broadcast_to(thd, (len(percent),))
+    else:
+        limits, thd = voltage_limits(np.broadcast_to(bus_kv, (len(harmonics),)), orders, tables)
+    return _evaluate(percent, limits, thd)
+
+
+def check(harmonics, standard, isc_il=20.0, bus_kv=0.4, demand_current=None, tables=None):
+    """Check spectra against ``standard`` (one of STANDARDS).
+
+    For current checks without a demand current, the largest fundamental
+    in the set is used as IL.
+    """
+    if standard == IEEE519_CURRENT:
+        harmonics = np.atleast_2d(np.asarray(harmonics, dtype=float))
+        if demand_current is None:
+            demand_current = harmonics[:, 0].max() if len(harmonics) else 0.0
+        return check_current(harmonics, demand_current, isc_il, tables)
+    if standard in (IEEE519_VOLTAGE, IEC61000_2_2):
+        return check_voltage(harmonics, standard, bus_kv, tables)
+    raise ValueError(f"Unknown harmonic standard: {standard}")
+
+
+def percentile_compliance(result, percentile=95.0):
+    """Whether the given percentile of each order across all rows is within the limits.
+
+    IEEE 519 assesses percentiles of the measured values over a week
+    rather than requiring every window to comply.
+    """
+    values = np.percentile(result.percent, percentile, axis=0)
+    distortion = np.percentile(result.distortion, percentile)
+    limits = result.limits.min(axis=0)
+    return bool(np.all(values <= limits) and distortion <= result.distortion_limit.min())
+
+
+def summarize(result, names=None, worst=10):
+    """Summary of a compliance result for reports and QML.
+
+    ``names`` is any indexable of site labels (row numbers from 1 by default).
+    """
+    count = len(result.compliant)
+    order_counts = result.violations.sum(axis=0)
+    ranked = np.argsort(result.worst_ratio)[::-1][:worst]
+    return {
+        "sites": count,
+        "compliant": int(result.compliant.sum()),
+        "violating": int(count - result.compliant.sum()),
+        "maxDistortion": float(result.distortion.max()) if count else 0.0,
+        "orderViolations": {str(h): int(n) for h, n in zip(_orders(len(order_counts)), order_counts) if n},
+        "worst": [
+            {"name": str(names[i]) if names is not None else str(i + 1), "order": int(result.worst_order[i]),
+             "ratio": float(result.worst_ratio[i]), "distortion": float(result.distortion[i])}
+            for i in ranked if not result.compliant[i]
+        ]
+    }
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class SlidingHarmonicTracker:
+    """Sliding DFT over a window of whole fundamental cycles for selected harmonic orders.
+
+    Only the bins of the tracked orders are kept. A block of B samples
+    updates them as X = X·w^B + Σ d[m]·w^(B-m), with d the new samples minus
+    the samples leaving the window, so each sample costs O(k) for k orders.
+    The powers of w come from a precomputed table. The bins are recomputed
+    exactly from the window every ``resync_windows`` windows so rounding
+    error cannot build up.
+    """
+
+    def __init__(self, sample_rate, fundamental=50.0, orders=range(1, 51), cycles=1, resync_windows=50):
+        self._length = max(2, int(round(cycles * sample_rate / fundamental)))
+        self._cycles = int(cycles)
+        # Orders above the Nyquist frequency cannot be resolved
+        self._orders = np.array([h for h in orders if 0 < h * cycles < self._length / 2], dtype=int)
+        self._bins = self._orders * self._cycles
+        exponent = np.outer(np.arange(self._length + 1), self._bins) / self._length
+        self._powers = np.exp(2j * np.pi * exponent)  # w^j for j = 0 .. length
+        self._resync_interval = self._length * max(1, int(resync_windows))
+        self.reset()
+
+    @property
+    def orders(self):
+        return self._orders
+
+    @property
+    def window_length(self):
+        return self._length
+
+    @property
+    def ready(self):
+        """True once a full window of samples has been seen"""
+        return self._count >= self._length
+
+    def reset(self):
+        self._window = np.zeros(self._length)
+        self._position = 0  # Ring index of the oldest sample
+        self._count = 0
+        self._since_resync = 0
+        self._bins_value = np.zeros(len(self._bins), dtype=complex)
+
+    def push(self, samples):
+        """Add a block of samples"""
+        samples = np.asarray(samples, dtype=float).ravel()
+        for start in range(0, len(samples), self._length):
+            self._push_chunk(samples[start:start + self._length])
+        if self._since_resync >= self._resync_interval:
+            self._resync()
+
+    def _push_chunk(self, chunk):
+        n = len(chunk)
+        index = (self._position + np.arange(n)) % self._length
+        delta = chunk - self._window[index]
+        self._window[index] = chunk
+        self._position = (self._position + n) % self._length
+        # X·w^n + Σ delta[m]·w^(n-m), with w^(n-m) read backwards from the table
+        self._bins_value = self._bins_value * self._powers[n] + delta @ self._powers[n:0:-1]
+        self._count += n
+        self._since_resync += n
+
+    def _resync(self):
+        ordered = np.roll(self._window, -self._position)
+        self._bins_value = np.fft.rfft(ordered)[self._bins]
+        self._since_resync = 0
+
+    def magnitudes(self):
+        """Peak amplitude of each tracked order"""
+        return np.abs(self._bins_value) * (2.0 / self._length)
+
+    def angles(self):
+        """Phase angle of each order in degrees for a sine series with the fundamental at 0°"""
+        phase = np.angle(self._bins_value) + np.pi / 2  # DFT phase to sine phase
+        if len(self._orders) and self._orders[0] == 1:
+            phase = phase - self._orders * phase[0]
+        return (np.degrees(phase) + 180.0) % 360.0 - 180.0
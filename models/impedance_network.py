@@ -0,0 +1,268 @@
+"""Impedance network engine for R/L/C series, parallel and ladder topologies.
+
+Networks are trees of elements evaluated over a whole frequency vector at
+once with NumPy complex arithmetic. Element values may be overridden by
+name with arrays of component value sets, so a tolerance sweep is a single
+evaluation returning a (sets, frequencies) array.
+"""
+
+import itertools
+
+import numpy as np
+
+
+class Element:
+    """Base class for network elements"""
+
+    def impedance(self, frequencies, values=None):
+        """Complex impedance over ``frequencies`` (Hz).
+
+        ``values`` maps element names to replacement values; arrays of
+        shape (sets,) give a result of shape (sets, len(frequencies)).
+        """
+        omega = 2 * np.pi * np.asarray(frequencies, dtype=float)
+        return self._impedance(omega, self._prepare(values))
+
+    @staticmethod
+    def _prepare(values):
+        if not values:
+            return {}
+        # Value sets become column vectors so they broadcast against frequency
+        return {name: np.asarray(v, dtype=float)[..., np.newaxis] for name, v in values.items()}
+
+    def _impedance(self, omega, values):
+        raise NotImplementedError
+
+
+class Component(Element):
+    """A single resistor, inductor or capacitor"""
+
+    kind = None
+
+    def __init__(self, value, name=None):
+        self.value = float(value)
+        self.name = name
+
+    def _value(self, values):
+        return values.get(self.name, self.value) if self.name else self.value
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.value!r}, name={self.name!r})"
+
+
+class Resistor(Component):
+    kind = "R"
+
+    def _impedance(self, omega, values):
+        return self._value(values) + 0j * omega
+
+
+class Inductor(Component):
+    kind = "L"
+
+    def _impedance(self, omega, values):
+        return 1j * omega * self._value(values)
+
+
+class Capacitor(Component):
+    kind = "C"
+
+    def _impedance(self, omega, values):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 1 / (1j * omega * self._value(values))
+
+
+class Series(Element):
+    def __init__(self, *elements):
+        self.elements = list(elements)
+
+    def _impedance(self, omega, values):
+        total = 0j
+        for element in self.elements:
+            total = total + element._impedance(omega, values)
+        return total
+
+
+class Parallel(Element):
+    def __init__(self, *elements):
+        self.elements = list(elements)
+
+    def _impedance(self, omega, values):
+        admittance = 0j
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for element in self.elements:
+                admittance = admittance + 1 / element._impedance(omega, values)
+            return 1 / admittance
+
+
+class Ladder(Element):
+    """Two-port ladder of alternating series and shunt arms.
+
+    ``stages`` is a list of (series, shunt) pairs, either of which may be
+    None; the ladder is driven at the first stage and terminated by
+    ``load`` (open circuit when None).
+    """
+
+    def __init__(self, stages, load=None):
+        self.stages = list(stages)
+        self.load = load
+
+    def abcd(self, frequencies, values=None):
+        """Chain ABCD parameters (A, B, C, D) of the unloaded ladder"""
+        omega = 2 * np.pi * np.asarray(frequencies, dtype=float)
+        return self._abcd(omega, self._prepare(values))
+
+    def _abcd(self, omega, values):
+        a, b, c, d = 1 + 0j, 0j, 0j, 1 + 0j
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for series, shunt in self.stages:
+                if series is not None:
+                    # Multiply by [[1, Z], [0, 1]]
+                    z = series._impedance(omega, values)
+                    b = a * z + b
+                    d = c * z + d
+                if shunt is not None:
+                    # Multiply by [[1, 0], [Y, 1]]
+                    y = 1 / shunt._impedance(omega, values)
+                    a = a + b * y
+                    c = c + d * y
+        return a, b, c, d
+
+    def _impedance(self, omega, values):
+        """Input impedance with the load connected"""
+        a, b, c, d = self._abcd(omega, values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.load is None:
+                return a / c
+            z_load = self.load._impedance(omega, values)
+            return (a * z_load + b) / (c * z_load + d)
+
+    def transfer(self, frequencies, values=None):
+        """Voltage transfer function Vout / Vin across the load"""
+        omega = 2 * np.pi * np.asarray(frequencies, dtype=float)
+        values = self._prepare(values)
+        a, b, _, _ = self._abcd(omega, values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.load is None:
+                return 1 / a
+            return 1 / (a + b / self.load._impedance(omega, values))
+
+
+def transfer(network, frequencies, values=None, source=None):
+    """Voltage transfer Vout / Vin of a network.
+
+    Ladders use their load as the output; any other element is treated as
+    the lower arm of a divider fed through ``source`` (or driven directly
+    when no source impedance is given, returning 1).
+    """
+    if isinstance(network, Ladder):
+        return network.transfer(frequencies, values)
+    z = network.impedance(frequencies, values)
+    if source is None:
+        return np.ones_like(z)
+    z_source = source.impedance(frequencies, values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return z / (z + z_source)
+
+
+_COMPONENTS = {"R": Resistor, "L": Inductor, "C": Capacitor}
+
+
+def build_network(spec):
+    """Build a network from a nested netlist description.
+
+    Components are ``{"type": "R"|"L"|"C", "value": x, "name": "R1"}``,
+    groups are ``{"type": "series"|"parallel", "elements": [...]}`` and
+    ladders are ``{"type": "ladder", "stages": [{"series": ..., "shunt": ...}], "load": ...}``.
+    """
+    if isinstance(spec, Element):
+        return spec
+    kind = spec.get("type", "")
+    if kind.upper() in _COMPONENTS:
+        return _COMPONENTS[kind.upper()](spec["value"], spec.get("name"))
+    kind = kind.lower()
+    if kind == "series":
+        return Series(*(build_network(e) for e in spec.get("elements", [])))
+    if kind == "parallel":
+        return Parallel(*(build_network(e) for e in spec.get("elements", [])))
+    if kind == "ladder":
+        stages = [
+            (build_network(s["series"]) if s.get("series") else None,
+             build_network(s["shunt"]) if s.get("shunt") else None)
+            for s in spec.get("stages", [])
+        ]
+        load = spec.get("load")
+        return Ladder(stages, build_network(load) if load else None)
+    raise ValueError(f"Unknown network element: {kind}")
+
+
+def components(network):
+    """Map component names to their nominal values"""
+    found = {}
+
+    def walk(element):
+        if isinstance(element, Component):
+            if element.name:
+                found[element.name] = element.value
+        elif isinstance(element, (Series, Parallel)):
+            for e in element.elements:
+                walk(e)
+        elif isinstance(element, Ladder):
+            for pair in element.stages:
+                for e in pair:
+                    if e is not None:
+                        walk(e)
+            if element.load is not None:
+                walk(element.load)
+
+    walk(network)
+    return found
+
+
+def tolerance_sets(nominal, tolerances, samples=None, seed=None):
+    """Component value sets for a tolerance study.
+
+    ``tolerances`` maps names to fractional tolerances (0.05 for ±5%).
+    Without ``samples`` every min/max corner is returned (2**n sets);
+    otherwise ``samples`` uniform random sets are drawn.
+    """
+    names = list(tolerances)
+    if samples is None:
+        signs = np.array(list(itertools.product((-1.0, 1.0), repeat=len(names))))
+    else:
+        rng = np.random.default_rng(seed)
+        signs = rng.uniform(-1.0, 1.0, size=(samples, len(names)))
+    return {
+        name: nominal[name] * (1 + tolerances[name] * signs[:, i])
+        for i, name in enumerate(names)
+    }
+
+
+def tolerance_sweep(network, frequencies, tolerances, samples=None, seed=None):
+    """Evaluate impedance for every tolerance set in one pass.
+
+    Returns (value sets, impedance) where impedance has shape
+    (sets, len(frequencies)).
+    """
+    values = tolerance_sets(components(network), tolerances, samples, seed)
+    return values, network.impedance(frequencies, values)
+
+
+def resonances(frequencies, impedance):
+    """Frequencies where the reactance changes sign, interpolated linearly.
+
+    Works on the last axis so a (sets, frequencies) impedance array gives a
+    list of resonance arrays, one per set.
+    """
+    frequencies = np.asarray(frequencies, dtype=float)
+    x = np.imag(np.atleast_2d(impedance))
+    with np.errstate(invalid='ignore'):
+        crossing = np.signbit(x[:, :-1]) != np.signbit(x[:, 1:])
+        crossing &= np.isfinite(x[:, :-1]) & np.isfinite(x[:, 1:])
+    result = []
+    for row, flags in zip(x, crossing):
+        i = np.flatnonzero(flags)
+        x0, x1 = row[i], row[i + 1]
+        f0, f1 = frequencies[i], frequencies[i + 1]
+        result.append(f0 - x0 * (f1 - f0) / (x1 - x0))
+    return result
@@ -0,0 +1,125 @@
+"""Multi-section line cascade with tapped constant-power loads.
+
+A feeder is a chain of sections, each with its own per-km series
+impedance and shunt admittance, and a load tapped at the far end of every
+section. Node 0 is the sending end and node k the end of section k. Each
+section's ABCD matrix (from ``line_abcd``) is multiplied by the shunt
+matrix [[1, 0], [Y, 1]] of its tap, and the chain products from every
+node to the open far end are built with a log-depth scan of batched 2×2
+products over stacked (sections, 2, 2) arrays, so a solve costs
+log2(sections) array operations. The products are written out element by
+element: ``np.matmul`` on stacks of 2×2 complex matrices runs a generic
+loop per matrix and is over ten times slower.
+Constant-power loads are converted to shunt admittances at the latest
+node voltages and the linear chain is re-solved until the voltages settle.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .logger import setup_logger
+from .transmission_calculator import line_abcd
+
+logger = setup_logger("LineCascade")
+
+CascadeResult = namedtuple(
+    "CascadeResult",
+    ["positions", "voltage", "current", "load_current", "sending_current", "iterations", "converged"]
+)
+
+
+def section_constants(frequency, resistance, inductance, capacitance, conductance=0.0):
+    """Per-km Z (Ω/km) and Y (S/km) of each section from R (Ω/km), L (mH/km), C (µF/km), G (S/km)"""
+    w = 2 * np.pi * frequency
+    z = np.asarray(resistance, dtype=float) + 1j * w * np.asarray(inductance, dtype=float) * 1e-3
+    y = np.asarray(conductance, dtype=float) + 1j * w * np.asarray(capacitance, dtype=float) * 1e-6
+    z, y = np.broadcast_arrays(z, y)
+    return z, y
+
+
+def section_matrices(lengths, z, y):
+    """(sections, 2, 2) ABCD matrices of each section"""
+    a, b, c, d, _, _ = line_abcd(z, y, np.asarray(lengths, dtype=float))
+    return np.stack((np.stack((a, b), axis=-1), np.stack((c, d), axis=-1)), axis=-2)
+
+
+def matmul2(x, y):
+    """Batched product of stacked 2×2 matrices, x @ y over the leading axes"""
+    out = np.empty(np.broadcast_shapes(x.shape, y.shape), dtype=np.result_type(x, y))
+    out[..., 0, 0] = x[..., 0, 0] * y[..., 0, 0] + x[..., 0, 1] * y[..., 1, 0]
+    out[..., 0, 1] = x[..., 0, 0] * y[..., 0, 1] + x[..., 0, 1] * y[..., 1, 1]
+    out[..., 1, 0] = x[..., 1, 0] * y[..., 0, 0] + x[..., 1, 1] * y[..., 1, 0]
+    out[..., 1, 1] = x[..., 1, 0] * y[..., 0, 1] + x[..., 1, 1] * y[..., 1, 1]
+    return out
+
+
+def suffix_products(matrices):
+    """M[k] @ M[k+1] @ ... @ M[n-1] for every k, by a Hillis-Steele scan of batched products"""
+    result = np.array(matrices, dtype=complex)
+    shift = 1
+    while shift < len(result):
+        # The right-hand side is evaluated before assignment, so every product uses the previous pass
+        result[:-shift] = matmul2(result[:-shift], result[shift:])
+        shift *= 2
+    return result
+
+
+def _linear_solution(sections, chained, loads, tap_voltage, sending_voltage):
+    """Chain products and far-end voltage with the loads fixed as admittances at ``tap_voltage``"""
+    admittance = np.where(np.abs(tap_voltage) > 0, np.conj(loads) / np.abs(tap_voltage) ** 2, 0.0)
+    # Section @ [[1, 0], [Y, 1]] only changes the first column
+    chained[:, :, 0] = sections[:, :, 0] + sections[:, :, 1] * admittance[:, None]
+    chain = suffix_products(chained)
+    # The far end is open, so every node state is a multiple of the far-end voltage
+    return admittance, chain, sending_voltage / chain[0, 0, 0]
+
+
+def solve_cascade(lengths, z, y, loads, sending_voltage, tol=1e-9, max_iter=50):
+    """Node voltages and currents of a feeder with constant-power taps.
+
+    ``lengths`` (km), per-km ``z`` and ``y`` and ``loads`` (complex VA per
+    phase, drawn at the end of each section) are per-section arrays;
+    ``sending_voltage`` is the phase voltage at node 0. ``current`` is the
+    current leaving each node towards the far end, which is open. The
+    iteration stops when no node voltage moves by more than ``tol`` times
+    the sending voltage; if that does not happen within ``max_iter``
+    iterations, or the voltages collapse, ``converged`` is False and a
+    warning is logged.
+    """
+    lengths = np.atleast_1d(np.asarray(lengths, dtype=float))
+    if len(lengths) == 0:
+        raise ValueError("A cascade needs at least one section")
+    loads = np.broadcast_to(np.asarray(loads, dtype=complex), lengths.shape)
+    sections = section_matrices(lengths, z, y)
+    chained = sections.copy()
+
+    tap_voltage = np.full(len(lengths), complex(sending_voltage))
+    scale = abs(sending_voltage)
+    converged = False
+    iteration = 0
+    # Overloaded feeders collapse to non-finite voltages, which ends the iteration
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        admittance, chain, far_voltage = _linear_solution(sections, chained, loads, tap_voltage, sending_voltage)
+        while iteration < max_iter:
+            iteration += 1
+            new_voltage = np.append(chain[1:, 0, 0] * far_voltage, far_voltage)
+            change = np.max(np.abs(new_voltage - tap_voltage))
+            tap_voltage = new_voltage
+            if not np.isfinite(change):
+                break
+            if change <= tol * scale:
+                converged = True
+                break
+            admittance, chain, far_voltage = _linear_solution(sections, chained, loads, tap_voltage,
+                                                              sending_voltage)
+
+    if not converged:
+        logger.warning(f"Line cascade of {len(lengths)} sections did not converge after {iteration} iterations"
+                       + ("; the voltages collapsed" if not np.all(np.isfinite(tap_voltage)) else ""))
+
+    voltage = np.append(complex(sending_voltage), tap_voltage)
+    current = np.append(chain[:, 1, 0] * far_voltage, 0j)
+    positions = np.append(0.0, np.cumsum(lengths))
+    load_current = np.append(0j, admittance * tap_voltage)
+    return CascadeResult(positions, voltage, current, load_current, current[0], iteration, converged)
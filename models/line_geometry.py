@@ -0,0 +1,207 @@
+"""Phase-domain series impedance and shunt admittance of overhead lines from tower geometry.
+
+Conductors are given by their horizontal position and height above
+ground (m), GMR and radius (m) and AC resistance (Ω/km). The series
+impedance uses Carson's equations with the earth return corrections P and
+Q from Carson's series (k ≤ 5) and asymptotic expansion (k > 5); the shunt
+admittance comes from Maxwell's potential coefficients of the conductors
+and their images. Conductors are ordered phases first, then earth wires,
+and the earth wires are eliminated by Kron reduction assuming they are
+continuously grounded.
+
+Every function broadcasts over leading axes, so geometry arrays of shape
+(..., conductors) and a frequency array of shape (frequencies,) give
+matrices of shape (..., frequencies, n, n). Comparing tower designs is a
+batch over the leading axis.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+MU0 = 4e-7 * np.pi  # H/m
+EPS0 = 8.854187817e-12  # F/m
+CARSON_TERMS = 40  # Enough for the series to converge at k = 5
+
+LineMatrices = namedtuple(
+    "LineMatrices",
+    ["frequencies", "z_phase", "y_phase", "z_sequence", "y_sequence", "z1", "y1", "z0", "y0"]
+)
+
+# Symmetrical component transformation, phase = A @ sequence with sequence order (0, 1, 2)
+_A = np.exp(2j * np.pi / 3)
+SEQUENCE_MATRIX = np.array([[1, 1, 1], [1, _A ** 2, _A], [1, _A, _A ** 2]])
+SEQUENCE_INVERSE = np.linalg.inv(SEQUENCE_MATRIX)
+
+
+def image_distances(x, y):
+    """Direct distances d, image distances D' and image angles θ between every conductor pair.
+
+    ``x`` and ``y`` (m) have shape (..., n); results have shape (..., n, n).
+    θ is the angle between the image distance and the vertical, so the
+    diagonal has D' = 2h and θ = 0.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx = x[..., :, None] - x[..., None, :]
+    direct = np.hypot(dx, y[..., :, None] - y[..., None, :])
+    image = np.hypot(dx, y[..., :, None] + y[..., None, :])
+    theta = np.arctan2(np.abs(dx), y[..., :, None] + y[..., None, :])
+    return direct, image, theta
+
+
+def _carson_coefficients(terms=CARSON_TERMS):
+    """b_i, c_i and d_i of Carson's series for i = 1 .. terms.
+
+    b1 = √2/6, b2 = 1/16, b_i = ±|b_(i−2)| / (i(i+2)) with the sign + for
+    i = 1..4, − for i = 5..8 and so on; c2 = 1.3659315,
+    c_i = c_(i−2) + 1/i + 1/(i+2); d_i = π/4·b_i.
+    """
+    b = np.zeros(terms + 1)
+    c = np.zeros(terms + 1)
+    b[1], b[2], c[2] = np.sqrt(2.0) / 6, 1.0 / 16, 1.3659315
+    for i in range(3, terms + 1):
+        sign = 1.0 if (i - 1) // 4 % 2 == 0 else -1.0
+        b[i] = sign * abs(b[i - 2]) / (i * (i + 2))
+        c[i] = c[i - 2] + 1.0 / i + 1.0 / (i + 2)
+    return b, c, np.pi / 4 * b
+
+
+def _carson_series(k, theta, terms):
+    """P and Q from Carson's series, for k ≤ 5"""
+    b, c, d = _carson_coefficients(terms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_k = np.log(k)
+        # k^i cos(iθ) and k^i sin(iθ) are the parts of (k e^jθ)^i
+        step = k * np.exp(1j * theta)
+        power = np.ones(k.shape, dtype=complex)
+        p = np.full(k.shape, np.pi / 8)
+        q = -0.0386 + 0.5 * (np.log(2.0) - log_k)
+        k_max = k.max(initial=0.0)
+        for i in range(1, terms + 1):
+            if abs(b[i]) * k_max ** i < 1e-12:
+                break
+            power *= step
+            if i % 2:
+                # Odd terms enter P with − for i ≡ 1 and + for i ≡ 3 (mod 4), and Q with +
+                p += (b[i] if i % 4 == 3 else -b[i]) * power.real
+                q += b[i] * power.real
+                continue
+            log_term = (c[i] - log_k) * power.real + theta * power.imag
+            if i % 4 == 2:
+                p += b[i] * log_term
+                q -= d[i] * power.real
+            else:
+                p -= d[i] * power.real
+                q -= b[i] * log_term
+    return p, q
+
+
+def _carson_asymptotic(k, theta):
+    """P and Q from the asymptotic expansion, for k > 5"""
+    root2 = np.sqrt(2.0)
+    cos1, cos2, cos3, cos5, cos7 = (np.cos(m * theta) for m in (1, 2, 3, 5, 7))
+    p = cos1 / (root2 * k) - cos2 / k ** 2 + cos3 / (root2 * k ** 3) + 3 * cos5 / (root2 * k ** 5) \
+        - 45 * cos7 / (root2 * k ** 7)
+    q = cos1 / (root2 * k) - cos3 / (root2 * k ** 3) + 3 * cos5 / (root2 * k ** 5) \
+        + 45 * cos7 / (root2 * k ** 7)
+    return p, q
+
+
+def carson_terms(k, theta, terms=CARSON_TERMS):
+    """Carson's earth return corrections P and Q for arrays of k and θ.
+
+    Uses Carson's series for k ≤ 5 (its first four terms are the usual
+    truncated form), summed until the terms fall below 1e-12 for the
+    largest k or ``terms`` is reached, and the asymptotic expansion above it.
+    """
+    k, theta = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(theta, dtype=float))
+    p = np.empty(k.shape)
+    q = np.empty(k.shape)
+    small = k <= 5.0
+    p[small], q[small] = _carson_series(k[small], theta[small], terms)
+    large = ~small
+    p[large], q[large] = _carson_asymptotic(k[large], theta[large])
+    return p, q
+
+
+def series_impedance(frequencies, x, y, gmr, resistance, earth_resistivity=100.0):
+    """Phase-domain series impedance (Ω/km) of every conductor, shape (..., frequencies, n, n).
+
+    ``gmr`` (m) and ``resistance`` (Ω/km) are per conductor and broadcast
+    with ``x``; ``earth_resistivity`` (Ω·m) is a scalar or one value per
+    geometry. At zero frequency only the conductor resistances remain.
+    """
+    f = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    direct, image, theta = image_distances(x, y)
+    n = direct.shape[-1]
+    gmr = np.broadcast_to(np.asarray(gmr, dtype=float), direct.shape[:-1])
+    resistance = np.broadcast_to(np.asarray(resistance, dtype=float), direct.shape[:-1])
+    diagonal = np.eye(n, dtype=bool)
+    distance = np.where(diagonal, gmr[..., :, None], direct)
+
+    # Frequencies on their own axis ahead of the conductor axes
+    w = (2 * np.pi * f)[:, None, None]
+    rho = np.asarray(earth_resistivity, dtype=float)[..., None, None, None]
+    image, theta, distance = image[..., None, :, :], theta[..., None, :, :], distance[..., None, :, :]
+    k = image * np.sqrt(w * MU0 / rho)
+    p, q = carson_terms(k, theta)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (w * MU0 / np.pi * p + 1j * w * MU0 / (2 * np.pi) * (np.log(image / distance) + 2 * q))
+    z = np.where(w > 0, z, 0j) * 1e3
+    return z + np.where(diagonal, resistance[..., None, :, None], 0.0)
+
+
+def potential_coefficients(x, y, radius):
+    """Maxwell potential coefficients (m/F) of the conductors over perfect ground, shape (..., n, n)"""
+    direct, image, _ = image_distances(x, y)
+    radius = np.broadcast_to(np.asarray(radius, dtype=float), direct.shape[:-1])
+    distance = np.where(np.eye(direct.shape[-1], dtype=bool), radius[..., :, None], direct)
+    return np.log(image / distance) / (2 * np.pi * EPS0)
+
+
+def kron_reduce(matrix, keep):
+    """Eliminate all but the first ``keep`` conductors of stacked (..., n, n) matrices.
+
+    The eliminated conductors are at zero potential, so the reduced matrix is
+    M_pp − M_pn M_nn⁻¹ M_np.
+    """
+    matrix = np.asarray(matrix)
+    if keep >= matrix.shape[-1]:
+        return matrix
+    m_pp = matrix[..., :keep, :keep]
+    m_pn = matrix[..., :keep, keep:]
+    m_np = matrix[..., keep:, :keep]
+    m_nn = matrix[..., keep:, keep:]
+    return m_pp - m_pn @ np.linalg.solve(m_nn, m_np)
+
+
+def sequence_components(matrix):
+    """Symmetrical component matrix A⁻¹ M A of stacked 3×3 phase matrices, order (0, 1, 2)"""
+    return SEQUENCE_INVERSE @ np.asarray(matrix) @ SEQUENCE_MATRIX
+
+
+def line_matrices(frequencies, x, y, gmr, radius, resistance, earth_resistivity=100.0, phases=3):
+    """Kron-reduced phase and sequence matrices of one or many tower geometries.
+
+    The first ``phases`` conductors are kept and the rest are treated as
+    grounded earth wires. Z is in Ω/km and Y in S/km, with shapes
+    (..., frequencies, phases, phases). Sequence matrices and the zero and
+    positive sequence values (``z0``, ``z1``, ``y0``, ``y1``) are only
+    filled for three phases; the positive sequence values can be passed
+    straight to ``line_abcd``.
+    """
+    f = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    z_phase = kron_reduce(series_impedance(f, x, y, gmr, resistance, earth_resistivity), phases)
+    # Potential coefficients do not depend on frequency; reduce before inverting
+    p_phase = kron_reduce(potential_coefficients(x, y, radius), phases)
+    y_phase = 1j * (2 * np.pi * f)[:, None, None] * np.linalg.inv(p_phase)[..., None, :, :] * 1e3
+
+    if phases != 3:
+        return LineMatrices(f, z_phase, y_phase, None, None, None, None, None, None)
+    z_sequence = sequence_components(z_phase)
+    y_sequence = sequence_components(y_phase)
+    return LineMatrices(f, z_phase, y_phase, z_sequence, y_sequence,
+                        z_sequence[..., 1, 1], y_sequence[..., 1, 1],
+                        z_sequence[..., 0, 0], y_sequence[..., 0, 0])
@@ -0,0 +1,207 @@
+"""Time-current curves of protection devices.
+
+One library of curves shared by the relay and discrimination calculators:
+
+- IEC 60255 / IEEE C37.112 inverse-time curves, t = TDS·(k / (M^α − 1) + c)
+- definite-time stages, t = TDS above pickup
+- tabulated fuse and circuit breaker curves loaded from
+  ``data/protection_curves.json``
+
+Every curve evaluates ``times(currents, pickup, tds)`` over broadcast
+arrays and returns inf where the device does not operate. Tabulated curves
+are in absolute amps and are fixed, so pickup and TDS do not apply to them.
+They are interpolated linearly in log-log space from tables built once at
+load time, with a binary search to find the segment of each current.
+"""
+
+import json
+from functools import lru_cache
+
+import numpy as np
+
+from .config import DATA_DIR
+
+CURVES_FILE = DATA_DIR / 'protection_curves.json'
+
+DEFAULT_CURVE = "IEC Standard Inverse"
+
+
+def idmt_time(multiples, k, alpha, time_dial, c=0.0):
+    """Inverse-time operating time t = TDS·(k / (M^α − 1) + c); inf at or below pickup"""
+    multiples = np.asarray(multiples, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        times = time_dial * (k / (np.power(multiples, alpha) - 1.0) + c)
+    return np.where(multiples > 1.0, times, np.inf)
+
+
+def _multiples(currents, pickup):
+    pickup = np.asarray(pickup, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(pickup > 0, np.asarray(currents, dtype=float) / pickup, 0.0)
+
+
+class IdmtCurve:
+    """Inverse definite minimum time curve"""
+
+    adjustable = True
+
+    def __init__(self, name, k, alpha, c=0.0):
+        self.name = name
+        self.k = float(k)
+        self.alpha = float(alpha)
+        self.c = float(c)
+
+    def times(self, currents, pickup, tds):
+        return idmt_time(_multiples(currents, pickup), self.k, self.alpha, tds, self.c)
+
+    def start_current(self, pickup):
+        """Lowest current worth plotting"""
+        return pickup * 1.1
+
+    def constants(self):
+        return {"a": self.k, "b": self.alpha, "c": self.c, "curve": self.name}
+
+    def __repr__(self):
+        return f"IdmtCurve({self.name!r}, {self.k!r}, {self.alpha!r}, c={self.c!r})"
+
+
+class DefiniteTimeCurve:
+    """Definite-time stage operating ``tds`` seconds above pickup"""
+
+    adjustable = True
+
+    def __init__(self, name):
+        self.name = name
+
+    def times(self, currents, pickup, tds):
+        multiples, tds = np.broadcast_arrays(_multiples(currents, pickup), np.asarray(tds, dtype=float))
+        return np.where(multiples > 1.0, tds, np.inf)
+
+    def start_current(self, pickup):
+        return pickup * 1.1
+
+    def constants(self):
+        return {"a": 0.0, "b": 0.0, "c": 1.0, "curve": self.name}
+
+    def __repr__(self):
+        return f"DefiniteTimeCurve({self.name!r})"
+
+
+class TabulatedCurve:
+    """Time-current curve interpolated in log-log space from (current, time) points.
+
+    Below the first current the device does not operate (inf); above the
+    last one the time is held at the last point.
+    """
+
+    adjustable = False
+
+    def __init__(self, name, points, device="", rating=0.0):
+        points = np.asarray(sorted(points), dtype=float)
+        if len(points) < 2 or np.any(points <= 0):
+            raise ValueError(f"Curve {name} needs at least two positive (current, time) points")
+        self.name = name
+        self.device = device
+        self.rating = float(rating)
+        self.currents = points[:, 0]
+        self.log_currents = np.log(self.currents)
+        self.log_times = np.log(points[:, 1])
+        # Slope of each segment, so evaluation is one lookup and one multiply-add
+        self.slopes = np.diff(self.log_times) / np.diff(self.log_currents)
+        for array in (self.currents, self.log_currents, self.log_times, self.slopes):
+            array.setflags(write=False)
+
+    def interpolate(self, currents):
+        """Operating times at absolute ``currents``"""
+        currents = np.asarray(currents, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.log(np.maximum(currents, 1e-300))
+        x = np.minimum(x, self.log_currents[-1])
+        segment = np.clip(np.searchsorted(self.log_currents, x, side='right') - 1, 0, len(self.slopes) - 1)
+        times = np.exp(self.log_times[segment] + self.slopes[segment] * (x - self.log_currents[segment]))
+        return np.where(currents >= self.currents[0], times, np.inf)
+
+    def times(self, currents, pickup=None, tds=None):
+        currents = np.broadcast_arrays(np.asarray(currents, dtype=float),
+                                       *(np.asarray(v) for v in (pickup, tds) if v is not None))[0]
+        return self.interpolate(currents)
+
+    def start_current(self, pickup=None):
+        return self.currents[0]
+
+    def constants(self):
+        return {"a": 0.0, "b": 0.0, "c": 0.0, "curve": self.name}
+
+    def __repr__(self):
+        return f"TabulatedCurve({self.name!r}, device={self.device!r}, rating={self.rating!r})"
+
+
+STANDARD_CURVES = [
+    IdmtCurve("IEC Standard Inverse", 0.14, 0.02),
+    IdmtCurve("IEC Very Inverse", 13.5, 1.0),
+    IdmtCurve("IEC Extremely Inverse", 80.0, 2.0),
+    IdmtCurve("IEC Long Time Inverse", 120.0, 1.0),
+    IdmtCurve("IEEE Moderately Inverse", 0.0515, 0.02, 0.114),
+    IdmtCurve("IEEE Very Inverse", 19.61, 2.0, 0.491),
+    IdmtCurve("IEEE Extremely Inverse", 28.2, 2.0, 0.1217),
+    DefiniteTimeCurve("Definite Time"),
+]
+
+
+@lru_cache(maxsize=4)
+def load_curves(path=CURVES_FILE):
+    """Standard curves followed by the tabulated curves in ``path``, by name"""
+    curves = {c.name: c for c in STANDARD_CURVES}
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        for name, entry in data.get("curves", {}).items():
+            curves[name] = TabulatedCurve(name, entry["points"], entry.get("device", ""), entry.get("rating", 0.0))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error loading protection curves: {e}")
+    return curves
+
+
+def curve_names():
+    return list(load_curves())
+
+
+def curve(name):
+    """Curve by name, falling back to IEC Standard Inverse"""
+    curves = load_curves()
+    return curves.get(name, curves[DEFAULT_CURVE])
+
+
+def curve_constants(name):
+    """Curve constants for QML: a (k), b (α), c and the curve name"""
+    return curve(name).constants()
+
+
+def operating_times(curves, pickup, tds, currents):
+    """(devices, currents) operating times of many devices at once.
+
+    ``curves`` holds one curve object per device; ``pickup`` and ``tds`` are
+    scalars or one value per device. All inverse-time devices are evaluated
+    in one broadcast call whatever their curve; other curves are evaluated
+    once per distinct curve.
+    """
+    count = len(curves)
+    pickup = np.broadcast_to(np.asarray(pickup, dtype=float), (count,))
+    tds = np.broadcast_to(np.asarray(tds, dtype=float), (count,))
+    currents = np.atleast_1d(np.asarray(currents, dtype=float))
+    result = np.empty((count, len(currents)))
+
+    idmt = [i for i, c in enumerate(curves) if isinstance(c, IdmtCurve)]
+    if idmt:
+        constants = np.array([(curves[i].k, curves[i].alpha, curves[i].c) for i in idmt])
+        result[idmt] = idmt_time(_multiples(currents[None, :], pickup[idmt, None]),
+                                 constants[:, 0, None], constants[:, 1, None], tds[idmt, None],
+                                 constants[:, 2, None])
+
+    groups = {}
+    for i, c in enumerate(curves):
+        if not isinstance(c, IdmtCurve):
+            groups.setdefault(id(c), (c, []))[1].append(i)
+    for c, rows in groups.values():
+        result[rows] = c.times(currents[None, :], pickup[rows, None], tds[rows, None])
+    return result
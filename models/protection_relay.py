@@ -1,7 +1,35 @@
 from PySide6.QtCore import QObject, Property, Signal, Slot
-import math
+from PySide6.QtCharts import QXYSeries
+from functools import lru_cache
 import numpy as np
 
+from .protection_curves import DEFAULT_CURVE, curve, curve_names
+
+CURVE_POINTS = 200
+CURVE_MAX_CURRENT = 10000.0
+
+@lru_cache(maxsize=256)
+def curve_arrays(curve_type, time_dial, pickup_current, points=CURVE_POINTS, max_current=CURVE_MAX_CURRENT):
+    """Log-spaced (currents, times) of a trip curve from just above pickup to ``max_current``.
+
+    Tabulated fuse and breaker curves start at their lowest tabulated
+    current and ignore the pickup and TDS settings.
+
+    Memoized per (curve, TDS, pickup) so redrawing overlaid curves while one
+    setting is dragged only computes the curve that changed. The arrays are
+    read-only because they are shared between callers.
+    """
+    device = curve(curve_type)
+    start = device.start_current(pickup_current)
+    if start >= max_current:
+        currents = np.empty(0)
+    else:
+        currents = np.geomspace(start, max_current, points)
+    times = device.times(currents, pickup_current, time_dial)
+    currents.setflags(write=False)
+    times.setflags(write=False)
+    return currents, times
+
 class ProtectionRelayCalculator(QObject):
     """Calculator for protection relay coordination"""
 
@@ -16,20 +44,13 @@ class ProtectionRelayCalculator(QObject):
         super().__init__(parent)
         self._pickup_current = 100.0  # Primary amps
         self._time_dial = 0.5
-        self._curve_type = "IEC Standard Inverse"
+        self._curve_type = DEFAULT_CURVE
         self._fault_current = 1000.0  # Maximum fault current
         self._operating_time = 0.0
         
-        # IEC Curve constants
-        self._curve_constants = {
-            "IEC Standard Inverse": {"a": 0.14, "b": 0.02},
-            "IEC Very Inverse": {"a": 13.5, "b": 1.0},
-            "IEC Extremely Inverse": {"a": 80.0, "b": 2.0},
-            "IEC Long Time Inverse": {"a": 120, "b": 1.0}
-        }
-        
-        self._curve_points = []
-        self._curve_type_names = list(self._curve_constants.keys())
+        self._curve_currents = np.empty(0)
+        self._curve_times = np.empty(0)
+        self._curve_type_names = curve_names()
         
         self._calculate()
 
@@ -37,27 +58,13 @@ class ProtectionRelayCalculator(QObject):
         if self._pickup_current <= 0:
             return
             
-        # Get curve constants
-        constants = self._curve_constants.get(self._curve_type, 
-                                           self._curve_constants["IEC Standard Inverse"])
-        
         # Calculate operating time for fault current
-        M = self._fault_current / self._pickup_current
-        if M > 1:
-            self._operating_time = (constants["a"] * self._time_dial) / ((M ** constants["b"]) - 1)
-        else:
-            self._operating_time = float('inf')
-            
+        device = curve(self._curve_type)
+        self._operating_time = float(device.times(self._fault_current, self._pickup_current, self._time_dial))
+
         # Generate curve points with more resolution
-        self._curve_points = []
-        current = self._pickup_current * 1.1  # Start just above pickup
-        
-        while current <= 10000:
-            m = current / self._pickup_current
-            if m > 1:
-                t = (constants["a"] * self._time_dial) / ((m ** constants["b"]) - 1)
-                self._curve_points.append({"current": current, "time": t})
-            current *= 1.1  # Logarithmic steps
+        self._curve_currents, self._curve_times = curve_arrays(
+            self._curve_type, self._time_dial, self._pickup_current)
         
         self.calculationsComplete.emit()
 
@@ -90,7 +97,7 @@ class ProtectionRelayCalculator(QObject):
     
     @curveType.setter
     def curveType(self, curve):
-        if curve in self._curve_constants:
+        if curve in self._curve_type_names:
             self._curve_type = curve
             self.curveTypeChanged.emit()
             self._calculate()
@@ -110,9 +117,18 @@ class ProtectionRelayCalculator(QObject):
     def operatingTime(self):
         return self._operating_time
 
-    @Property(list, notify=curveTypesChanged)  # Update property to use notification signal
+    @Property(list, notify=calculationsComplete)
     def curvePoints(self):
-        return self._curve_points
+        return [{"current": float(c), "time": float(t)}
+                for c, t in zip(self._curve_currents, self._curve_times)]
+
+    @Property(list, notify=calculationsComplete)
+    def curveCurrents(self):
+        return self._curve_currents.tolist()
+
+    @Property(list, notify=calculationsComplete)
+    def curveTimes(self):
+        return self._curve_times.tolist()
 
     @Property(list, notify=curveTypesChanged)  # Update property to use notification signal
     def curveTypes(self):
@@ -134,3 +150,14 @@ class ProtectionRelayCalculator(QObject):
     @Slot(float)
     def setFaultCurrent(self, current):
         self.faultCurrent = current
+
+    @Slot(QXYSeries)
+    def fill_curve(self, series):
+        """Replace the series points with the current trip curve in one call"""
+        series.replaceNp(self._curve_currents, self._curve_times)
+
+    @Slot(QXYSeries, str, float, float)
+    def fill_overlay(self, series, curve_type, time_dial, pickup_current):
+        """Fill a series with another trip curve, e.g. an overlaid upstream or downstream relay"""
+        if time_dial > 0 and pickup_current > 0:
+            series.replaceNp(*curve_arrays(curve_type, time_dial, pickup_current))
@@ -1,8 +1,16 @@
-from PySide6.QtCore import QObject, Signal, Property, Slot, QDateTime
+from PySide6.QtCore import QObject, Signal, Property, Slot, QDateTime, QUrl
 import numpy as np
 import json
+import math
 import os
 
+from PySide6.QtCharts import QXYSeries
+
+from .stream_recorder import StreamRecorder, StreamPlayer
+from .data_sources import RingBuffer, create_source
+from .channel_statistics import RunningStatistics
+from .trigger_capture import TriggerCapture
+
 class WaveType:
     SINE = 0
     SQUARE = 1
@@ -23,6 +31,18 @@ class RealTimeChart(QObject):
     amplitudesChanged = Signal('QVariantList')
     offsetsChanged = Signal('QVariantList')
     phasesChanged = Signal('QVariantList')
+    # Recording and replay signals
+    recordingChanged = Signal(bool)
+    replayingChanged = Signal(bool)
+    playbackSpeedChanged = Signal(float)
+    playbackPositionChanged = Signal(float)
+    # External data source signals
+    sourceChanged = Signal()
+    bufferUpdated = Signal()
+    statisticsChanged = Signal()
+    # Trigger capture signals
+    triggerSettingsChanged = Signal()
+    triggerCaptured = Signal()
 
     # Add root path as class variable
     ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -40,6 +60,27 @@ class RealTimeChart(QObject):
         self._amplitudes = [50.0, 50.0, 50.0]  # Individual amplitudes
         self._offsets = [150.0, 150.0, 150.0]  # Individual vertical offsets
         self._phases = [0.0, 0.0, 0.0]  # Phase shifts
+        self._window = 30.0  # Seconds shown before the chart is cleared
+        self._recorder = None  # Active StreamRecorder while recording
+        self._record_start = 0.0
+        self._player = None  # Active StreamPlayer while replaying
+        self._playback_speed = 1.0
+        self._playback_position = 0.0  # Seconds into the recording
+        self._playback_index = 0  # Next recording row to emit
+        self._playback_window_start = 0.0
+        self._last_tick = None  # Wall time of the previous replay update
+        self._buffer = RingBuffer()  # Samples from an external data source
+        self._buffer_cursor = 0
+        self._source = None
+        self._source_kind = ""
+        self._display_points = 2000  # Max points pushed to each series per refresh
+        self._display_origin = 0.0  # Source time shown at x = 0
+        self._stats = RunningStatistics()
+        self._statistics = self._stats.snapshot()
+        self._stats_interval = 0.25  # Seconds between published statistics updates
+        self._stats_published = 0.0
+        self._trigger = TriggerCapture()
+        self._trigger_enabled = False
 
     @Property(bool, notify=runningChanged)
     def isRunning(self):
@@ -61,9 +102,180 @@ class RealTimeChart(QObject):
     def phases(self):
         return self._phases
 
+    @Property(bool, notify=recordingChanged)
+    def isRecording(self):
+        return self._recorder is not None
+
+    @Property(bool, notify=replayingChanged)
+    def isReplaying(self):
+        return self._player is not None
+
+    @Property(float, notify=replayingChanged)
+    def playbackDuration(self):
+        return self._player.duration if self._player else 0.0
+
+    @Property(float, notify=playbackPositionChanged)
+    def playbackPosition(self):
+        return self._playback_position
+
+    @Property(float, notify=playbackSpeedChanged)
+    def playbackSpeed(self):
+        return self._playback_speed
+
+    @Property(bool, notify=sourceChanged)
+    def sourceConnected(self):
+        return self._source is not None
+
+    @Property(str, notify=sourceChanged)
+    def sourceKind(self):
+        return self._source_kind
+
+    @Property('QVariantList', notify=statisticsChanged)
+    def statistics(self):
+        """Windowed rms, mean, min, max, frequency and peak values for each channel"""
+        return self._statistics
+
+    @Property(int, notify=statisticsChanged)
+    def statisticsWindow(self):
+        return self._stats.window
+
+    @Slot(int)
+    def setStatisticsWindow(self, samples):
+        if samples > 1 and samples != self._stats.window:
+            self._stats = RunningStatistics(samples)
+            self._publish_statistics(force=True)
+
+    def _reset_statistics(self):
+        self._stats.reset()
+        self._publish_statistics(force=True)
+
+    def _publish_statistics(self, current_time=None, force=False):
+        """Refresh the statistics property at most once per statistics interval"""
+        if current_time is None:
+            current_time = QDateTime.currentDateTime().toMSecsSinceEpoch() / 1000.0
+        if not force and current_time - self._stats_published < self._stats_interval:
+            return
+        self._stats_published = current_time
+        self._statistics = self._stats.snapshot()
+        self.statisticsChanged.emit()
+
+    def _process_block(self, block, current_time):
+        """Feed a block of (time, A, B, C) rows to the channel statistics and trigger"""
+        self._stats.push(block)
+        self._publish_statistics(current_time)
+        if self._trigger_enabled and self._trigger.push(block):
+            self.triggerCaptured.emit()
+            if not self._trigger.armed:
+                self.triggerSettingsChanged.emit()  # Single shot capture disarmed the trigger
+
+    @Property(bool, notify=triggerSettingsChanged)
+    def triggerEnabled(self):
+        return self._trigger_enabled
+
+    @Property(int, notify=triggerSettingsChanged)
+    def triggerChannel(self):
+        return self._trigger.channel
+
+    @Property(float, notify=triggerSettingsChanged)
+    def triggerLevel(self):
+        return self._trigger.level
+
+    @Property(str, notify=triggerSettingsChanged)
+    def triggerEdge(self):
+        return self._trigger.edge
+
+    @Property(bool, notify=triggerSettingsChanged)
+    def triggerSingle(self):
+        return self._trigger.single
+
+    @Property(bool, notify=triggerSettingsChanged)
+    def triggerArmed(self):
+        return self._trigger.armed
+
+    @Property(int, notify=triggerSettingsChanged)
+    def triggerPreSamples(self):
+        return self._trigger.pre_samples
+
+    @Property(int, notify=triggerSettingsChanged)
+    def triggerPostSamples(self):
+        return self._trigger.post_samples
+
+    @Property(float, notify=triggerCaptured)
+    def captureTime(self):
+        return self._trigger.trigger_time
+
+    @Property(float, notify=triggerCaptured)
+    def captureStart(self):
+        capture = self._trigger.capture
+        return float(capture[0, 0]) if len(capture) else 0.0
+
+    @Property(float, notify=triggerCaptured)
+    def captureEnd(self):
+        capture = self._trigger.capture
+        return float(capture[-1, 0]) if len(capture) else 0.0
+
+    @Slot(bool)
+    def setTriggerEnabled(self, enabled):
+        if enabled != self._trigger_enabled:
+            self._trigger_enabled = enabled
+            self._trigger.reset()
+            self.triggerSettingsChanged.emit()
+            if not enabled:
+                self.resetChart.emit()
+
+    @Slot(int)
+    def setTriggerChannel(self, channel):
+        if 0 <= channel < 3 and channel != self._trigger.channel:
+            self._trigger.channel = channel
+            self._trigger.reset()
+            self.triggerSettingsChanged.emit()
+
+    @Slot(float)
+    def setTriggerLevel(self, level):
+        if level != self._trigger.level:
+            self._trigger.level = level
+            self.triggerSettingsChanged.emit()
+
+    @Slot(str)
+    def setTriggerEdge(self, edge):
+        edge = edge.lower()
+        if edge in ("rising", "falling") and edge != self._trigger.edge:
+            self._trigger.edge = edge
+            self.triggerSettingsChanged.emit()
+
+    @Slot(bool)
+    def setTriggerSingle(self, single):
+        if single != self._trigger.single:
+            self._trigger.single = single
+            self.triggerSettingsChanged.emit()
+
+    @Slot(int, int)
+    def setTriggerWindow(self, pre_samples, post_samples):
+        """Set the number of samples captured before and after the trigger"""
+        if pre_samples >= 0 and post_samples > 0:
+            self._trigger.resize(pre_samples, post_samples)
+            self.triggerSettingsChanged.emit()
+
+    @Slot()
+    def armTrigger(self):
+        self._trigger.arm()
+        self.triggerSettingsChanged.emit()
+
+    @Slot(QXYSeries, QXYSeries, QXYSeries)
+    def fill_capture(self, seriesA, seriesB, seriesC):
+        """Replace the series with the last frozen trigger capture"""
+        capture = self._trigger.capture
+        if not len(capture):
+            return
+        columns = np.ascontiguousarray(capture.T)
+        seriesA.replaceNp(columns[0], columns[1])
+        seriesB.replaceNp(columns[0], columns[2])
+        seriesC.replaceNp(columns[0], columns[3])
+
     @Slot()
     def toggleRunning(self):
         self._is_running = not self._is_running
+        self._last_tick = None
         current_time = QDateTime.currentDateTime().toMSecsSinceEpoch() / 1000.0
         
         if not self._is_running:
@@ -82,7 +294,11 @@ class RealTimeChart(QObject):
         self._pause_time = 0
         self._elapsed_time = 0
         self._is_running = True
-        self.resetChart.emit()
+        self._reset_statistics()
+        if self._player:
+            self.seekPlayback(0.0)
+        else:
+            self.resetChart.emit()
         self.runningChanged.emit(self._is_running)
         
     @Slot(bool)
@@ -92,12 +308,16 @@ class RealTimeChart(QObject):
         if active:
             # Reset the start time and chart when becoming active
             self._start_time = QDateTime.currentDateTime().toMSecsSinceEpoch() / 1000.0
+            self._elapsed_time = 0
             self._is_running = True
+            self._reset_statistics()
             self.resetChart.emit()
             self.runningChanged.emit(self._is_running)
         else:
             # Stop running when page is inactive
             self._is_running = False
+            self.stopRecording()
+            self.disconnectSource()
             self.runningChanged.emit(self._is_running)
 
     def _generate_wave(self, t, wave_type, index):
@@ -181,16 +401,200 @@ class RealTimeChart(QObject):
         except:
             print("No saved configuration found")
 
+    @staticmethod
+    def _local_path(filepath):
+        if isinstance(filepath, QUrl):
+            return filepath.toLocalFile()
+        if filepath.startswith('file:'):
+            return QUrl(filepath).toLocalFile()
+        return filepath
+
+    @Slot(str, str)
+    def connectSource(self, kind, address):
+        """Stream samples from a 'file', 'csv', 'udp', 'tcp' or 'stdin' source instead of generating them"""
+        self.disconnectSource()
+        self.closeRecording()
+        if kind.lower() in ('file', 'csv'):
+            address = self._local_path(address)
+        try:
+            source = create_source(kind, address, self._buffer)
+            self._buffer.clear()
+            self._buffer_cursor = 0
+            source.start()
+        except Exception as e:
+            print(f"Error connecting data source: {e}")
+            return
+        self._source = source
+        self._source_kind = kind.lower()
+        self._reset_statistics()
+        self.sourceChanged.emit()
+        self.resetChart.emit()
+
+    @Slot()
+    def disconnectSource(self):
+        if self._source is None:
+            return
+        self._source.stop()
+        self._source = None
+        self._source_kind = ""
+        self._start_time = QDateTime.currentDateTime().toMSecsSinceEpoch() / 1000.0
+        self._reset_statistics()
+        self.sourceChanged.emit()
+        self.resetChart.emit()
+
+    def _update_source(self, current_time):
+        """Collect the samples the source thread has buffered since the last refresh"""
+        block, self._buffer_cursor = self._buffer.read_since(self._buffer_cursor)
+        if not len(block):
+            return True
+        if self._recorder:
+            self._recorder.append_block(block)
+        self._process_block(block, current_time)
+        self.bufferUpdated.emit()
+        return True
+
+    @Slot(QXYSeries, QXYSeries, QXYSeries)
+    def fill_series(self, seriesA, seriesB, seriesC):
+        """Replace the series with the latest window of buffered samples"""
+        rows = self._buffer.latest(self._buffer.capacity)
+        if not len(rows):
+            return
+        t = rows[:, 0]
+        origin = max(t[0], t[-1] - self._window)
+        rows = rows[np.searchsorted(t, origin):]
+        if len(rows) > self._display_points:
+            step = -(-len(rows) // self._display_points)
+            rows = rows[::step]
+
+        self._display_origin = origin
+        # replaceNp needs contiguous arrays, so transpose to one row per channel
+        columns = np.ascontiguousarray(rows.T)
+        x = columns[0] - origin
+        seriesA.replaceNp(x, columns[1])
+        seriesB.replaceNp(x, columns[2])
+        seriesC.replaceNp(x, columns[3])
+
+    @Slot(str)
+    def startRecording(self, filepath):
+        """Start recording the live channels to a binary recording file"""
+        if self._player:
+            return
+        self.stopRecording()
+        try:
+            self._recorder = StreamRecorder(self._local_path(filepath))
+            self._record_start = QDateTime.currentDateTime().toMSecsSinceEpoch() / 1000.0
+            self.recordingChanged.emit(True)
+        except Exception as e:
+            self._recorder = None
+            print(f"Error starting recording: {e}")
+
+    @Slot()
+    def stopRecording(self):
+        if self._recorder is None:
+            return
+        try:
+            self._recorder.close()
+        except Exception as e:
+            print(f"Error closing recording: {e}")
+        self._recorder = None
+        self.recordingChanged.emit(False)
+
+    @Slot(str)
+    def openRecording(self, filepath):
+        """Replay a recording in place of the generated waves"""
+        self.stopRecording()
+        self.disconnectSource()
+        try:
+            player = StreamPlayer(self._local_path(filepath))
+        except Exception as e:
+            print(f"Error opening recording: {e}")
+            return
+        if self._player:
+            self._player.close()
+        self._player = player
+        self.replayingChanged.emit(True)
+        self.seekPlayback(0.0)
+
+    @Slot()
+    def closeRecording(self):
+        if self._player is None:
+            return
+        self._player.close()
+        self._player = None
+        self._playback_position = 0.0
+        self._start_time = QDateTime.currentDateTime().toMSecsSinceEpoch() / 1000.0
+        self._reset_statistics()
+        self.replayingChanged.emit(False)
+        self.playbackPositionChanged.emit(0.0)
+        self.resetChart.emit()
+
+    @Slot(float)
+    def setPlaybackSpeed(self, speed):
+        if speed > 0 and speed != self._playback_speed:
+            self._playback_speed = speed
+            self.playbackSpeedChanged.emit(speed)
+
+    @Slot(float)
+    def seekPlayback(self, position):
+        """Jump to ``position`` seconds into the recording"""
+        if self._player is None:
+            return
+        position = min(max(0.0, position), self._player.duration)
+        self._playback_position = position
+        self._playback_index = self._player.index_at(position)
+        self._playback_window_start = math.floor(position / self._window) * self._window
+        self._last_tick = None
+        self._reset_statistics()
+        self.resetChart.emit()
+        self.playbackPositionChanged.emit(position)
+
+    def _update_playback(self, current_time):
+        """Emit the recorded samples that fall within the elapsed replay time"""
+        player = self._player
+        if self._last_tick is not None:
+            self._playback_position += (current_time - self._last_tick) * self._playback_speed
+        self._last_tick = current_time
+
+        position = min(self._playback_position, player.duration)
+        end = player.index_after(position)
+        if end <= self._playback_index and position < player.duration:
+            return True
+
+        start_time = player.start_time
+        rows = player.rows(self._playback_index, end)
+        if len(rows):
+            self._process_block(rows, current_time)
+        for t, a, b, c in rows.tolist():
+            t -= start_time
+            if t - self._playback_window_start >= self._window:
+                self._playback_window_start = math.floor(t / self._window) * self._window
+                self.resetChart.emit()
+            self.dataUpdated.emit(t - self._playback_window_start, a, b, c)
+        self._playback_index = end
+        self.playbackPositionChanged.emit(position)
+
+        if position >= player.duration:
+            # Hold on the last frame at the end of the recording
+            self._is_running = False
+            self.runningChanged.emit(False)
+        return True
+
     @Slot()
     def update(self):
         if not self._is_running or not self._is_active:
             return False
         try:
             current_time = QDateTime.currentDateTime().toMSecsSinceEpoch() / 1000.0
+            if self._player:
+                return self._update_playback(current_time)
+            if self._source:
+                return self._update_source(current_time)
+
             relative_time = current_time - self._start_time  # Time from start
             
             # Reset start time and emit reset signal at 30 seconds
-            if relative_time > 30:
+            if relative_time > self._window:
+                self._elapsed_time += relative_time
                 self._start_time = current_time
                 relative_time = 0
                 self.resetChart.emit()  # Signal to clear the chart
@@ -199,6 +603,11 @@ class RealTimeChart(QObject):
             value_a = self._generate_wave(relative_time, self._wave_types[0], 0)
             value_b = self._generate_wave(relative_time, self._wave_types[1], 1)
             value_c = self._generate_wave(relative_time, self._wave_types[2], 2)
+
+            if self._recorder:
+                self._recorder.append(current_time - self._record_start, value_a, value_b, value_c)
+            self._process_block(((self._elapsed_time + relative_time, value_a, value_b, value_c),),
+                                current_time)
             
             self.dataUpdated.emit(relative_time, value_a, value_b, value_c)
             return True
@@ -210,6 +619,31 @@ class RealTimeChart(QObject):
     def getValuesAtTime(self, x_value):
         """Get interpolated values at given time point"""
         try:
+            if self._player:
+                # Read the recorded sample nearest the tracker position
+                if not self._player.count:
+                    return []
+                index = min(self._player.index_at(self._playback_window_start + x_value),
+                            self._player.count - 1)
+                _, value_a, value_b, value_c = self._player.rows(index, index + 1)[0].tolist()
+                return [
+                    {"value": float(value_a), "color": "#ff0000"},
+                    {"value": float(value_b), "color": "#00cc00"},
+                    {"value": float(value_c), "color": "#0000ff"}
+                ]
+
+            if self._source:
+                rows = self._buffer.latest(self._buffer.capacity)
+                if not len(rows):
+                    return []
+                index = min(np.searchsorted(rows[:, 0], self._display_origin + x_value), len(rows) - 1)
+                _, value_a, value_b, value_c = rows[index].tolist()
+                return [
+                    {"value": float(value_a), "color": "#ff0000"},
+                    {"value": float(value_b), "color": "#00cc00"},
+                    {"value": float(value_c), "color": "#0000ff"}
+                ]
+
             # Generate values at specific time point
             value_a = self._generate_wave(x_value, self._wave_types[0], 0)
             value_b = self._generate_wave(x_value, self._wave_types[1], 1)
@@ -1,14 +1,94 @@
 from PySide6.QtCore import *
 from PySide6.QtCharts import *
 
+from collections import namedtuple
+from functools import lru_cache
+
 import numpy as np
 
+from .impedance_network import build_network, transfer, resonances
+from .rlc_transient import step_response, impulse_response, switched_response, ac_response, decimate
+
+RLCResponse = namedtuple(
+    "RLCResponse",
+    ["resonant_freq", "q_factor", "bandwidth", "lower_cutoff", "upper_cutoff", "frequencies", "gains"]
+)
+
+MAX_TRANSIENT_STEPS = 1_000_000  # Six float64 arrays of this length stay under 50 MB
+
+def _series_rlc_gain(frequencies, resistance, inductance, capacitance):
+    """Gain 1/|Z| with |Z| = sqrt(R² + (ωL - 1/ωC)²)"""
+    omega = 2 * np.pi * frequencies
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reactance = omega * inductance - 1 / (omega * capacitance)
+        return 1 / np.hypot(resistance, reactance)
+
+def _adaptive_sweep(gain_fn, frequencies, max_points=600, tolerance=1e-3):
+    """Refine a frequency grid where the gain curve bends most.
+
+    Each pass evaluates the gain at every interval midpoint and inserts the
+    midpoints whose value deviates from the straight line between the
+    interval ends by more than ``tolerance`` of the peak gain, worst first,
+    until nothing needs refining or ``max_points`` is reached.
+    """
+    gains = gain_fn(frequencies)
+    scale = np.nanmax(gains)
+    while len(frequencies) < max_points:
+        mid = 0.5 * (frequencies[:-1] + frequencies[1:])
+        mid_gains = gain_fn(mid)
+        error = np.abs(mid_gains - 0.5 * (gains[:-1] + gains[1:])) / scale
+        refine = np.flatnonzero(error > tolerance)
+        if not refine.size:
+            break
+        room = max_points - len(frequencies)
+        if refine.size > room:
+            refine = np.sort(refine[np.argsort(error[refine])[-room:]])
+        frequencies = np.insert(frequencies, refine + 1, mid[refine])
+        gains = np.insert(gains, refine + 1, mid_gains[refine])
+    return frequencies, gains
+
+@lru_cache(maxsize=32)
+def _series_rlc_response(resistance, inductance, capacitance, max_points=600):
+    """Return the RLCResponse of a series RLC circuit.
+
+    Q, bandwidth and the -3 dB points are computed analytically and seed an
+    adaptive sweep, so high-Q peaks are resolved and flat low-Q curves do not
+    waste points. Results are memoized per (R, L, C) so dragging a slider
+    back over recent values does not recompute the sweep. The arrays are
+    read-only because they are shared between callers.
+    """
+    resonant_freq = 1.0 / (2.0 * np.pi * np.sqrt(inductance * capacitance))
+    q_factor = np.sqrt(inductance / capacitance) / resistance
+    bandwidth = resistance / (2.0 * np.pi * inductance)
+    half = 1.0 / (2.0 * q_factor)
+    lower_cutoff = resonant_freq * (np.sqrt(1.0 + half * half) - half)
+    upper_cutoff = resonant_freq * (np.sqrt(1.0 + half * half) + half)
+
+    f_start = 1.0
+    f_end = resonant_freq * 3
+    key_points = [resonant_freq, lower_cutoff, upper_cutoff]
+    seed = np.unique(np.concatenate([
+        np.linspace(f_start, f_end, 64),
+        [f for f in key_points if f_start < f < f_end]
+    ]))
+
+    frequencies, gains = _adaptive_sweep(
+        lambda f: _series_rlc_gain(f, resistance, inductance, capacitance), seed, max_points)
+
+    valid = np.isfinite(gains)
+    frequencies = frequencies[valid]
+    gains = gains[valid]
+    frequencies.setflags(write=False)
+    gains.setflags(write=False)
+    return RLCResponse(resonant_freq, q_factor, bandwidth, lower_cutoff, upper_cutoff, frequencies, gains)
+
 class SeriesRLCChart(QObject):
     chartDataChanged = Signal()
     resonantFreqChanged = Signal(float)
     axisRangeChanged = Signal()  # Add new signal
-    formattedDataChanged = Signal(list)  # Add new signal
+    formattedDataChanged = Signal(list)  # Emits the two resonant line points
     grabRequested = Signal(str, float)  # Change signal definition to include scale
+    transientChanged = Signal()
 
     def __init__(self):
         super().__init__()
@@ -19,13 +99,19 @@ class SeriesRLCChart(QObject):
         self._inductance = 0.1      # 0.1 H (henries)
         self._capacitance = 101.3e-6  # 101.3 µF - will resonate at 50 Hz
         self._frequency_range = (0, 100)  # Adjust range to better show 50Hz
-        self._chart_data = []
+        self._frequencies = np.empty(0)
+        self._gains = np.empty(0)
         self._resonant_freq = 0.0
+        self._q_factor = 0.0
+        self._bandwidth = 0.0
+        self._lower_cutoff = 0.0
+        self._upper_cutoff = 0.0
         self._axis_x_min = 0
         self._axis_x_max = 100
         self._axis_y_min = 0
         self._axis_y_max = None  # Change to None for initial state check
-        self._formatted_points = []
+        self._resonant_line = []
+        self._transient = None
         self.generateChartData()
 
     @Slot(float)
@@ -69,9 +155,8 @@ class SeriesRLCChart(QObject):
 
     def updateAxisRanges(self):
         """Update axis ranges based on data and resonant frequency"""
-        if self._chart_data:
-            max_y = max(point[1] for point in self._chart_data)
-            self._axis_y_max = max_y * 1.1
+        if self._gains.size:
+            self._axis_y_max = float(self._gains.max()) * 1.1
             self._axis_y_min = 0
             
             # Center around resonant frequency
@@ -82,48 +167,24 @@ class SeriesRLCChart(QObject):
 
     @Slot(QXYSeries)
     def fill_series(self, series):
-        """Fill series with points using QPointF and replace"""
-        points = []
-        for point in self._formatted_points:
-            points.append(QPointF(point['x'], point['y']))
-        series.replace(points)
+        """Replace the series points with the gain curve in one call"""
+        series.replaceNp(self._frequencies, self._gains)
 
     def generateChartData(self):
         if self._resistance > 0 and self._inductance > 0 and self._capacitance > 0:
             try:
-                # Calculate resonant frequency
-                self._resonant_freq = 1.0 / (2.0 * np.pi * np.sqrt(self._inductance * self._capacitance))
+                response = _series_rlc_response(self._resistance, self._inductance, self._capacitance)
+                self._resonant_freq = response.resonant_freq
+                self._q_factor = response.q_factor
+                self._bandwidth = response.bandwidth
+                self._lower_cutoff = response.lower_cutoff
+                self._upper_cutoff = response.upper_cutoff
+                self._frequencies = response.frequencies
+                self._gains = response.gains
                 self.resonantFreqChanged.emit(self._resonant_freq)
 
-                # Create frequency points with extra density around resonance
-                f_start = max(1, 0)
-                f_end = self._resonant_freq * 3
-                
-                # Create three ranges of points: before, around, and after resonance
-                f1 = np.linspace(f_start, self._resonant_freq * 0.9, 200)
-                f2 = np.linspace(self._resonant_freq * 0.9, self._resonant_freq * 1.1, 600)
-                f3 = np.linspace(self._resonant_freq * 1.1, f_end, 200)
-                
-                frequencies = np.concatenate([f1, f2, f3])
-                omega = 2 * np.pi * frequencies
-                
-                # Calculate impedance components and gain
-                z_r = np.full_like(omega, self._resistance)
-                z_l = omega * self._inductance
-                z_c = 1 / (omega * self._capacitance)
-                z_total = np.sqrt(z_r**2 + (z_l - z_c)**2)
-                gain = 1 / z_total
-                
-                # Create data points
-                valid_points = []
-                for f, g in zip(frequencies, gain):
-                    if not (np.isnan(g) or np.isinf(g)):
-                        valid_points.append([float(f), float(g)])
-
-                if valid_points:
-                    self._chart_data = valid_points
-                    self._formatted_points = [{"x": p[0], "y": p[1]} for p in valid_points]
-                    max_gain = max(p[1] for p in valid_points)
+                if self._gains.size:
+                    max_gain = float(self._gains.max())
                     
                     # Always update Y axis scale
                     self._axis_y_max = max_gain * 1.1
@@ -135,7 +196,7 @@ class SeriesRLCChart(QObject):
                         {"x": float(self._resonant_freq), "y": float(max_gain * 1.2)}
                     ]
                     
-                    self.formattedDataChanged.emit([self._formatted_points, self._resonant_line])
+                    self.formattedDataChanged.emit(self._resonant_line)
                     self.chartDataChanged.emit()
                     self.axisRangeChanged.emit()  # Ensure axis range is updated
                     
@@ -167,7 +228,7 @@ class SeriesRLCChart(QObject):
         self._axis_x_min = 0
         self._axis_x_max = 100
         self._axis_y_min = 0
-        max_y = max(point[1] for point in self._chart_data) if self._chart_data else 1
+        max_y = float(self._gains.max()) if self._gains.size else 1
         self._axis_y_max = max_y * 1.1
         self.axisRangeChanged.emit()
 
@@ -182,12 +243,92 @@ class SeriesRLCChart(QObject):
 
     @Property(list, notify=chartDataChanged)
     def chartData(self):
-        return self._chart_data
+        return np.column_stack((self._frequencies, self._gains)).tolist()
 
     @Property(float, notify=resonantFreqChanged)
     def resonantFreq(self):
         return self._resonant_freq
 
+    @Property(float, notify=chartDataChanged)
+    def qFactor(self):
+        return self._q_factor
+
+    @Property(float, notify=chartDataChanged)
+    def bandwidth(self):
+        """-3 dB bandwidth in Hz"""
+        return self._bandwidth
+
+    @Property(float, notify=chartDataChanged)
+    def lowerCutoff(self):
+        """Lower -3 dB frequency in Hz"""
+        return self._lower_cutoff
+
+    @Property(float, notify=chartDataChanged)
+    def upperCutoff(self):
+        """Upper -3 dB frequency in Hz"""
+        return self._upper_cutoff
+
+    @Slot('QVariantMap', float, float, int, result='QVariantMap')
+    def networkResponse(self, netlist, f_start, f_end, points=1000):
+        """Impedance and transfer response of a netlist (see impedance_network.build_network)"""
+        try:
+            network = build_network(netlist)
+            frequencies = np.geomspace(max(f_start, 1e-3), f_end, points)
+            impedance = network.impedance(frequencies)
+            gain = transfer(network, frequencies)
+            return {
+                "frequencies": frequencies.tolist(),
+                "impedance": np.abs(impedance).tolist(),
+                "phase": np.degrees(np.angle(impedance)).tolist(),
+                "gain": np.abs(gain).tolist(),
+                "resonances": resonances(frequencies, impedance)[0].tolist()
+            }
+        except Exception as e:
+            print(f"Error evaluating network: {e}")
+            return {}
+
+    @Slot(str, float, int, float)
+    def simulateTransient(self, kind, duration, steps, amplitude=1.0):
+        """Simulate a 'step', 'impulse', 'switched' (on at 0, off at half time) or 'ac' response"""
+        if self._resistance < 0 or self._inductance <= 0 or self._capacitance <= 0 or duration <= 0:
+            return
+        try:
+            steps = min(int(steps), MAX_TRANSIENT_STEPS)
+            args = (self._resistance, self._inductance, self._capacitance, duration, steps)
+            if kind == "impulse":
+                self._transient = impulse_response(*args, strength=amplitude)
+            elif kind == "switched":
+                self._transient = switched_response(*args, [(0.0, amplitude), (duration / 2, 0.0)])
+            elif kind == "ac":
+                self._transient = ac_response(*args, amplitude=amplitude)
+            else:
+                self._transient = step_response(*args, amplitude=amplitude)
+            self.transientChanged.emit()
+        except Exception as e:
+            print(f"Error simulating transient: {e}")
+
+    @Slot(QXYSeries, QXYSeries)
+    def fill_transient_series(self, current_series, voltage_series):
+        """Replace the current and capacitor voltage series with the last transient"""
+        if self._transient is None:
+            return
+        current_series.replaceNp(*decimate(self._transient.time, self._transient.current))
+        voltage_series.replaceNp(*decimate(self._transient.time, self._transient.capacitor_voltage))
+
+    @Property(float, notify=transientChanged)
+    def transientDuration(self):
+        return float(self._transient.time[-1]) if self._transient is not None else 0.0
+
+    @Property(float, notify=transientChanged)
+    def transientPeakCurrent(self):
+        """Largest absolute current in the last transient (A)"""
+        return float(np.abs(self._transient.current).max()) if self._transient is not None else 0.0
+
+    @Property(float, notify=transientChanged)
+    def transientPeakVoltage(self):
+        """Largest absolute capacitor voltage in the last transient (V)"""
+        return float(np.abs(self._transient.capacitor_voltage).max()) if self._transient is not None else 0.0
+
     @Slot(str, float)
     def saveChart(self, filepath, scale=2.0):
         """Save chart as image with optional scale factor"""
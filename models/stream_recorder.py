@@ -0,0 +1,237 @@
+import os
+import struct
+import time
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+# File layout: a fixed 64 byte header followed by a float32 array of rows
+# (time, channel A, channel B, channel C).
+MAGIC = b"RTCREC01"
+VERSION = 1
+COLUMNS = 4
+HEADER = struct.Struct("<8sIIQd")  # magic, version, columns, sample count, start epoch
+HEADER_SIZE = 64
+DTYPE = np.float32
+ROW_BYTES = COLUMNS * np.dtype(DTYPE).itemsize
+COUNT_OFFSET = 16  # Byte offset of the sample count in the header
+
+
+def read_count(f):
+    """Sample count stored in the header of an open recording file; the file position is kept"""
+    position = f.tell()
+    f.seek(COUNT_OFFSET)
+    raw = f.read(8)
+    f.seek(position)
+    return struct.unpack("<Q", raw)[0] if len(raw) == 8 else 0
+
+
+def valid_rows(data, count=0):
+    """Number of real samples in the mapped rows of a recording.
+
+    ``count`` is the header count, which a recorder that was not closed
+    only updates periodically. Past it the file holds zero-filled rows
+    preallocated by the recorder, so the samples end at the first row whose
+    time goes backwards or that is all zero.
+    """
+    total = len(data)
+    count = min(int(count), total)
+    start = max(count - 1, 0)
+    if start >= total:
+        return count
+    tail = np.asarray(data[start:])
+    bad = (np.diff(tail[:, 0]) < 0) | ~tail[1:].any(axis=1)
+    end = start + 1 + int(np.argmax(bad)) if bad.any() else total
+    if count == 0 and end == 1 and not tail[0].any():
+        return 0
+    return end
+
+
+class StreamRecorder:
+    """Append real-time samples to a memory-mapped recording file.
+
+    The file is grown in chunks of ``chunk_rows`` rows so appending a sample
+    only writes into the already mapped array. The header sample count is
+    updated every ``flush_rows`` rows and whenever the file grows, so
+    readers tailing the file (and recordings that were never closed) know
+    where the samples end; it is written and the file trimmed to size when
+    the recorder is closed.
+    """
+
+    def __init__(self, path, chunk_rows=65536, flush_rows=4096):
+        self._path = path
+        self._chunk_rows = max(1, int(chunk_rows))
+        self._flush_rows = max(1, int(flush_rows))
+        self._flushed = 0
+        self._count = 0
+        self._capacity = 0
+        self._data = None
+        self._start_epoch = time.time()
+
+        with open(self._path, "wb") as f:
+            f.write(self._header(0))
+        self._grow()
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def count(self):
+        return self._count
+
+    def _header(self, count):
+        return HEADER.pack(MAGIC, VERSION, COLUMNS, count, self._start_epoch).ljust(HEADER_SIZE, b"\0")
+
+    def _write_count(self, f):
+        f.seek(COUNT_OFFSET)
+        f.write(struct.pack("<Q", self._count))
+        self._flushed = self._count
+
+    def flush(self):
+        """Record the current sample count in the header"""
+        if self._data is None:
+            return
+        with open(self._path, "r+b") as f:
+            self._write_count(f)
+
+    def _grow(self, min_rows=0):
+        """Extend the backing file and remap it with room for more rows"""
+        if self._data is not None:
+            self._data.flush()
+            self._data = None
+
+        self._capacity += max(self._chunk_rows, min_rows)
+        with open(self._path, "r+b") as f:
+            self._write_count(f)
+            f.truncate(HEADER_SIZE + self._capacity * ROW_BYTES)
+
+        self._data = np.memmap(self._path, dtype=DTYPE, mode="r+",
+                               offset=HEADER_SIZE, shape=(self._capacity, COLUMNS))
+
+    def append(self, t, a, b, c):
+        """Write a single sample row"""
+        if self._count >= self._capacity:
+            self._grow()
+        i = self._count
+        data = self._data
+        data[i, 0] = t
+        data[i, 1] = a
+        data[i, 2] = b
+        data[i, 3] = c
+        self._count = i + 1
+        if self._count - self._flushed >= self._flush_rows:
+            self.flush()
+
+    def append_block(self, block):
+        """Write an (n, 4) block of sample rows"""
+        n = len(block)
+        if n == 0:
+            return
+        if self._count + n > self._capacity:
+            self._grow(self._count + n - self._capacity)
+        self._data[self._count:self._count + n] = block
+        self._count += n
+        if self._count - self._flushed >= self._flush_rows:
+            self.flush()
+
+    def close(self):
+        """Flush samples, record the final count and trim unused capacity"""
+        if self._data is None:
+            return
+        self._data.flush()
+        self._data = None
+        with open(self._path, "r+b") as f:
+            f.write(self._header(self._count))
+            f.truncate(HEADER_SIZE + self._count * ROW_BYTES)
+
+
+class _TimeColumn:
+    """Sequence view over the time column so bisect only touches the rows it probes"""
+
+    def __init__(self, data):
+        self._data = data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        return float(self._data[index, 0])
+
+
+class StreamPlayer:
+    """Read-only access to a recording made by StreamRecorder.
+
+    Samples are mapped with ``numpy.memmap`` so only the pages that are
+    actually replayed or searched are read from disk.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER.size:
+            raise ValueError(f"Not a recording file: {path}")
+
+        magic, version, columns, count, start_epoch = HEADER.unpack_from(header)
+        if magic != MAGIC or columns != COLUMNS:
+            raise ValueError(f"Not a recording file: {path}")
+        if version > VERSION:
+            raise ValueError(f"Unsupported recording version {version}")
+
+        # A recording that was not closed cleanly is longer than its header
+        # count: the count lags the last periodic flush and the file ends in
+        # preallocated zero rows, so look for where the samples really end
+        rows = (os.path.getsize(path) - HEADER_SIZE) // ROW_BYTES
+        if rows > count:
+            mapped = np.memmap(path, dtype=DTYPE, mode="r", offset=HEADER_SIZE, shape=(rows, COLUMNS))
+            count = valid_rows(mapped, count)
+            del mapped
+
+        self._start_epoch = start_epoch
+        self._count = int(min(count, rows))
+        if self._count:
+            self._data = np.memmap(path, dtype=DTYPE, mode="r",
+                                   offset=HEADER_SIZE, shape=(self._count, COLUMNS))
+        else:
+            self._data = np.empty((0, COLUMNS), dtype=DTYPE)
+        self._times = _TimeColumn(self._data)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def start_epoch(self):
+        return self._start_epoch
+
+    @property
+    def start_time(self):
+        return float(self._data[0, 0]) if self._count else 0.0
+
+    @property
+    def duration(self):
+        if not self._count:
+            return 0.0
+        return float(self._data[-1, 0]) - self.start_time
+
+    def index_at(self, t):
+        """Index of the first sample at or after recording time ``t``"""
+        return bisect_left(self._times, self.start_time + t)
+
+    def index_after(self, t):
+        """Index one past the last sample at or before recording time ``t``"""
+        return bisect_right(self._times, self.start_time + t)
+
+    def rows(self, start, stop):
+        """Return sample rows ``start:stop`` as a view into the mapped file"""
+        return self._data[start:stop]
+
+    def close(self):
+        self._data = np.empty((0, COLUMNS), dtype=DTYPE)
+        self._times = _TimeColumn(self._data)
+        self._count = 0
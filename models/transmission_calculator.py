@@ -1,8 +1,125 @@
 from PySide6.QtCore import QObject, Property, Signal, Slot
+from PySide6.QtCharts import QXYSeries
+from collections import namedtuple
 import numpy as np
 import cmath
 import math
 
+from .impedance_network import resonances
+
+# Temperature coefficient of resistance at 20 °C (1/K)
+TEMPERATURE_COEFFICIENTS = {
+    "Aluminium": 0.00403,
+    "Copper": 0.00393,
+}
+
+SweepResult = namedtuple(
+    "SweepResult",
+    ["frequencies", "zc", "gamma", "a", "b", "c", "d", "z_open", "z_short", "z_load", "skin"]
+)
+
+def skin_effect(frequencies, resistance_per_m, ks=1.0):
+    """IEC 60287-1-1 skin effect factor ys of a conductor with DC resistance ``resistance_per_m`` (Ω/m)"""
+    f = np.asarray(frequencies, dtype=float)
+    xs = np.sqrt(8 * np.pi * f * 1e-7 * ks / resistance_per_m)
+    with np.errstate(over='ignore'):
+        low = xs ** 4 / (192 + 0.8 * xs ** 4)
+    mid = -0.136 - 0.0177 * xs + 0.0563 * xs ** 2
+    high = 0.354 * xs - 0.733
+    return np.where(xs <= 2.8, low, np.where(xs <= 3.8, mid, high))
+
+def line_constants(frequencies, resistance, inductance, capacitance, conductance=0.0, sub_conductors=1,
+                   bundle_spacing=0.4, conductor_gmr=0.0078, earth_resistivity=100.0, rated_frequency=50.0,
+                   temperature=None, alpha=TEMPERATURE_COEFFICIENTS["Aluminium"]):
+    """Series impedance Z (Ω/km) and shunt admittance Y (S/km) over a frequency array.
+
+    ``resistance`` is the per-phase AC resistance at operating temperature
+    and ``rated_frequency``, so it is used unchanged at that frequency;
+    other frequencies scale it by the IEC 60287 skin effect of each
+    sub-conductor relative to the rated frequency. When ``temperature`` is
+    given, ``resistance`` is instead the DC resistance at 20 °C: it is
+    corrected to ``temperature`` with the conductor's ``alpha`` and gets the
+    full skin effect. Inductance is in mH/km and capacitance in µF/km.
+    Returns (Z, Y, ys, Ze) with ys the skin effect factor at each frequency
+    and Ze the earth return term.
+    """
+    f = np.asarray(frequencies, dtype=float)
+    if temperature is None:
+        r_dc = resistance
+        ys_rated = skin_effect(rated_frequency, r_dc * sub_conductors * 1e-3)
+    else:
+        r_dc = resistance * (1 + alpha * (temperature - 20.0))
+        ys_rated = 0.0
+    ys = skin_effect(f, r_dc * sub_conductors * 1e-3)
+    r_ac = r_dc * (1 + ys) / (1 + ys_rated)
+
+    if sub_conductors > 1:
+        bundle_gmr = (conductor_gmr * bundle_spacing ** (sub_conductors - 1)) ** (1 / sub_conductors)
+    else:
+        bundle_gmr = conductor_gmr
+
+    # Earth return impedance, none at DC
+    with np.errstate(divide='ignore', invalid='ignore'):
+        depth = 658.5 * np.sqrt(earth_resistivity / f)
+        ze = np.where(f > 0, np.pi ** 2 * f / 60 + 1j * 0.0386 * f * np.log(depth / bundle_gmr), 0j)
+
+    w = 2 * np.pi * f
+    z = r_ac + 1j * w * inductance * 1e-3 + ze / 3
+    y = conductance + 1j * w * capacitance * 1e-6
+    return z, y, ys, ze
+
+def _sinhc(x):
+    """sinh(x) / x, finite at x = 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.abs(x) < 1e-8, 1 + x * x / 6, np.sinh(x) / x)
+
+def line_abcd(z, y, length):
+    """ABCD parameters, Zc and γ of a line of ``length`` km from per-km Z and Y arrays.
+
+    B and C are written with sinh(γl)/γl so they stay finite at DC.
+    """
+    z = np.asarray(z, dtype=complex)
+    y = np.asarray(y, dtype=complex)
+    gamma = np.sqrt(z * y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zc = np.sqrt(z / y)
+    gamma_l = gamma * length
+    a = np.cosh(gamma_l)
+    sinhc = _sinhc(gamma_l)
+    return a, z * length * sinhc, y * length * sinhc, a, zc, gamma
+
+def frequency_sweep(frequencies, length, load_impedance=None, **line):
+    """Line parameters and input impedances over ``frequencies``.
+
+    ``line`` takes the line_constants arguments. Input impedances are seen
+    from the sending end with the receiving end open, shorted, and
+    terminated in ``load_impedance`` (open when None).
+    """
+    f = np.asarray(frequencies, dtype=float)
+    z, y, ys, _ = line_constants(f, **line)
+    a, b, c, d, zc, gamma = line_abcd(z, y, length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_open = a / c
+        z_short = b / d
+        z_load = z_open if load_impedance is None else (a * load_impedance + b) / (c * load_impedance + d)
+    return SweepResult(f, zc, gamma, a, b, c, d, z_open, z_short, z_load, ys)
+
+def line_profile(zc, gamma, length, v_receiving, i_receiving, points=1001):
+    """Phasor voltage and current along a line from its receiving-end conditions.
+
+    Returns (positions, V, I) as arrays of ``points`` samples from the
+    sending end (0) to the receiving end (``length``), with
+    V(d) = VR cosh(γd) + Zc IR sinh(γd) and I(d) = IR cosh(γd) + VR/Zc sinh(γd)
+    at distance d from the receiving end.
+    """
+    positions = np.linspace(0.0, length, max(2, int(points)))
+    gamma_d = gamma * (length - positions)
+    cosh = np.cosh(gamma_d)
+    sinh = np.sinh(gamma_d)
+    voltage = v_receiving * cosh + zc * i_receiving * sinh
+    current = i_receiving * cosh + v_receiving / zc * sinh
+    return positions, voltage, current
+
 class TransmissionLineCalculator(QObject):
     # Define signals
     lengthChanged = Signal()
@@ -16,8 +133,12 @@ class TransmissionLineCalculator(QObject):
     # Add new signals
     bundleConfigChanged = Signal()
     temperatureChanged = Signal()
+    resistanceBasisChanged = Signal()
     earthResistivityChanged = Signal()
     silCalculated = Signal()
+    loadChanged = Signal()
+    profilePointsChanged = Signal()
+    sweepCalculated = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -44,6 +165,8 @@ class TransmissionLineCalculator(QObject):
         self._sub_conductors = 2    # conductors per bundle
         self._conductor_gmr = 0.0078  # meters
         self._conductor_temperature = 75.0  # °C
+        self._resistance_at_20 = False  # Resistance entered as DC at 20 °C rather than AC at operating temperature
+        self._conductor_material = "Aluminium"
         self._earth_resistivity = 100.0  # Ω⋅m
         self._nominal_voltage = 400.0  # kV
         
@@ -51,36 +174,25 @@ class TransmissionLineCalculator(QObject):
         self._skin_factor = 1.0
         self._sil = 0.0  # Surge impedance loading
         self._earth_impedance = complex(0, 0)
-        self._voltage_profile = []
-        self._current_profile = []
+        self._load_mw = 0.0  # Receiving-end load, three-phase
+        self._load_power_factor = 0.95  # Lagging
+        self._profile_points = 1001
+        self._profile_positions = np.empty(0)
+        self._voltage_profile = np.empty(0)  # pu of nominal phase voltage
+        self._current_profile = np.empty(0)  # A
+        self._sending_voltage = 1.0
+        self._sweep = None
 
         self._calculate()
 
     def _calculate(self):
         try:
-            # Calculate skin effect factor
+            # Per-km constants with skin effect and earth return at the operating frequency
             f = self._frequency
-            self._skin_factor = 1 + (f/60) * 0.00125 * math.sqrt(self._conductor_temperature/75)
-            
-            # Apply skin effect to resistance
-            R_ac = self._resistance * self._skin_factor
-            
-            # Calculate bundle GMR
-            if self._sub_conductors > 1:
-                bundle_gmr = (self._conductor_gmr * (self._bundle_spacing ** 
-                            (self._sub_conductors - 1))) ** (1/self._sub_conductors)
-            else:
-                bundle_gmr = self._conductor_gmr
-            
-            # Calculate earth return impedance
-            De = 658.5 * math.sqrt(self._earth_resistivity/f)
-            Ze = complex(math.pi**2 * f/60, 0.0386 * f * math.log(De/bundle_gmr))
-            self._earth_impedance = Ze
-            
-            # Update Z with bundling and earth effects
-            w = 2 * np.pi * f
-            Z = complex(R_ac, w * self._inductance * 1e-3) + Ze/3
-            Y = complex(self._conductance, w * self._capacitance * 1e-6)
+            Z, Y, ys, Ze = line_constants(f, **self._line_arguments())
+            Z, Y = complex(Z), complex(Y)
+            self._skin_factor = 1 + float(ys)
+            self._earth_impedance = complex(Ze)
             
             # Calculate characteristic impedance with corrections
             self._Z = cmath.sqrt(Z / Y)
@@ -88,14 +200,14 @@ class TransmissionLineCalculator(QObject):
             # Calculate SIL
             self._sil = (self._nominal_voltage * 1000) ** 2 / abs(self._Z)
             
-            # Calculate voltage and current profiles
-            self._calculate_profiles()
-            
             # Calculate propagation constant
             self._gamma = cmath.sqrt(Z * Y)
             self._alpha = self._gamma.real
             self._beta = self._gamma.imag
             
+            # Voltage and current profiles need the propagation constant
+            self._calculate_profiles()
+            
             # Calculate ABCD parameters
             gamma_l = self._gamma * self._length
             self._A = cmath.cosh(gamma_l)
@@ -108,22 +220,41 @@ class TransmissionLineCalculator(QObject):
         except Exception as e:
             print(f"Error in transmission line calculation: {e}")
 
+    def _line_arguments(self):
+        return {
+            "resistance": self._resistance, "inductance": self._inductance,
+            "capacitance": self._capacitance, "conductance": self._conductance,
+            "sub_conductors": self._sub_conductors, "bundle_spacing": self._bundle_spacing,
+            "conductor_gmr": self._conductor_gmr, "earth_resistivity": self._earth_resistivity,
+            "rated_frequency": self._frequency,
+            # The temperature correction only applies to resistances entered at 20 °C DC
+            "temperature": self._conductor_temperature if self._resistance_at_20 else None,
+            "alpha": TEMPERATURE_COEFFICIENTS.get(self._conductor_material, TEMPERATURE_COEFFICIENTS["Aluminium"])
+        }
+
+    def _load_impedance(self):
+        """Per-phase impedance of the receiving-end load at nominal voltage, None without load"""
+        if self._load_mw <= 0:
+            return None
+        v_phase = self._nominal_voltage * 1000 / math.sqrt(3)
+        pf = min(max(self._load_power_factor, 1e-6), 1.0)
+        power = self._load_mw * 1e6 / 3
+        return v_phase ** 2 / complex(power, power * math.tan(math.acos(pf))).conjugate()
+
     def _calculate_profiles(self):
-        """Calculate voltage and current profiles along the line"""
-        points = 100
-        self._voltage_profile = []
-        self._current_profile = []
-        
-        for i in range(points + 1):
-            z = i * self._length / points
-            gamma_z = self._gamma * z
-            
-            # Calculate V(z) and I(z) assuming V(0)=1.0 pu
-            v = cmath.cosh(gamma_z)
-            i = (1/self._Z) * cmath.sinh(gamma_z)
-            
-            self._voltage_profile.append((z, abs(v)))
-            self._current_profile.append((z, abs(i)))
+        """Calculate voltage and current profiles along the line under the receiving-end load"""
+        v_phase = self._nominal_voltage * 1000 / math.sqrt(3)
+        pf = min(max(self._load_power_factor, 0.0), 1.0)
+        power = self._load_mw * 1e6 / 3  # Per phase
+        load = complex(power, power * math.tan(math.acos(pf)) if pf > 0 else 0.0)
+        i_receiving = (load / v_phase).conjugate()
+
+        positions, voltage, current = line_profile(self._Z, self._gamma, self._length,
+                                                   v_phase, i_receiving, self._profile_points)
+        self._profile_positions = positions
+        self._voltage_profile = np.abs(voltage) / v_phase
+        self._current_profile = np.abs(current)
+        self._sending_voltage = float(self._voltage_profile[0])
 
     # Properties
     @Property(float, notify=lengthChanged)
@@ -278,13 +409,94 @@ class TransmissionLineCalculator(QObject):
     def surgeImpedanceLoading(self):
         return self._sil
 
+    @Property(list, notify=resultsCalculated)
+    def profilePositions(self):
+        """Distance from the sending end (km) of each profile point"""
+        return self._profile_positions.tolist()
+
     @Property(list, notify=resultsCalculated)
     def voltageProfile(self):
-        return self._voltage_profile
+        """Voltage magnitude along the line in pu of nominal"""
+        return self._voltage_profile.tolist()
 
     @Property(list, notify=resultsCalculated)
     def currentProfile(self):
-        return self._current_profile
+        """Current magnitude along the line in A"""
+        return self._current_profile.tolist()
+
+    @Property(float, notify=resultsCalculated)
+    def sendingEndVoltage(self):
+        return self._sending_voltage
+
+    @Property(float, notify=resultsCalculated)
+    def maxProfileCurrent(self):
+        return float(self._current_profile.max()) if len(self._current_profile) else 0.0
+
+    @Property(float, notify=resultsCalculated)
+    def skinFactor(self):
+        return self._skin_factor
+
+    @Property(list, notify=sweepCalculated)
+    def sweepFrequencies(self):
+        return self._sweep.frequencies.tolist() if self._sweep else []
+
+    @Property(list, notify=sweepCalculated)
+    def sweepImpedance(self):
+        """Magnitude of the sending-end input impedance under the current load"""
+        return np.abs(self._sweep.z_load).tolist() if self._sweep else []
+
+    @Property(list, notify=sweepCalculated)
+    def sweepResonances(self):
+        """Frequencies where the input reactance changes sign"""
+        if not self._sweep:
+            return []
+        return resonances(self._sweep.frequencies, self._sweep.z_load)[0].tolist()
+
+    @Property(float, notify=sweepCalculated)
+    def sweepMaxImpedance(self):
+        if not self._sweep:
+            return 0.0
+        magnitude = np.abs(self._sweep.z_load)
+        magnitude = magnitude[np.isfinite(magnitude)]
+        return float(magnitude.max()) if len(magnitude) else 0.0
+
+    @property
+    def sweep(self):
+        """SweepResult of the last frequencySweep call"""
+        return self._sweep
+
+    @Property(float, notify=loadChanged)
+    def loadMW(self):
+        return self._load_mw
+
+    @loadMW.setter
+    def loadMW(self, value):
+        if value >= 0:
+            self._load_mw = value
+            self.loadChanged.emit()
+            self._calculate()
+
+    @Property(float, notify=loadChanged)
+    def loadPowerFactor(self):
+        return self._load_power_factor
+
+    @loadPowerFactor.setter
+    def loadPowerFactor(self, value):
+        if 0 < value <= 1:
+            self._load_power_factor = value
+            self.loadChanged.emit()
+            self._calculate()
+
+    @Property(int, notify=profilePointsChanged)
+    def profilePoints(self):
+        return self._profile_points
+
+    @profilePoints.setter
+    def profilePoints(self, value):
+        if value >= 2:
+            self._profile_points = value
+            self.profilePointsChanged.emit()
+            self._calculate()
 
     @Property(float, notify=bundleConfigChanged)
     def bundleSpacing(self):
@@ -308,6 +520,33 @@ class TransmissionLineCalculator(QObject):
             self.temperatureChanged.emit()
             self._calculate()
 
+    @Property(bool, notify=resistanceBasisChanged)
+    def resistanceAt20C(self):
+        """True when the resistance input is the 20 °C DC value, corrected to conductorTemperature"""
+        return self._resistance_at_20
+
+    @resistanceAt20C.setter
+    def resistanceAt20C(self, value):
+        if bool(value) != self._resistance_at_20:
+            self._resistance_at_20 = bool(value)
+            self.resistanceBasisChanged.emit()
+            self._calculate()
+
+    @Property(str, notify=resistanceBasisChanged)
+    def conductorMaterial(self):
+        return self._conductor_material
+
+    @conductorMaterial.setter
+    def conductorMaterial(self, value):
+        if value in TEMPERATURE_COEFFICIENTS and value != self._conductor_material:
+            self._conductor_material = value
+            self.resistanceBasisChanged.emit()
+            self._calculate()
+
+    @Property(list, constant=True)
+    def conductorMaterials(self):
+        return list(TEMPERATURE_COEFFICIENTS)
+
     @Property(float, notify=earthResistivityChanged)
     def earthResistivity(self):
         return self._earth_resistivity
@@ -356,8 +595,60 @@ class TransmissionLineCalculator(QObject):
     def setConductorTemperature(self, value):
         self.conductorTemperature = value
 
+    @Slot(bool)
+    def setResistanceAt20C(self, value):
+        self.resistanceAt20C = value
+
+    @Slot(str)
+    def setConductorMaterial(self, value):
+        self.conductorMaterial = value
+
     @Slot(float)
     def setEarthResistivity(self, value):
         self.earthResistivity = value
 
+    @Slot(float)
+    def setLoadMW(self, value):
+        self.loadMW = value
+
+    @Slot(float)
+    def setLoadPowerFactor(self, value):
+        self.loadPowerFactor = value
+
+    @Slot(int)
+    def setProfilePoints(self, value):
+        self.profilePoints = value
+
+    @Slot(float, float, int)
+    def frequencySweep(self, f_min, f_max, points):
+        """Evaluate Zc, γ, ABCD and input impedances over f_min .. f_max Hz"""
+        if f_max <= f_min or points < 2:
+            return
+        try:
+            frequencies = np.linspace(max(f_min, 0.0), f_max, points)
+            self._sweep = frequency_sweep(frequencies, self._length, self._load_impedance(),
+                                          **self._line_arguments())
+            self.sweepCalculated.emit()
+        except Exception as e:
+            print(f"Error in frequency sweep: {e}")
+
+    @Slot(QXYSeries)
+    def fill_sweep_impedance(self, series):
+        """Replace the series points with |Zin| against frequency, skipping non-finite points"""
+        if not self._sweep:
+            return
+        magnitude = np.abs(self._sweep.z_load)
+        keep = np.isfinite(magnitude)
+        series.replaceNp(self._sweep.frequencies[keep], magnitude[keep])
+
+    @Slot(QXYSeries)
+    def fill_voltage_profile(self, series):
+        """Replace the series points with the voltage profile in one call"""
+        series.replaceNp(self._profile_positions, self._voltage_profile)
+
+    @Slot(QXYSeries)
+    def fill_current_profile(self, series):
+        """Replace the series points with the current profile in one call"""
+        series.replaceNp(self._profile_positions, self._current_profile)
+
     # ...similar slots for other new parameters...
@@ -0,0 +1,147 @@
+import numpy as np
+
+from .stream_recorder import COLUMNS
+
+
+class TriggerEdge:
+    RISING = "rising"
+    FALLING = "falling"
+
+
+class TriggerCapture:
+    """Oscilloscope style trigger over blocks of (time, A, B, C) rows.
+
+    The last ``pre_samples`` rows are held in a pre-trigger ring. When the
+    selected channel crosses ``level`` on the chosen edge the ring and the
+    following ``post_samples`` rows (including the trigger sample) are
+    copied into a capture, which is frozen once complete. Edges are found
+    with vectorized comparisons over each incoming block.
+    """
+
+    def __init__(self, pre_samples=100, post_samples=200, channel=0, level=150.0,
+                 edge=TriggerEdge.RISING, single=False):
+        self.channel = channel
+        self.level = level
+        self.edge = edge
+        self.single = single
+        self.capture = np.zeros((0, COLUMNS))  # Last completed capture, time relative to the trigger
+        self.trigger_time = 0.0
+        self.resize(pre_samples, post_samples)
+
+    @property
+    def pre_samples(self):
+        return self._pre_samples
+
+    @property
+    def post_samples(self):
+        return self._post_samples
+
+    @property
+    def armed(self):
+        return self._armed
+
+    @property
+    def capturing(self):
+        return self._filled is not None
+
+    def resize(self, pre_samples, post_samples):
+        self._pre_samples = max(0, int(pre_samples))
+        self._post_samples = max(1, int(post_samples))
+        self._pre = np.zeros((self._pre_samples, COLUMNS))
+        self._buffer = np.zeros((self._pre_samples + self._post_samples, COLUMNS))
+        self.reset()
+
+    def reset(self):
+        """Clear the pre-trigger history and re-arm"""
+        self._pre_total = 0
+        self._filled = None  # Rows of the capture buffer written while capturing
+        self._end = 0  # Capture buffer length for the capture in progress
+        self._last_below = None  # Whether the last sample seen was below the level
+        self._armed = True
+
+    def arm(self):
+        self._armed = True
+
+    def _feed_pre(self, rows):
+        """Keep the newest rows in the pre-trigger ring"""
+        size = self._pre_samples
+        if not size or not len(rows):
+            return
+        rows = rows[-size:]
+        n = len(rows)
+        start = self._pre_total % size
+        first = min(n, size - start)
+        self._pre[start:start + first] = rows[:first]
+        if first < n:
+            self._pre[:n - first] = rows[first:]
+        self._pre_total += n
+
+    def _pre_history(self):
+        size = self._pre_samples
+        count = min(self._pre_total, size)
+        if not count:
+            return self._pre[:0]
+        start = (self._pre_total - count) % size
+        return np.roll(self._pre, -start, axis=0)[:count]
+
+    def _find_edge(self, values):
+        """Index of the first trigger edge in ``values`` or -1"""
+        below = values < self.level
+        previous = np.empty_like(below)
+        previous[1:] = below[:-1]
+        if self._last_below is None:
+            previous[0] = below[0]  # No history, so the first sample cannot be an edge
+        else:
+            previous[0] = self._last_below
+        if self.edge == TriggerEdge.FALLING:
+            edges = ~previous & below
+        else:
+            edges = previous & ~below
+        hits = np.flatnonzero(edges)
+        return int(hits[0]) if len(hits) else -1
+
+    def push(self, block):
+        """Process a block of rows; return True if a capture completed"""
+        block = np.asarray(block, dtype=np.float64)
+        completed = False
+        i = 0
+        n = len(block)
+        while i < n:
+            if self._filled is not None:
+                take = min(self._end - self._filled, n - i)
+                self._buffer[self._filled:self._filled + take] = block[i:i + take]
+                self._filled += take
+                self._feed_pre(block[i:i + take])
+                i += take
+                self._last_below = bool(block[i - 1, 1 + self.channel] < self.level)
+                if self._filled == self._end:
+                    self._freeze()
+                    completed = True
+                continue
+
+            rest = block[i:]
+            j = self._find_edge(rest[:, 1 + self.channel]) if self._armed else -1
+            if j < 0:
+                self._feed_pre(rest)
+                break
+
+            # Start a capture with the pre-trigger history ending just before the edge
+            self._feed_pre(rest[:j])
+            history = self._pre_history()
+            self._buffer[:len(history)] = history
+            self._filled = len(history)
+            self._end = len(history) + self._post_samples
+            self.trigger_time = float(rest[j, 0])
+            self._armed = False
+            i += j
+
+        if n:
+            self._last_below = bool(block[-1, 1 + self.channel] < self.level)
+        return completed
+
+    def _freeze(self):
+        capture = self._buffer[:self._end].copy()
+        capture[:, 0] -= self.trigger_time
+        self.capture = capture
+        self._filled = None
+        self._armed = not self.single
@@ -0,0 +1,171 @@
+"""Harmonic analysis of recorded waveform files.
+
+Files are processed as a stream of fixed windows of ``cycles`` fundamental
+periods (10 cycles at 50 Hz as in IEC 61000-4-7), so harmonic ``h`` falls
+exactly on FFT bin ``h * cycles``. Raw binary files and StreamRecorder
+recordings are memory-mapped and processed a block of windows at a time
+with one batched ``rfft``; CSV files are parsed in chunks. Blocks can be
+spread over a process pool, in which case each worker maps the file itself
+so no sample data is pickled.
+"""
+
+import itertools
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .stream_recorder import MAGIC, HEADER_SIZE, COLUMNS, DTYPE, read_count, valid_rows
+
+WaveformAnalysis = namedtuple(
+    "WaveformAnalysis",
+    ["times", "harmonics", "rms", "thd", "tdd", "crest_factor", "demand_current"]
+)
+
+WINDOWS_PER_BLOCK = 256
+POOL_THRESHOLD_BYTES = 256 * 1024 * 1024  # Smaller files are faster without worker start-up
+
+
+def window_length(sample_rate, fundamental=50.0, cycles=10):
+    """Samples in an analysis window of ``cycles`` fundamental periods"""
+    return int(round(cycles * sample_rate / fundamental))
+
+
+def analyze_windows(windows, cycles, orders):
+    """Per-window harmonic RMS (windows × orders), total RMS and crest factor.
+
+    ``windows`` is a (count, length) array of samples; order 1 is the
+    fundamental.
+    """
+    windows = np.asarray(windows, dtype=np.float64)
+    length = windows.shape[1]
+    orders = min(orders, (length // 2) // cycles)
+    spectrum = np.fft.rfft(windows, axis=1)
+    bins = spectrum[:, cycles:cycles * orders + 1:cycles]
+    harmonics = np.abs(bins) * (np.sqrt(2.0) / length)  # Peak amplitude / sqrt(2)
+    rms = np.sqrt(np.mean(np.square(windows), axis=1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crest = np.where(rms > 0, np.abs(windows).max(axis=1) / rms, 0.0)
+    return harmonics, rms, crest
+
+
+def _file_layout(path, dtype, channels, offset):
+    """Resolve (dtype, channels, offset, column offset, rows) for raw or recorded files"""
+    with open(path, "rb") as f:
+        recorded = f.read(len(MAGIC)) == MAGIC
+        count = read_count(f) if recorded else 0
+    if recorded:
+        # StreamRecorder file: skip the header and the time column. A recording
+        # that was not closed ends in preallocated zero rows past its samples.
+        dtype = np.dtype(DTYPE)
+        rows = _file_rows(path, dtype, COLUMNS, HEADER_SIZE)
+        if rows > count:
+            count = valid_rows(_map_samples(path, dtype, COLUMNS, HEADER_SIZE, rows), count)
+        return dtype, COLUMNS, HEADER_SIZE, 1, int(min(count, rows))
+    dtype = np.dtype(dtype)
+    return dtype, channels, offset, 0, _file_rows(path, dtype, channels, offset)
+
+
+def _file_rows(path, dtype, channels, offset):
+    """Whole rows of samples after ``offset``, from the file size"""
+    return (os.path.getsize(path) - offset) // (dtype.itemsize * channels)
+
+
+def _map_samples(path, dtype, channels, offset, rows):
+    """Map the first ``rows`` rows of samples"""
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(rows, channels))
+
+
+def _analyze_block(job):
+    """Worker entry point: map the file and analyze windows ``first:last``"""
+    path, dtype, channels, offset, rows, column, length, first, last, cycles, orders = job
+    samples = _map_samples(path, np.dtype(dtype), channels, offset, rows)
+    windows = samples[first * length:last * length, column].reshape(last - first, length)
+    return analyze_windows(windows, cycles, orders)
+
+
+def _binary_blocks(path, sample_rate, fundamental, cycles, orders, channel, channels, dtype, offset, workers):
+    dtype, channels, offset, column_offset, rows = _file_layout(path, dtype, channels, offset)
+    length = window_length(sample_rate, fundamental, cycles)
+    count = rows // length
+    jobs = [
+        (path, dtype.str, channels, offset, rows, channel + column_offset, length,
+         first, min(count, first + WINDOWS_PER_BLOCK), cycles, orders)
+        for first in range(0, count, WINDOWS_PER_BLOCK)
+    ]
+    if workers and len(jobs) > 1:
+        # Spawned workers are safe to start from a threaded Qt application
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            yield from pool.map(_analyze_block, jobs)
+    else:
+        yield from map(_analyze_block, jobs)
+
+
+def _csv_blocks(path, sample_rate, fundamental, cycles, orders, channel):
+    """Parse ``channel`` of a CSV file a block of windows at a time; unparsable lines are skipped"""
+    length = window_length(sample_rate, fundamental, cycles)
+    block = np.empty(length * WINDOWS_PER_BLOCK)
+    filled = 0
+    with open(path, "r") as f:
+        while True:
+            lines = list(itertools.islice(f, len(block) - filled))
+            if not lines:
+                break
+            for line in lines:
+                fields = line.split(",")
+                try:
+                    block[filled] = float(fields[channel])
+                except (ValueError, IndexError):
+                    continue  # Header or malformed line
+                filled += 1
+            if filled == len(block):
+                yield analyze_windows(block.reshape(-1, length), cycles, orders)
+                filled = 0
+    whole = filled // length
+    if whole:
+        yield analyze_windows(block[:whole * length].reshape(whole, length), cycles, orders)
+
+
+def analyze_file(path, sample_rate, fundamental=50.0, cycles=10, orders=50, channel=0,
+                 channels=1, dtype="float32", offset=0, demand_current=None, workers=0):
+    """Stream a waveform file through windowed FFTs.
+
+    CSV files (by extension) take ``channel`` as the column index; other
+    files are raw interleaved ``dtype`` samples with ``channels`` columns
+    after ``offset`` bytes, or StreamRecorder recordings where ``channel``
+    selects A, B or C. TDD uses ``demand_current`` as the maximum demand
+    load current, defaulting to the largest fundamental seen in the file.
+    ``workers`` > 0 analyzes blocks in a process pool; None uses one
+    worker per CPU for files above POOL_THRESHOLD_BYTES.
+    """
+    if workers is None:
+        workers = os.cpu_count() if os.path.getsize(path) > POOL_THRESHOLD_BYTES else 0
+    if os.path.splitext(path)[1].lower() in (".csv", ".txt"):
+        blocks = _csv_blocks(path, sample_rate, fundamental, cycles, orders, channel)
+    else:
+        blocks = _binary_blocks(path, sample_rate, fundamental, cycles, orders,
+                                channel, channels, dtype, offset, workers)
+
+    results = list(blocks)
+    if not results:
+        empty = np.empty(0)
+        return WaveformAnalysis(empty, np.empty((0, orders)), empty, empty, empty, empty, 0.0)
+
+    harmonics = np.concatenate([r[0] for r in results])
+    rms = np.concatenate([r[1] for r in results])
+    crest = np.concatenate([r[2] for r in results])
+    fundamental_rms = harmonics[:, 0]
+    distortion = np.sqrt(np.sum(np.square(harmonics[:, 1:]), axis=1))
+    if demand_current is None:
+        demand_current = float(fundamental_rms.max())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        thd = np.where(fundamental_rms > 0, distortion / fundamental_rms * 100.0, 0.0)
+        tdd = distortion / demand_current * 100.0 if demand_current > 0 else np.zeros_like(distortion)
+
+    window_seconds = cycles / fundamental
+    times = np.arange(len(harmonics)) * window_seconds
+    # float32 keeps the trend matrix compact for long recordings
+    return WaveformAnalysis(times, harmonics.astype(np.float32), rms, thd, tdd, crest, demand_current)
@@ -165,6 +165,161 @@ Pane {
                 }
             }
 
+            // External data source
+            WaveCard {
+                title: "Data Source"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 100
+
+                RowLayout {
+                    spacing: 5
+                    ComboBox {
+                        id: sourceKind
+                        model: ["csv", "file", "udp", "tcp", "stdin"]
+                        enabled: !realTimeChart.sourceConnected
+                        Layout.preferredWidth: 80
+                    }
+                    TextField {
+                        id: sourceAddress
+                        placeholderText: sourceKind.currentText === "udp" || sourceKind.currentText === "tcp"
+                                         ? "127.0.0.1:5005" : "path"
+                        enabled: !realTimeChart.sourceConnected && sourceKind.currentText !== "stdin"
+                        Layout.fillWidth: true
+                    }
+                    Button {
+                        text: realTimeChart.sourceConnected ? "Disconnect" : "Connect"
+                        onClicked: {
+                            if (realTimeChart.sourceConnected) {
+                                realTimeChart.disconnectSource()
+                            } else {
+                                realTimeChart.connectSource(sourceKind.currentText,
+                                                            sourceAddress.text || sourceAddress.placeholderText)
+                            }
+                        }
+                    }
+                }
+            }
+
+            // Trigger capture
+            WaveCard {
+                title: "Trigger"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 140
+
+                GridLayout {
+                    columns: 4
+                    columnSpacing: 5
+
+                    CheckBox {
+                        text: "Enabled"
+                        checked: realTimeChart.triggerEnabled
+                        onToggled: realTimeChart.setTriggerEnabled(checked)
+                    }
+                    ComboBox {
+                        model: ["Alpha", "Beta", "Gamma"]
+                        currentIndex: realTimeChart.triggerChannel
+                        Layout.fillWidth: true
+                        onActivated: realTimeChart.setTriggerChannel(currentIndex)
+                    }
+                    ComboBox {
+                        model: ["Rising", "Falling"]
+                        Layout.fillWidth: true
+                        onActivated: realTimeChart.setTriggerEdge(currentText)
+                    }
+                    TextField {
+                        text: realTimeChart.triggerLevel.toFixed(1)
+                        validator: DoubleValidator {}
+                        Layout.preferredWidth: 60
+                        onEditingFinished: realTimeChart.setTriggerLevel(parseFloat(text))
+                    }
+
+                    CheckBox {
+                        text: "Single"
+                        checked: realTimeChart.triggerSingle
+                        onToggled: realTimeChart.setTriggerSingle(checked)
+                    }
+                    Button {
+                        text: realTimeChart.triggerArmed ? "Armed" : "Arm"
+                        enabled: realTimeChart.triggerEnabled && !realTimeChart.triggerArmed
+                        Layout.columnSpan: 3
+                        Layout.fillWidth: true
+                        onClicked: realTimeChart.armTrigger()
+                    }
+                }
+            }
+
+            // Record / replay
+            WaveCard {
+                title: "Recording"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 140
+
+                ColumnLayout {
+                    Layout.fillWidth: true
+                    spacing: 5
+
+                    RowLayout {
+                        spacing: 10
+                        Button {
+                            text: realTimeChart.isRecording ? "Stop" : "Record"
+                            enabled: !realTimeChart.isReplaying
+                            Layout.fillWidth: true
+                            onClicked: {
+                                if (realTimeChart.isRecording) {
+                                    realTimeChart.stopRecording()
+                                } else {
+                                    recordDialog.open()
+                                }
+                            }
+                        }
+                        Button {
+                            text: realTimeChart.isReplaying ? "Close" : "Open"
+                            enabled: !realTimeChart.isRecording
+                            Layout.fillWidth: true
+                            onClicked: {
+                                if (realTimeChart.isReplaying) {
+                                    realTimeChart.closeRecording()
+                                } else {
+                                    replayDialog.open()
+                                }
+                            }
+                        }
+                        ComboBox {
+                            model: ["1x", "2x", "5x", "10x"]
+                            enabled: realTimeChart.isReplaying
+                            Layout.preferredWidth: 80
+                            onCurrentTextChanged: realTimeChart.setPlaybackSpeed(parseFloat(currentText))
+                        }
+                    }
+
+                    Slider {
+                        Layout.fillWidth: true
+                        visible: realTimeChart.isReplaying
+                        from: 0
+                        to: Math.max(realTimeChart.playbackDuration, 0.001)
+                        value: realTimeChart.playbackPosition
+                        onMoved: realTimeChart.seekPlayback(value)
+                    }
+                }
+
+                FileDialog {
+                    id: recordDialog
+                    title: "Record to"
+                    fileMode: FileDialog.SaveFile
+                    nameFilters: ["Recordings (*.rtc)"]
+                    defaultSuffix: "rtc"
+                    onAccepted: realTimeChart.startRecording(selectedFile)
+                }
+
+                FileDialog {
+                    id: replayDialog
+                    title: "Open recording"
+                    fileMode: FileDialog.OpenFile
+                    nameFilters: ["Recordings (*.rtc)"]
+                    onAccepted: realTimeChart.openRecording(selectedFile)
+                }
+            }
+
             // Save/Load
             WaveCard {
                 title: "Configuration"
@@ -187,203 +342,259 @@ Pane {
             }
         }
 
-        // Chart
-        WaveCard {
-            title: "Real Time Chart"
+        ColumnLayout {
             Layout.fillWidth: true
             Layout.fillHeight: true
+            spacing: 10
 
-            color: sideBar.toggle1 ? "black" : "white"
+            // Chart
+            WaveCard {
+                title: "Real Time Chart"
+                Layout.fillWidth: true
+                Layout.fillHeight: true
 
-            ChartView {
-                id: chartView
-                anchors.fill: parent
+                color: sideBar.toggle1 ? "black" : "white"
 
-                antialiasing: true
-                legend.visible: true
-                theme: Universal.theme
+                ChartView {
+                    id: chartView
+                    anchors.fill: parent
 
-                RealTimeChart { id: realTimeChart }
+                    antialiasing: true
+                    legend.visible: true
+                    theme: Universal.theme
 
-                property real viewPortStart: 0
-                property real viewPortWidth: 30  // 30 seconds view
-                property real trackerX: 0
-                property var trackerValues: []
+                    RealTimeChart { id: realTimeChart }
 
-                ValueAxis {
-                    id: axisY
-                    min: 0
-                    max: 300
-                }
+                    property real viewPortStart: 0
+                    property real viewPortWidth: 30  // 30 seconds view
+                    property real trackerX: 0
+                    property var trackerValues: []
 
-                ValueAxis {
-                    id: axisX
-                    min: 0
-                    max: 30  // Fixed 30 second window
-                    tickCount: 7  // Show tick every 5 seconds
-                    titleText: "Time (s)"
-                }
+                    ValueAxis {
+                        id: axisY
+                        min: 0
+                        max: 300
+                    }
 
-                LineSeries {
-                    id: seriesA
-                    name: "Alpha"
-                    axisX: axisX
-                    axisY: axisY
-                    color: "#ff0000"
-                    width: 2
-                }
+                    ValueAxis {
+                        id: axisX
+                        // Fixed 30 second window, or the capture window in trigger mode
+                        min: realTimeChart.triggerEnabled ? realTimeChart.captureStart : 0
+                        max: realTimeChart.triggerEnabled && realTimeChart.captureEnd > realTimeChart.captureStart
+                             ? realTimeChart.captureEnd : 30
+                        tickCount: 7  // Show tick every 5 seconds
+                        titleText: "Time (s)"
+                    }
 
-                LineSeries {
-                    id: seriesB
-                    name: "Beta"
-                    axisX: axisX
-                    axisY: axisY
-                    color: "#00cc00"
-                    width: 2
-                }
+                    LineSeries {
+                        id: seriesA
+                        name: "Alpha"
+                        axisX: axisX
+                        axisY: axisY
+                        color: "#ff0000"
+                        width: 2
+                    }
 
-                LineSeries {
-                    id: seriesC
-                    name: "Gamma"
-                    axisX: axisX
-                    axisY: axisY
-                    color: "#0000ff"
-                    width: 2
-                }
+                    LineSeries {
+                        id: seriesB
+                        name: "Beta"
+                        axisX: axisX
+                        axisY: axisY
+                        color: "#00cc00"
+                        width: 2
+                    }
+
+                    LineSeries {
+                        id: seriesC
+                        name: "Gamma"
+                        axisX: axisX
+                        axisY: axisY
+                        color: "#0000ff"
+                        width: 2
+                    }
+
+                    Connections {
+                        target: realTimeChart
+                        function onDataUpdated(t, valA, valB, valC) {
+                            if (realTimeChart.triggerEnabled) return  // Showing frozen captures
 
-                Connections {
-                    target: realTimeChart
-                    function onDataUpdated(t, valA, valB, valC) {
-                        seriesA.append(t, valA)
-                        seriesB.append(t, valB)
-                        seriesC.append(t, valC)
-
-                        // Remove old points when beyond 30 seconds
-                        while (seriesA.count > 300) {  // Keep 300 points for smooth display
-                            seriesA.remove(0)
-                            seriesB.remove(0)
-                            seriesC.remove(0)
+                            seriesA.append(t, valA)
+                            seriesB.append(t, valB)
+                            seriesC.append(t, valC)
+
+                            // Remove old points when beyond 30 seconds
+                            while (seriesA.count > 300) {  // Keep 300 points for smooth display
+                                seriesA.remove(0)
+                                seriesB.remove(0)
+                                seriesC.remove(0)
+                            }
+                        }
+
+                        function onBufferUpdated() {
+                            if (!realTimeChart.triggerEnabled) {
+                                realTimeChart.fill_series(seriesA, seriesB, seriesC)
+                            }
+                        }
+
+                        function onTriggerCaptured() {
+                            realTimeChart.fill_capture(seriesA, seriesB, seriesC)
                         }
+
+                        function onResetChart() {
+                            // Clear all series when 30s is up
+                            seriesA.clear()
+                            seriesB.clear()
+                            seriesC.clear()
+                        }
+                    }
+                    
+                    Timer {
+                        interval: 100
+                        running: root.isActive  // Changed from chartView.isActive
+                        repeat: true
+                        onTriggered: realTimeChart.update()
                     }
 
-                    function onResetChart() {
-                        // Clear all series when 30s is up
-                        seriesA.clear()
-                        seriesB.clear()
-                        seriesC.clear()
+                    // Add tracker line
+                    Rectangle {
+                        id: trackerLine
+                        visible: root.showTracker  // Changed from showTracker
+                        x: chartView.trackerX || 0
+                        y: chartView.plotArea.y
+                        width: 1
+                        height: chartView.plotArea.height
+                        color: "red"
+                        z: 1000  // Ensure it's above the plot
+
+                        // Value labels
+                        Column {
+                            x: 5
+                            y: 0
+                            visible: parent.visible
+                            spacing: 5
+
+                            Repeater {
+                                model: chartView.trackerValues
+                                delegate: Rectangle {
+                                    width: valueLabel.width + 10
+                                    height: valueLabel.height + 6
+                                    color: modelData.color
+                                    radius: 3
+                                    
+                                    Label {
+                                        id: valueLabel
+                                        anchors.centerIn: parent
+                                        text: modelData.value.toFixed(1)
+                                        color: "white"
+                                    }
+                                }
+                            }
+                        }
                     }
-                }
-                
-                Timer {
-                    interval: 100
-                    running: root.isActive  // Changed from chartView.isActive
-                    repeat: true
-                    onTriggered: realTimeChart.update()
-                }
 
-                // Add tracker line
-                Rectangle {
-                    id: trackerLine
-                    visible: root.showTracker  // Changed from showTracker
-                    x: chartView.trackerX || 0
-                    y: chartView.plotArea.y
-                    width: 1
-                    height: chartView.plotArea.height
-                    color: "red"
-                    z: 1000  // Ensure it's above the plot
-
-                    // Value labels
-                    Column {
-                        x: 5
-                        y: 0
-                        visible: parent.visible
-                        spacing: 5
+                    // Add dots to track points on series
+                    Rectangle {
+                        id: dotA
+                        width: 8
+                        height: 8
+                        radius: 4
+                        color: "#ff0000"
+                        visible: root.showTracker  // Changed from showTracker
+                        z: 1001
+                        // Position will be set dynamically
+                    }
 
-                        Repeater {
-                            model: chartView.trackerValues
-                            delegate: Rectangle {
-                                width: valueLabel.width + 10
-                                height: valueLabel.height + 6
-                                color: modelData.color
-                                radius: 3
+                    Rectangle {
+                        id: dotB
+                        width: 8
+                        height: 8
+                        radius: 4
+                        color: "#00cc00"
+                        visible: root.showTracker  // Changed from showTracker
+                        z: 1001
+                    }
+
+                    Rectangle {
+                        id: dotC
+                        width: 8
+                        height: 8
+                        radius: 4
+                        color: "#0000ff"
+                        visible: root.showTracker  // Changed from showTracker
+                        z: 1001
+                    }
+
+                    // Modified MouseArea
+                    MouseArea {
+                        id: chartMouseArea
+                        anchors {
+                            fill: parent
+                            topMargin: 40  // Exclude button area
+                        }
+                        hoverEnabled: true
+                        enabled: root.showTracker  // Changed from showTracker
+
+                        onPositionChanged: (mouse) => {
+                            if (root.showTracker) {  // Changed from showTracker
+                                let chartPoint = mouse.x - chartView.plotArea.x
+                                let xValue = axisX.min + (chartPoint / chartView.plotArea.width) * (axisX.max - axisX.min)
+                                
+                                chartView.trackerX = chartPoint + chartView.plotArea.x
+                                chartView.trackerValues = realTimeChart.getValuesAtTime(xValue)
                                 
-                                Label {
-                                    id: valueLabel
-                                    anchors.centerIn: parent
-                                    text: modelData.value.toFixed(1)
-                                    color: "white"
+                                // Position the dots using chart's mapToPosition
+                                if (chartView.trackerValues.length === 3) {
+                                    let point = Qt.point(xValue, chartView.trackerValues[0].value)
+                                    let pos = chartView.mapToPosition(point, seriesA)
+                                    dotA.x = pos.x - dotA.width/2
+                                    dotA.y = pos.y - dotA.height/2
+
+                                    point = Qt.point(xValue, chartView.trackerValues[1].value)
+                                    pos = chartView.mapToPosition(point, seriesB)
+                                    dotB.x = pos.x - dotB.width/2
+                                    dotB.y = pos.y - dotB.height/2
+
+                                    point = Qt.point(xValue, chartView.trackerValues[2].value)
+                                    pos = chartView.mapToPosition(point, seriesC)
+                                    dotC.x = pos.x - dotC.width/2
+                                    dotC.y = pos.y - dotC.height/2
                                 }
                             }
                         }
                     }
                 }
+            }
 
-                // Add dots to track points on series
-                Rectangle {
-                    id: dotA
-                    width: 8
-                    height: 8
-                    radius: 4
-                    color: "#ff0000"
-                    visible: root.showTracker  // Changed from showTracker
-                    z: 1001
-                    // Position will be set dynamically
-                }
-
-                Rectangle {
-                    id: dotB
-                    width: 8
-                    height: 8
-                    radius: 4
-                    color: "#00cc00"
-                    visible: root.showTracker  // Changed from showTracker
-                    z: 1001
-                }
+            // Channel statistics
+            WaveCard {
+                title: "Statistics"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 130
 
-                Rectangle {
-                    id: dotC
-                    width: 8
-                    height: 8
-                    radius: 4
-                    color: "#0000ff"
-                    visible: root.showTracker  // Changed from showTracker
-                    z: 1001
-                }
+                GridLayout {
+                    columns: 8
+                    columnSpacing: 15
+                    rowSpacing: 2
 
-                // Modified MouseArea
-                MouseArea {
-                    id: chartMouseArea
-                    anchors {
-                        fill: parent
-                        topMargin: 40  // Exclude button area
+                    Repeater {
+                        model: ["", "RMS", "Mean", "Min", "Max", "Freq (Hz)", "Peak", "Peaks"]
+                        Label { text: modelData; font.bold: true }
                     }
-                    hoverEnabled: true
-                    enabled: root.showTracker  // Changed from showTracker
 
-                    onPositionChanged: (mouse) => {
-                        if (root.showTracker) {  // Changed from showTracker
-                            let chartPoint = mouse.x - chartView.plotArea.x
-                            let xValue = axisX.min + (chartPoint / chartView.plotArea.width) * (axisX.max - axisX.min)
-                            
-                            chartView.trackerX = chartPoint + chartView.plotArea.x
-                            chartView.trackerValues = realTimeChart.getValuesAtTime(xValue)
-                            
-                            // Position the dots using chart's mapToPosition
-                            if (chartView.trackerValues.length === 3) {
-                                let point = Qt.point(xValue, chartView.trackerValues[0].value)
-                                let pos = chartView.mapToPosition(point, seriesA)
-                                dotA.x = pos.x - dotA.width/2
-                                dotA.y = pos.y - dotA.height/2
-
-                                point = Qt.point(xValue, chartView.trackerValues[1].value)
-                                pos = chartView.mapToPosition(point, seriesB)
-                                dotB.x = pos.x - dotB.width/2
-                                dotB.y = pos.y - dotB.height/2
-
-                                point = Qt.point(xValue, chartView.trackerValues[2].value)
-                                pos = chartView.mapToPosition(point, seriesC)
-                                dotC.x = pos.x - dotC.width/2
-                                dotC.y = pos.y - dotC.height/2
+                    Repeater {
+                        model: realTimeChart.statistics.length
+
+                        Repeater {
+                            property var stats: realTimeChart.statistics[index]
+                            property int channel: index
+                            model: [["Alpha", "Beta", "Gamma"][channel],
+                                    stats.rms.toFixed(2), stats.mean.toFixed(2),
+                                    stats.min.toFixed(2), stats.max.toFixed(2),
+                                    stats.frequency.toFixed(3), stats.peak.toFixed(2),
+                                    stats.peakCount]
+                            Label {
+                                text: modelData
+                                color: index === 0 ? ["#ff0000", "#00cc00", "#0000ff"][channel] : palette.text
                             }
                         }
                     }
@@ -38,7 +38,7 @@ Item {
                     Label { text: "Cable Size (mm²):" ;Layout.minimumWidth: 180}
                     ComboBox {
                         id: cableSizeCombo
-                        model: [1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240]
+                        model: calculator.cableSizes
                         onCurrentTextChanged: calculator.cableSize = parseFloat(currentText)
                         Layout.minimumWidth: 100
                     }
@@ -54,7 +54,7 @@ Item {
                     Label { text: "Installation Method:" }
                     ComboBox {
                         id: installMethodCombo
-                        model: ["Conduit", "Tray", "Direct Buried", "Free Air", "Wall Surface"]
+                        model: calculator.installMethods
                         onCurrentTextChanged: calculator.installMethod = currentText
                         Layout.fillWidth: true
                     }
@@ -133,6 +133,150 @@ Item {
                     }
                 }
             }
+
+            WaveCard {
+                id: routeCard
+                title: "Cable Route"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 120 + routeSegments.count * 22
+
+                property var routeResult: ({})
+
+                function updateRoute() {
+                    let segments = []
+                    for (let i = 0; i < routeSegments.count; i++) {
+                        let segment = routeSegments.get(i)
+                        segments.push({
+                            "installMethod": segment.installMethod,
+                            "ambientTemp": segment.ambientTemp,
+                            "groupingNumber": segment.groupingNumber
+                        })
+                    }
+                    routeResult = calculator.calculateRoute(segments)
+                }
+
+                ListModel { id: routeSegments }
+
+                ColumnLayout {
+                    anchors.fill: parent
+                    spacing: 5
+
+                    RowLayout {
+                        Button {
+                            text: "Add Segment"
+                            Layout.fillWidth: true
+                            onClicked: {
+                                routeSegments.append({
+                                    "installMethod": installMethodCombo.currentText,
+                                    "ambientTemp": ambientTemp.value,
+                                    "groupingNumber": groupingNumber.value
+                                })
+                                routeCard.updateRoute()
+                            }
+                        }
+                        Button {
+                            text: "Clear"
+                            Layout.fillWidth: true
+                            onClicked: {
+                                routeSegments.clear()
+                                routeCard.routeResult = {}
+                            }
+                        }
+                    }
+
+                    Repeater {
+                        model: routeSegments
+                        delegate: Label {
+                            required property int index
+                            required property string installMethod
+                            required property real ambientTemp
+                            required property int groupingNumber
+                            text: (index + 1) + ". " + installMethod + ", " + ambientTemp + "°C, " +
+                                  groupingNumber + " circuits"
+                            font.bold: index === routeCard.routeResult.limitingSegment
+                            color: index === routeCard.routeResult.limitingSegment ?
+                                   Universal.theme === Universal.Dark ? "#ff8080" : "red" : Universal.foreground
+                        }
+                    }
+
+                    Label {
+                        visible: routeCard.routeResult.ampacity !== undefined
+                        text: visible ? "Governing Ampacity: " + routeCard.routeResult.ampacity.toFixed(1) +
+                                        " A (segment " + (routeCard.routeResult.limitingSegment + 1) + ")" : ""
+                        font.bold: true
+                    }
+                }
+
+                Connections {
+                    target: calculator
+                    function onCalculationsComplete() {
+                        if (routeSegments.count > 0) routeCard.updateRoute()
+                    }
+                }
+            }
+
+            WaveCard {
+                id: shortCircuitCard
+                title: "Short Circuit Withstand"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 200
+
+                property var check: ({})
+
+                function updateCheck() {
+                    check = calculator.checkShortCircuit(parseFloat(faultCurrent.text) || 0,
+                                                         parseFloat(faultDuration.text) || 0)
+                }
+
+                GridLayout {
+                    columns: 2
+                    rowSpacing: 10
+                    columnSpacing: 15
+
+                    Label { text: "Fault Current (kA):" ; Layout.minimumWidth: 180 }
+                    TextField {
+                        id: faultCurrent
+                        placeholderText: "kA"
+                        validator: DoubleValidator { bottom: 0 }
+                        onTextChanged: shortCircuitCard.updateCheck()
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "Clearing Time (s):" }
+                    TextField {
+                        id: faultDuration
+                        text: "0.1"
+                        validator: DoubleValidator { bottom: 0 }
+                        onTextChanged: shortCircuitCard.updateCheck()
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "Withstand:" }
+                    Label {
+                        text: shortCircuitCard.check.withstandKA !== undefined ?
+                              shortCircuitCard.check.withstandKA.toFixed(2) + " kA (k = " +
+                              shortCircuitCard.check.k.toFixed(0) + ")" : "--"
+                        color: shortCircuitCard.check.ok === false ?
+                               Universal.theme === Universal.Dark ? "#ff8080" : "red" : Universal.foreground
+                        font.bold: true
+                    }
+
+                    Label { text: "Minimum Size:" }
+                    Label {
+                        text: shortCircuitCard.check.requiredSize === undefined ? "--" :
+                              shortCircuitCard.check.requiredSize < 0 ? "Exceeds catalog" :
+                              shortCircuitCard.check.requiredSize + " mm²"
+                        font.bold: true
+                    }
+                }
+
+                Connections {
+                    target: calculator
+                    function onCalculationsComplete() {
+                        shortCircuitCard.updateCheck()
+                    }
+                }
+            }
         }
 
         // Right side - visualization
@@ -170,6 +170,11 @@ Item {
                             )
                         }
                     }
+                    Button {
+                        text: "Grade TDS"
+                        enabled: calculator.relayCount > 1
+                        onClicked: calculator.gradeTimeDials(0.025, 0.01)
+                    }
                 }
             }
 
@@ -222,6 +227,53 @@ Item {
             }
 
             // Results Section
+            WaveCard {
+                title: "Monte Carlo Study"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 90 + monteCarloList.count * 20
+
+                ColumnLayout {
+                    anchors.fill: parent
+                    spacing: 5
+
+                    RowLayout {
+                        Layout.fillWidth: true
+                        SpinBox {
+                            id: monteCarloTrials
+                            Layout.fillWidth: true
+                            from: 1000
+                            to: 1000000
+                            stepSize: 1000
+                            value: 10000
+                            editable: true
+                        }
+                        Button {
+                            text: calculator.monteCarloRunning ? "Running..." : "Run"
+                            enabled: calculator.relayCount > 1 && !calculator.monteCarloRunning
+                            onClicked: calculator.runMonteCarlo(monteCarloTrials.value, 0.05, 0.05, 0.1)
+                        }
+                    }
+
+                    ListView {
+                        id: monteCarloList
+                        Layout.fillWidth: true
+                        Layout.fillHeight: true
+                        model: calculator.monteCarloResults
+                        clip: true
+                        delegate: Text {
+                            required property var modelData
+                            text: modelData.primary + " → " + modelData.backup + ": " +
+                                  (modelData.probability * 100).toFixed(2) + "% miscoordinated, P5 margin " +
+                                  modelData.marginPercentile.toFixed(2) + "s"
+                            color: modelData.probability > 0 ?
+                                   Universal.theme === Universal.Dark ? "#ff8080" : "red" :
+                                   Universal.theme === Universal.Dark ? "#90EE90" : "green"
+                            font.pixelSize: 12
+                        }
+                    }
+                }
+            }
+
             WaveCard {
                 title: "Discrimination Results"
                 Layout.fillWidth: true
@@ -356,28 +408,11 @@ Item {
                         seriesToRemove.forEach(series => marginChart.removeSeries(series))
 
                         // Add new series for each relay
-                        calculator.relayList.forEach(function(relay) {
+                        calculator.relayList.forEach(function(relay, index) {
                             console.log("Creating series for relay:", relay.name)
                             let series = marginChart.createSeries(ChartView.SeriesTypeLine, relay.name, faultAxis, marginAxis)
                             series.width = 2
-
-                            // Generate curve points
-                            const numPoints = 100
-                            const minCurrent = Math.max(100, relay.pickup)
-                            const maxCurrent = 20000
-                            const step = (Math.log10(maxCurrent) - Math.log10(minCurrent)) / numPoints
-
-                            for (let i = 0; i <= numPoints; i++) {
-                                const current = Math.pow(10, Math.log10(minCurrent) + i * step)
-                                const multiple = current / relay.pickup
-                                if (multiple <= 1) continue
-                                
-                                const time = (relay.curve_constants.a * relay.tds) / 
-                                           (Math.pow(multiple, relay.curve_constants.b) - 1)
-                                if (isFinite(time) && time > 0 && time < 10) {
-                                    series.append(current, time)
-                                }
-                            }
+                            calculator.fill_relay_curve(series, index, faultAxis.min, faultAxis.max, marginAxis.max)
                         })
                     }
 
@@ -403,14 +438,11 @@ Item {
     Connections {
         target: calculator
         function onAnalysisComplete() {
-            console.log("Analysis complete signal received")
             marginPoints.clear()
             let model = calculator.results
-            console.log("Model rowCount:", model.rowCount())
             for(let i = 0; i < model.rowCount(); i++) {
                 let modelIndex = model.index(i, 0)
                 let result = model.data(modelIndex, calculator.results.DataRole)  // Fixed data role access
-                console.log("Chart data for index", i, ":", JSON.stringify(result))
                 if (result && result.margins) {
                     result.margins.forEach(function(margin) {
                         if (margin.fault_current && margin.margin != null && 
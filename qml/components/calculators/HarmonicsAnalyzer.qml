@@ -1,6 +1,7 @@
 import QtQuick
 import QtQuick.Controls
 import QtQuick.Layouts
+import QtQuick.Dialogs
 import QtCharts
 import "../"
 import "../../components"
@@ -25,7 +26,7 @@ Item {
             WaveCard {
                 title: "Harmonic Components"
                 Layout.fillWidth: true
-                Layout.minimumHeight: 410
+                Layout.minimumHeight: 620
 
                 ColumnLayout {
                     spacing: 10
@@ -65,7 +66,192 @@ Item {
 
                     Label { text: "Crest Factor:" ; Layout.preferredWidth: 120 }
                     Label { text: calculator.crestFactor.toFixed(2) }
+
+                    ComboBox {
+                        id: complianceStandard
+                        model: calculator.complianceStandards
+                        Layout.columnSpan: 2
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "ISC/IL:" ; Layout.preferredWidth: 120 }
+                    TextField {
+                        id: complianceIscIl
+                        text: "20"
+                        validator: DoubleValidator { bottom: 1 }
+                        Layout.preferredWidth: 120
+                    }
+
+                    Label { text: "Bus Voltage (kV):" ; Layout.preferredWidth: 120 }
+                    TextField {
+                        id: complianceBusKv
+                        text: "0.4"
+                        validator: DoubleValidator { bottom: 0 }
+                        Layout.preferredWidth: 120
+                    }
+
+                    Button {
+                        text: "Check Compliance"
+                        Layout.columnSpan: 2
+                        Layout.fillWidth: true
+                        onClicked: calculator.checkCompliance(complianceStandard.currentText,
+                                                              parseFloat(complianceIscIl.text),
+                                                              parseFloat(complianceBusKv.text))
+                    }
+
+                    Label {
+                        Layout.columnSpan: 2
+                        Layout.fillWidth: true
+                        wrapMode: Text.WordWrap
+                        property var report: calculator.complianceReport
+                        color: report.compliant === undefined ? palette.text : (report.compliant ? "green" : "red")
+                        text: {
+                            if (report.compliant === undefined) return ""
+                            var s = (report.compliant ? "Compliant" : "Violations: " + report.violations.join(", "))
+                                + "\nDistortion " + report.distortion.toFixed(2) + "% (limit " + report.distortionLimit.toFixed(1) + "%)"
+                            if (report.file)
+                                s += "\nFile: " + report.file.violating + " of " + report.file.sites + " windows violate"
+                                    + (report.file.percentileCompliant ? " (95th percentile compliant)" : "")
+                            return s
+                        }
+                    }
+                }
+                }
+            }
+
+            WaveCard {
+                title: "Waveform File"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 380
+
+                ColumnLayout {
+                    anchors.fill: parent
+                    spacing: 5
+
+                    RowLayout {
+                        Label { text: "Sample Rate (Hz):" ; Layout.preferredWidth: 120 }
+                        TextField {
+                            id: fileSampleRate
+                            text: "10000"
+                            validator: DoubleValidator { bottom: 1 }
+                            Layout.fillWidth: true
+                        }
+                    }
+
+                    RowLayout {
+                        Label { text: "Fundamental (Hz):" ; Layout.preferredWidth: 120 }
+                        ComboBox {
+                            id: fileFundamental
+                            model: ["50", "60"]
+                            Layout.fillWidth: true
+                        }
+                    }
+
+                    Button {
+                        text: calculator.fileAnalysisRunning ? "Analyzing..." : "Import Waveform..."
+                        enabled: !calculator.fileAnalysisRunning
+                        Layout.fillWidth: true
+                        onClicked: waveformFileDialog.open()
+                    }
+
+                    Label {
+                        Layout.fillWidth: true
+                        wrapMode: Text.WordWrap
+                        text: {
+                            var s = calculator.fileSummary
+                            if (s.error) return "Error: " + s.error
+                            if (!s.windows) return "No file analyzed"
+                            return s.windows + " windows, " + s.duration.toFixed(1) + " s\n"
+                                + "Max THD: " + s.maxThd.toFixed(2) + "%  Max TDD: " + s.maxTdd.toFixed(2) + "%\n"
+                                + "Max Crest Factor: " + s.maxCrestFactor.toFixed(2)
+                        }
+                    }
+
+                    ChartView {
+                        Layout.fillWidth: true
+                        Layout.fillHeight: true
+                        Layout.minimumHeight: 150
+                        antialiasing: true
+                        legend.visible: false
+
+                        ValueAxis {
+                            id: trendAxisX
+                            min: 0
+                            max: Math.max(calculator.fileSummary.duration, 1)
+                            titleText: "Time (s)"
+                        }
+
+                        ValueAxis {
+                            id: trendAxisY
+                            min: 0
+                            max: Math.max(Math.ceil(calculator.fileSummary.maxThd * 1.2), 1)
+                            titleText: "THD (%)"
+                        }
+
+                        LineSeries {
+                            id: thdTrendSeries
+                            axisX: trendAxisX
+                            axisY: trendAxisY
+                        }
+
+                        Connections {
+                            target: calculator
+                            function onFileAnalysisChanged() {
+                                calculator.fill_file_trend(thdTrendSeries, 0)
+                            }
+                        }
+                    }
                 }
+            }
+
+            WaveCard {
+                title: "Live Tracking"
+                Layout.fillWidth: true
+                Layout.minimumHeight: 230
+
+                GridLayout {
+                    anchors.fill: parent
+                    columns: 2
+
+                    Label { text: "Source:" ; Layout.preferredWidth: 120 }
+                    ComboBox {
+                        id: trackKind
+                        model: ["udp", "tcp", "file", "csv", "stdin"]
+                        enabled: !calculator.tracking
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "Address:" ; Layout.preferredWidth: 120 }
+                    TextField {
+                        id: trackAddress
+                        text: "127.0.0.1:5005"
+                        enabled: !calculator.tracking
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "Channel:" ; Layout.preferredWidth: 120 }
+                    ComboBox {
+                        id: trackChannel
+                        model: ["A", "B", "C"]
+                        enabled: !calculator.tracking
+                        Layout.fillWidth: true
+                    }
+
+                    Button {
+                        text: calculator.tracking ? "Stop Tracking" : "Start Tracking"
+                        Layout.columnSpan: 2
+                        Layout.fillWidth: true
+                        onClicked: {
+                            if (calculator.tracking) {
+                                calculator.stopTracking()
+                            } else {
+                                calculator.startTracking(trackKind.currentText, trackAddress.text,
+                                                         trackChannel.currentIndex,
+                                                         parseFloat(fileSampleRate.text),
+                                                         parseFloat(fileFundamental.currentText))
+                            }
+                        }
+                    }
                 }
             }
         }
@@ -107,29 +293,20 @@ Item {
                         name: "Combined Waveform"
                         axisX: axisX
                         axisY: axisY
+
+                        Component.onCompleted: calculator.fill_waveform(waveformSeries)
                     }
 
                     // Update waveform when it changes - optimize updates
                     Connections {
                         target: calculator
                         function onWaveformChanged() {
-                            waveformSeries.clear()
-                            var points = calculator.waveform
-                            var maxY = 0
-                            
-                            // Find maximum magnitude for scaling
-                            for (var i = 0; i < points.length; i++) {
-                                maxY = Math.max(maxY, Math.abs(points[i]))
-                            }
-                            
                             // Set axis range with 20% padding
+                            var maxY = calculator.waveformPeak
                             axisY.min = -Math.ceil(maxY * 1.2)
                             axisY.max = Math.ceil(maxY * 1.2)
-                            
-                            // Plot points
-                            for (var i = 0; i < points.length; i++) {
-                                waveformSeries.append(i * (360/points.length), points[i])
-                            }
+
+                            calculator.fill_waveform(waveformSeries)
                         }
                     }
                 }
@@ -195,4 +372,13 @@ Item {
             }
         }
     }
+
+    FileDialog {
+        id: waveformFileDialog
+        title: "Import Waveform"
+        nameFilters: ["Waveform files (*.csv *.txt *.bin *.dat *.rtc)", "All files (*)"]
+        onAccepted: calculator.analyzeFile(selectedFile.toString(),
+                                           parseFloat(fileSampleRate.text),
+                                           parseFloat(fileFundamental.currentText))
+    }
 }
@@ -118,17 +118,15 @@ Item {
                     name: "Trip Curve"
                     axisX: currentAxis
                     axisY: timeAxis
+
+                    Component.onCompleted: relay.fill_curve(tripCurve)
                 }
 
                 // Add connection to update curve when calculations complete
                 Connections {
                     target: relay
                     function onCalculationsComplete() {
-                        tripCurve.clear()
-                        var points = relay.curvePoints
-                        for (var i = 0; i < points.length; i++) {
-                            tripCurve.append(points[i].current, points[i].time)
-                        }
+                        relay.fill_curve(tripCurve)
                     }
                 }
             }
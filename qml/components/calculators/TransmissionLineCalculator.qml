@@ -2,6 +2,7 @@ import QtQuick
 import QtQuick.Controls
 import QtQuick.Layouts
 import QtQuick.Controls.Universal
+import QtCharts
 import "../"
 import "../../components"   
 import Transmission 1.0
@@ -47,7 +48,10 @@ Item {
                         Layout.minimumWidth: 100
                     }
 
-                    Label { text: "Resistance (Ω/km):" }
+                    Label {
+                        text: calculator.resistanceAt20C ? "DC Resistance at 20 °C (Ω/km):"
+                                                         : "AC Resistance at Operating Temp (Ω/km):"
+                    }
                     TextField {
                         id: resistanceInput
                         text: "0.1"
@@ -97,7 +101,7 @@ Item {
             WaveCard {
                 title: "Advanced Parameters"
                 Layout.fillWidth: true
-                Layout.minimumHeight: 210
+                Layout.minimumHeight: 290
                 Layout.minimumWidth: 300
 
                 GridLayout {
@@ -128,10 +132,28 @@ Item {
                         Layout.fillWidth: true
                     }
 
-                    Label { text: "Conductor Temperature (°C):" }
+                    Label { text: "Resistance Basis:" }
+                    CheckBox {
+                        id: resistanceAt20C
+                        text: "Entered at 20 °C DC"
+                        checked: calculator.resistanceAt20C
+                        onToggled: calculator.setResistanceAt20C(checked)
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "Conductor Material:" ; visible: resistanceAt20C.checked }
+                    ComboBox {
+                        model: calculator.conductorMaterials
+                        visible: resistanceAt20C.checked
+                        onCurrentTextChanged: calculator.setConductorMaterial(currentText)
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "Conductor Temperature (°C):" ; visible: resistanceAt20C.checked }
                     TextField {
                         id: conductorTemp
                         text: "75"
+                        visible: resistanceAt20C.checked
                         validator: DoubleValidator { bottom: 0 }
                         onTextChanged: if(text) calculator.setConductorTemperature(parseFloat(text))
                         Layout.fillWidth: true
@@ -145,6 +167,24 @@ Item {
                         onTextChanged: if(text) calculator.setEarthResistivity(parseFloat(text))
                         Layout.fillWidth: true
                     }
+
+                    Label { text: "Receiving-End Load (MW):" }
+                    TextField {
+                        id: loadInput
+                        text: "0"
+                        validator: DoubleValidator { bottom: 0 }
+                        onTextChanged: if(text) calculator.setLoadMW(parseFloat(text))
+                        Layout.fillWidth: true
+                    }
+
+                    Label { text: "Load Power Factor:" }
+                    TextField {
+                        id: powerFactorInput
+                        text: "0.95"
+                        validator: DoubleValidator { bottom: 0; top: 1 }
+                        onTextChanged: if(text) calculator.setLoadPowerFactor(parseFloat(text))
+                        Layout.fillWidth: true
+                    }
                 }
             }
 
@@ -218,17 +258,135 @@ Item {
             Layout.fillWidth: true
             title: "Visualization"
 
-            TransmissionLineViz {
+            ColumnLayout {
                 anchors.fill: parent
-                anchors.margins: 5
-                
-                length: parseFloat(lengthInput.text || "100")
-                characteristicImpedance: calculator.characteristicImpedance
-                attenuationConstant: calculator.attenuationConstant
-                phaseConstant: calculator.phaseConstant
-                
-                darkMode: Universal.theme === Universal.Dark
-                textColor: transmissionCard.textColor
+                spacing: 5
+
+                TransmissionLineViz {
+                    Layout.fillWidth: true
+                    Layout.fillHeight: true
+                    
+                    length: parseFloat(lengthInput.text || "100")
+                    characteristicImpedance: calculator.characteristicImpedance
+                    attenuationConstant: calculator.attenuationConstant
+                    phaseConstant: calculator.phaseConstant
+                    
+                    darkMode: Universal.theme === Universal.Dark
+                    textColor: transmissionCard.textColor
+                }
+
+                ChartView {
+                    id: profileChart
+                    Layout.fillWidth: true
+                    Layout.preferredHeight: 300
+                    antialiasing: true
+                    legend.alignment: Qt.AlignBottom
+                    theme: Universal.theme === Universal.Dark ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
+
+                    ValueAxis {
+                        id: positionAxis
+                        min: 0
+                        max: calculator.length
+                        titleText: "Distance from Sending End (km)"
+                    }
+                    ValueAxis {
+                        id: voltageAxis
+                        min: 0
+                        max: Math.max(1.2, calculator.sendingEndVoltage * 1.1)
+                        titleText: "Voltage (pu)"
+                    }
+                    ValueAxis {
+                        id: currentAxis
+                        min: 0
+                        max: Math.max(1, calculator.maxProfileCurrent * 1.1)
+                        titleText: "Current (A)"
+                    }
+
+                    LineSeries {
+                        id: voltageSeries
+                        name: "Voltage"
+                        axisX: positionAxis
+                        axisY: voltageAxis
+                    }
+                    LineSeries {
+                        id: currentSeries
+                        name: "Current"
+                        axisX: positionAxis
+                        axisYRight: currentAxis
+                    }
+
+                    function updateProfiles() {
+                        calculator.fill_voltage_profile(voltageSeries)
+                        calculator.fill_current_profile(currentSeries)
+                    }
+
+                    Component.onCompleted: updateProfiles()
+
+                    Connections {
+                        target: calculator
+                        function onResultsCalculated() {
+                            profileChart.updateProfiles()
+                        }
+                    }
+                }
+
+                RowLayout {
+                    Layout.fillWidth: true
+                    Label { text: "Sweep to (Hz):" }
+                    TextField {
+                        id: sweepMax
+                        text: "5000"
+                        validator: DoubleValidator { bottom: 1 }
+                        Layout.preferredWidth: 100
+                    }
+                    Button {
+                        text: "Frequency Sweep"
+                        onClicked: calculator.frequencySweep(0, parseFloat(sweepMax.text || "5000"), 5001)
+                    }
+                    Label {
+                        Layout.fillWidth: true
+                        elide: Text.ElideRight
+                        text: calculator.sweepResonances.length > 0 ?
+                              "Resonances: " + calculator.sweepResonances.slice(0, 5).map(f => f.toFixed(0)).join(", ") + " Hz" : ""
+                    }
+                }
+
+                ChartView {
+                    id: sweepChart
+                    Layout.fillWidth: true
+                    Layout.preferredHeight: 300
+                    antialiasing: true
+                    legend.visible: false
+                    theme: Universal.theme === Universal.Dark ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
+
+                    ValueAxis {
+                        id: frequencyAxis
+                        min: 0
+                        max: parseFloat(sweepMax.text || "5000")
+                        titleText: "Frequency (Hz)"
+                    }
+                    LogValueAxis {
+                        id: impedanceAxis
+                        min: 1
+                        max: Math.max(10, calculator.sweepMaxImpedance * 2)
+                        base: 10
+                        labelFormat: "%g"
+                        titleText: "|Zin| (Ω)"
+                    }
+
+                    LineSeries {
+                        id: sweepSeries
+                        axisX: frequencyAxis
+                        axisY: impedanceAxis
+                    }
+
+                    Connections {
+                        target: calculator
+                        function onSweepCalculated() {
+                            calculator.fill_sweep_impedance(sweepSeries)
+                        }
+                    }
+                }
             }
         }
     }
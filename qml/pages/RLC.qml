@@ -29,8 +29,8 @@ Page {
             seriesRLCChart.fill_series(gainSeries)
             
             // Fill resonant line directly since it's just 2 points
-            resonantSeries.append(data[1][0].x, data[1][0].y)
-            resonantSeries.append(data[1][1].x, data[1][1].y)
+            resonantSeries.append(data[0].x, data[0].y)
+            resonantSeries.append(data[1].x, data[1].y)
         }
 
         function onAxisRangeChanged() {
@@ -214,6 +214,30 @@ Page {
                             color: "red"
                         }
 
+                        Label {
+                            text: "Q Factor:"
+                            Layout.preferredWidth: 150
+                            Layout.fillWidth:  true
+                        }
+                        Label {
+                            text: seriesRLCChart.qFactor.toFixed(2)
+                            Layout.preferredWidth: 150
+                            Layout.alignment: Qt.AlignHCenter
+                        }
+
+                        Label {
+                            text: "Bandwidth (-3 dB):"
+                            Layout.preferredWidth: 150
+                            Layout.fillWidth:  true
+                        }
+                        Label {
+                            text: seriesRLCChart.bandwidth.toFixed(2) + " Hz ("
+                                  + seriesRLCChart.lowerCutoff.toFixed(2) + " - "
+                                  + seriesRLCChart.upperCutoff.toFixed(2) + ")"
+                            Layout.preferredWidth: 150
+                            Layout.alignment: Qt.AlignHCenter
+                        }
+
                         Button {
                             text: "Reset All Values"
                             Layout.columnSpan: 2
@@ -364,6 +388,113 @@ Page {
                                 titleText: "Gain (ratio)"
                             }
                         }
+
+                        RowLayout {
+                            Layout.fillWidth: true
+
+                            Label { text: "Transient:" }
+
+                            ComboBox {
+                                id: transientKind
+                                model: ["step", "impulse", "switched", "ac"]
+                                Layout.preferredWidth: 120
+                            }
+
+                            Label { text: "Duration (s):" }
+
+                            TextField {
+                                id: transientDuration
+                                text: "0.2"
+                                validator: DoubleValidator { bottom: 0 }
+                                Layout.preferredWidth: 70
+                            }
+
+                            Label { text: "Steps:" }
+
+                            TextField {
+                                id: transientSteps
+                                text: "100000"
+                                validator: IntValidator { bottom: 2; top: 1000000 }
+                                Layout.preferredWidth: 90
+                            }
+
+                            Label { text: "Amplitude:" }
+
+                            TextField {
+                                id: transientAmplitude
+                                text: "1"
+                                validator: DoubleValidator {}
+                                Layout.preferredWidth: 60
+                            }
+
+                            Button {
+                                text: "Simulate"
+                                onClicked: seriesRLCChart.simulateTransient(
+                                    transientKind.currentText,
+                                    parseFloat(transientDuration.text),
+                                    parseInt(transientSteps.text),
+                                    parseFloat(transientAmplitude.text))
+                            }
+
+                            Label {
+                                text: "Peak I: " + seriesRLCChart.transientPeakCurrent.toFixed(4) + " A  "
+                                      + "Peak Vc: " + seriesRLCChart.transientPeakVoltage.toFixed(2) + " V"
+                                Layout.fillWidth: true
+                            }
+                        }
+
+                        ChartView {
+                            id: transientChartView
+                            Layout.fillWidth: true
+                            Layout.preferredHeight: 300
+                            antialiasing: true
+                            theme: Universal.theme
+
+                            ValueAxis {
+                                id: transientAxisX
+                                min: 0
+                                max: Math.max(seriesRLCChart.transientDuration, 0.001)
+                                labelFormat: "%.3f"
+                                titleText: "Time (s)"
+                            }
+
+                            ValueAxis {
+                                id: transientAxisCurrent
+                                titleText: "Current (A)"
+                                min: -Math.max(seriesRLCChart.transientPeakCurrent, 0.001) * 1.1
+                                max: Math.max(seriesRLCChart.transientPeakCurrent, 0.001) * 1.1
+                            }
+
+                            ValueAxis {
+                                id: transientAxisVoltage
+                                titleText: "Capacitor Voltage (V)"
+                                min: -Math.max(seriesRLCChart.transientPeakVoltage, 0.001) * 1.1
+                                max: Math.max(seriesRLCChart.transientPeakVoltage, 0.001) * 1.1
+                            }
+
+                            LineSeries {
+                                id: transientCurrentSeries
+                                name: "Current"
+                                axisX: transientAxisX
+                                axisY: transientAxisCurrent
+                                color: "blue"
+                            }
+
+                            LineSeries {
+                                id: transientVoltageSeries
+                                name: "Capacitor Voltage"
+                                axisX: transientAxisX
+                                axisYRight: transientAxisVoltage
+                                color: "red"
+                            }
+
+                            Connections {
+                                target: seriesRLCChart
+                                function onTransientChanged() {
+                                    seriesRLCChart.fill_transient_series(transientCurrentSeries, transientVoltageSeries)
+                                }
+                            }
+                        }
                     }
                 }
             }
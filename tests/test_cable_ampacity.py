@@ -0,0 +1,10 @@
+import pytest
+
+from models.cable_ampacity import derating_factor, minimum_size
+
+
+def test_unknown_names_are_rejected():
+    with pytest.raises(ValueError, match="Unknown insulation EPR"):
+        derating_factor("EPR", 30.0, 1)
+    with pytest.raises(ValueError, match="Unknown material Gold"):
+        minimum_size(100.0, "PVC", "Gold")
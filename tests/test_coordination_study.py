@@ -0,0 +1,30 @@
+import numpy as np
+
+from models import coordination_study
+from models.coordination_study import miscoordination_probability
+from models.protection_curves import curve
+
+
+def _study(**kwargs):
+    si = curve("IEC Standard Inverse")
+    return miscoordination_probability([si, si, si], [100.0, 200.0, 400.0], [0.1, 0.2, 0.35],
+                                       [1000.0, 3000.0, 8000.0], trials=2100, seed=7, **kwargs)
+
+
+def test_result_does_not_depend_on_chunking(monkeypatch):
+    whole = _study()
+    # One seed block per chunk
+    monkeypatch.setattr(coordination_study, "CHUNK_BYTES", 1)
+    split = _study()
+    assert whole.trials == split.trials == 2100
+    np.testing.assert_array_equal(whole.probability, split.probability)
+    np.testing.assert_array_equal(whole.fault_probability, split.fault_probability)
+    np.testing.assert_array_equal(whole.margin_percentile, split.margin_percentile)
+    # The draws matter: some fault level is only sometimes miscoordinated
+    assert np.any((whole.fault_probability > 0) & (whole.fault_probability < 1))
+
+
+def test_chunks_follow_workers_and_memory_budget():
+    assert coordination_study._blocks_per_chunk(100, 10, 0) >= 100
+    assert coordination_study._blocks_per_chunk(100, 10, 5) == 5
+    assert coordination_study._blocks_per_chunk(100, 10 ** 9, 5) == 1
@@ -0,0 +1,30 @@
+import numpy as np
+
+from models.harmonic_compliance import check_voltage, current_limits, voltage_limits
+
+
+def test_current_class_boundaries_belong_to_the_class_above():
+    # IEEE 519 Table 2 classes: < 20, 20 < 50, 50 < 100, 100 < 1000, > 1000
+    isc_il = [19.9, 20.0, 49.9, 50.0, 100.0, 1000.0, 1500.0]
+    individual, tdd = current_limits(isc_il, [1, 5])
+    np.testing.assert_array_equal(tdd, [5.0, 8.0, 8.0, 12.0, 15.0, 20.0, 20.0])
+    np.testing.assert_array_equal(individual[:, 1], [4.0, 7.0, 7.0, 10.0, 12.0, 15.0, 15.0])
+    assert np.all(np.isinf(individual[:, 0]))
+
+
+def test_voltage_class_boundaries_stay_in_the_lower_class():
+    # Voltage classes are "≤ 1 kV", "1 kV < V ≤ 69 kV", ...
+    _, thd = voltage_limits([1.0, 1.01, 69.0, 69.1], [1, 5])
+    assert thd[0] > thd[1]
+    assert thd[1] == thd[2]
+    assert thd[2] > thd[3]
+
+
+def test_worst_order_is_zero_when_distortion_dominates():
+    # Many orders each within their limit but together over the THD limit
+    harmonics = np.full((1, 26), 4.0)
+    harmonics[:, 0] = 100.0
+    result = check_voltage(harmonics, bus_kv=0.4)
+    assert not result.violations.any()
+    assert result.worst_order[0] == 0
+    assert result.worst_ratio[0] > 1.0
@@ -0,0 +1,23 @@
+import numpy as np
+
+from models.stream_recorder import StreamRecorder
+from models.waveform_import import analyze_file
+
+
+def test_open_recording_ignores_preallocated_rows(tmp_path):
+    # 10,000 samples at 5 kHz are ten 10-cycle windows; the flushed but
+    # unclosed file still has room for 65,536 rows
+    rate = 5000.0
+    t = np.arange(10000) / rate
+    wave = np.sin(2 * np.pi * 50.0 * t)
+    recorder = StreamRecorder(str(tmp_path / "open.rec"))
+    for start in range(0, len(t), 1000):
+        stop = start + 1000
+        recorder.append_block(np.column_stack([t[start:stop], wave[start:stop],
+                                               wave[start:stop], wave[start:stop]]))
+    recorder.flush()
+
+    result = analyze_file(recorder.path, rate, orders=5)
+    assert len(result.times) == 10
+    np.testing.assert_allclose(result.harmonics[:, 0], np.sqrt(0.5), rtol=1e-5)
+    recorder.close()